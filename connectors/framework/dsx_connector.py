@@ -19,8 +19,8 @@ from connectors.framework.base_config import BaseConnectorConfig
 from shared.models.connector_models import ScanRequestModel, ConnectorInstanceModel, ConnectorStatusEnum, \
     ItemActionEnum
 from shared.routes import DSXConnectAPI, ConnectorAPI, service_url, API_PREFIX_V1, ConnectorPath, ScanPath, route_path, \
-     format_route
-from shared.models.status_responses import StatusResponse, StatusResponseEnum, ItemActionStatusResponse
+     format_route, build_endpoint_url
+from shared.models.status_responses import StatusResponse, StatusResponseEnum, ItemActionStatusResponse, dump_status
 from shared.dsx_logging import dsx_logging
 from connectors.framework.connector_id import get_or_create_connector_uuid
 import httpx
@@ -31,6 +31,13 @@ from connectors.framework.auth_hmac import (
     auth_enabled as connector_auth_enabled,
 )
 
+# Constant error body for read_file with no registered handler, encoded once
+_NO_READ_FILE_HANDLER_BODY = dump_status(StatusResponse(
+    status=StatusResponseEnum.ERROR,
+    message="No event handler registered for read_file",
+    description="Add a decorator (e.g., @connector.read_file) to handle read_file requests",
+))
+
 # Context variable to propagate a scan job id during full_scan
 _SCAN_JOB_ID: contextvars.ContextVar[str | None] = contextvars.ContextVar("scan_job_id", default=None)
 _SCAN_ENQ_COUNTER: contextvars.ContextVar[int] = contextvars.ContextVar("scan_enq_counter", default=0)
@@ -615,7 +622,7 @@ class DSXConnector:
     async def test_dsx_connect(self) -> Optional[dict]:
         try:
             async with httpx.AsyncClient(verify=self._httpx_verify) as client:
-                url = service_url(self.dsx_connect_url, API_PREFIX_V1, DSXConnectAPI.CONNECTION_TEST)
+                url = build_endpoint_url(self.dsx_connect_url, DSXConnectAPI.CONNECTION_TEST)
                 # no HMAC needed; public health
                 resp = await client.get(url)
             resp.raise_for_status()
@@ -795,9 +802,10 @@ class DSXAConnectorRouter(APIRouter):
             if isinstance(res, Response):
                 return res
 
-            # If downstream returned a Pydantic model or dict, JSON-encode it
+            # A StatusResponse serializes straight to JSON bytes; anything else goes through model_dump/jsonable_encoder
+            if isinstance(res, StatusResponse):
+                return Response(content=dump_status(res), media_type="application/json")
             try:
-                # StatusResponse is a Pydantic model; model_dump() in Pydantic v2
                 payload = res.model_dump()  # type: ignore[attr-defined]
             except Exception:
                 payload = jsonable_encoder(res)
@@ -805,14 +813,7 @@ class DSXAConnectorRouter(APIRouter):
             return JSONResponse(content=payload)
 
         # No handler registered: return JSON error
-        return JSONResponse(
-            content=StatusResponse(
-                status=StatusResponseEnum.ERROR,
-                message="No event handler registered for read_file",
-                description="Add a decorator (e.g., @connector.read_file) to handle read_file requests",
-            ).model_dump(),
-            status_code=501,
-        )
+        return Response(content=_NO_READ_FILE_HANDLER_BODY, media_type="application/json", status_code=501)
 
     async def get_repo_check(self, request: Request) -> StatusResponse:
         # Optional preview query (?preview=N) for a non-destructive sample listing
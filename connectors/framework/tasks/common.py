@@ -1,12 +1,24 @@
+import functools
 import os
 import re
 import shutil
+import zipfile
 from pathlib import Path
 
 from invoke import Context, task
 import os
 
 
+# Version constants bump_patch_version recognizes, in priority order
+_BUMP_NAMES = ("CONNECTOR_VERSION", "DSX_CONNECT_VERSION", "VERSION")
+# All of them in one alternation so the file is scanned once; the winner is picked from the hits
+_BUMP_RE = re.compile(
+    rf'((?P<name>{"|".join(_BUMP_NAMES)})\s*=\s*["\'])(\d+)\.(\d+)\.(\d+)(["\'])',
+    re.ASCII,
+)
+_CHART_NAME_RE = re.compile(r"^name:\s*([\w.-]+)", flags=re.MULTILINE)
+
+
 def bump_patch_version(version_file: str) -> str:
     """
     Increment the patch version in the given version.py file.
@@ -23,30 +35,29 @@ def bump_patch_version(version_file: str) -> str:
         raise FileNotFoundError(f"Version file not found: {version_file}")
     content = path.read_text()
 
-    # Try the constants in priority order
-    patterns = [
-        r'(CONNECTOR_VERSION\s*=\s*["\'])(\d+)\.(\d+)\.(\d+)(["\'])',
-        r'(DSX_CONNECT_VERSION\s*=\s*["\'])(\d+)\.(\d+)\.(\d+)(["\'])',
-        r'(VERSION\s*=\s*["\'])(\d+)\.(\d+)\.(\d+)(["\'])',
-    ]
-    match = None
-    pattern_used = None
-    for pat in patterns:
-        match = re.search(pat, content)
-        if match:
-            pattern_used = pat
-            break
-    if not match:
+    # One scan for every constant; the highest-priority one present wins
+    matches = list(_BUMP_RE.finditer(content))
+    if not matches:
         raise ValueError(f"Version string not found in {version_file}")
+    name = min((m.group("name") for m in matches), key=_BUMP_NAMES.index)
+    hits = [m for m in matches if m.group("name") == name]
+    match = hits[0]
 
-    major = int(match.group(2))
-    minor = int(match.group(3))
-    patch = int(match.group(4))
+    major = int(match.group(3))
+    minor = int(match.group(4))
+    patch = int(match.group(5))
     new_patch = patch + 1
     new_version = f"{major}.{minor}.{new_patch}"
-    new_line = f"{match.group(1)}{new_version}{match.group(5)}"
-    new_content = re.sub(pattern_used, new_line, content)
-    path.write_text(new_content)
+    new_line = f"{match.group(1)}{new_version}{match.group(6)}"
+    # Splice the new value over each occurrence of that constant instead of re-running a sub()
+    parts: list[str] = []
+    pos = 0
+    for m in hits:
+        parts.append(content[pos:m.start()])
+        parts.append(new_line)
+        pos = m.end()
+    parts.append(content[pos:])
+    path.write_text("".join(parts))
     return new_version
 
 
@@ -62,12 +73,41 @@ def clean_export(export_folder: str):
         os.remove(zip_file)
 
 
+def _sync_tree(src: str | Path, dst: str | Path, exclude: tuple[str, ...] = ()) -> None:
+    """
+    In-process equivalent of `rsync -a --exclude ... src/ dst/`: merge the contents of src into dst,
+    keeping symlinks and timestamps. Like rsync, an exclude without '/' matches that name at any
+    depth, and one with '/' (e.g. 'deploy/certs') matches paths ending in it.
+    """
+    src = Path(src)
+    names = [p for p in exclude if "/" not in p]
+    # Plain names (the usual case) are a set lookup per entry; only real globs go through fnmatch
+    exact = frozenset(p for p in names if not any(ch in p for ch in "*?["))
+    globs = tuple(p for p in names if p not in exact)
+    match_globs = shutil.ignore_patterns(*globs) if globs else None
+    suffixes = tuple(p for p in exclude if "/" in p)
+    src_prefix_len = len(str(src)) + 1
+
+    def _ignore(dirpath: str, entries: list[str]) -> set[str]:
+        ignored = {e for e in entries if e in exact}
+        if match_globs:
+            ignored.update(match_globs(dirpath, entries))
+        if suffixes:
+            rel = dirpath[src_prefix_len:].replace(os.sep, "/")
+            for e in entries:
+                full = f"{rel}/{e}" if rel else e
+                if any(full == p or full.endswith("/" + p) for p in suffixes):
+                    ignored.add(e)
+        return ignored
+
+    shutil.copytree(src, dst, symlinks=True, ignore=_ignore, dirs_exist_ok=True)
+    print(f"[export] synced {src} -> {dst}")
+
+
 def prepare_shared_files(c: Context, project_root: str, export_folder: str):
     base = Path(export_folder)
     # Exclude dev certs from shared to avoid duplication; certs are copied to export/certs separately
-    c.run(
-        f"rsync -av --exclude='__pycache__' --exclude 'deploy/certs' {project_root}/shared {base}/"
-    )
+    _sync_tree(Path(project_root) / "shared", base / "shared", exclude=("__pycache__", "deploy/certs"))
     (base / "__init__.py").touch()
 
 
@@ -94,14 +134,15 @@ def prepare_common_files(c: Context, project_slug: str, connector_name: str, ver
                     break
             except Exception:
                 pass
-    #c.run(f"mkdir -p {export_folder}/connectors/azure_blob_storage")
-    c.run(
-        f"rsync -av --exclude '__pycache__' {project_root_dir}/connectors/{project_slug}/ {export_folder}/connectors/{project_slug}/ "
-        f"--exclude 'deploy' --exclude 'dist' --exclude 'tasks.py' --exclude '.devenv' --exclude '.dev.env' --exclude '.env' "
-        f"--exclude 'data/connector_uuid.txt'")
-    c.run(
-        f"rsync -av --exclude '__pycache__' {project_root_dir}/connectors/framework/ {export_folder}/connectors/framework/ --exclude 'tasks'")
-    c.run(f"touch {export_folder}/connectors/__init__.py")
+    connectors_src = Path(project_root_dir) / "connectors"
+    connectors_dst = Path(export_folder) / "connectors"
+    _sync_tree(
+        connectors_src / project_slug,
+        connectors_dst / project_slug,
+        exclude=("__pycache__", "deploy", "dist", "tasks.py", ".devenv", ".dev.env", ".env", "data/connector_uuid.txt"),
+    )
+    _sync_tree(connectors_src / "framework", connectors_dst / "framework", exclude=("__pycache__", "tasks"))
+    (connectors_dst / "__init__.py").touch()
 
     # Bring root-level Dockerfile/requirements into export if present (for connectors that keep build files at root)
     root_dockerfile = Path(project_root_dir) / "connectors" / project_slug / "Dockerfile"
@@ -113,12 +154,14 @@ def prepare_common_files(c: Context, project_slug: str, connector_name: str, ver
 
     # Also surface certs at export root for convenience/visibility (not required by Dockerfile)
     # Prefer shared certs; fallback to framework certs
-    c.run(f"mkdir -p {export_folder}/certs && rsync -av {project_root_dir}/shared/deploy/certs/ {export_folder}/certs/ 2>/dev/null || true")
-    c.run(f"mkdir -p {export_folder}/certs && rsync -av {project_root_dir}/connectors/framework/deploy/certs/ {export_folder}/certs/ 2>/dev/null || true")
+    (Path(export_folder) / "certs").mkdir(parents=True, exist_ok=True)
+    for certs_src in (Path(project_root_dir) / "shared" / "deploy" / "certs", connectors_src / "framework" / "deploy" / "certs"):
+        if certs_src.is_dir():
+            _sync_tree(certs_src, Path(export_folder) / "certs")
 
     # Move deployment assets (compose, Docker build files, helm snippets) to export root
     # This preserves subfolders like deploy/docker and deploy/helm
-    c.run(f"rsync -av {project_root_dir}/connectors/{project_slug}/deploy/ {export_folder}")
+    _sync_tree(connectors_src / project_slug / "deploy", export_folder)
 
     # Backward/forward compatibility for Docker builds:
     # - If a connector uses deploy/docker/ for Dockerfile and requirements.txt,
@@ -133,35 +176,35 @@ def prepare_common_files(c: Context, project_slug: str, connector_name: str, ver
         pass
 
     # Ensure docker-compose YAMLs are available at export root as well
+    primary_name = f"docker-compose-{connector_name}.yaml"
+    primary_stamped = False
     try:
-        docker_dir = Path(export_folder) / "docker"
-        # Copy the canonical compose first if present
-        primary = docker_dir / f"docker-compose-{connector_name}.yaml"
-        to_copy: list[Path] = []
-        if primary.exists():
-            to_copy.append(primary)
-        # Then copy any other docker-compose-*.yaml (e.g., -nfs variants)
-        for f in docker_dir.glob("docker-compose-*.yaml"):
-            if f not in to_copy:
-                to_copy.append(f)
-        for f in to_copy:
-            dst = Path(export_folder) / f.name
-            if not dst.exists():
-                shutil.copy2(f, dst)
+        # The canonical docker-compose-<name>.yaml plus any variants (e.g., -nfs), in one readdir pass
+        with os.scandir(Path(export_folder) / "docker") as it:
+            for entry in it:
+                n = entry.name
+                if n.startswith("docker-compose-") and n.endswith(".yaml"):
+                    dst = os.path.join(export_folder, n)
+                    if os.path.exists(dst):
+                        continue
+                    if n == primary_name:
+                        # Stamp the image tag while copying rather than re-reading the copy afterwards
+                        content = Path(entry.path).read_text().replace("__VERSION__", version)
+                        Path(dst).write_text(content)
+                        primary_stamped = True
+                    else:
+                        shutil.copy2(entry.path, dst)
     except Exception:
         pass
 
     # copy start file to topmost directory
-    c.run(f"rsync -av {project_root_dir}/connectors/{project_slug}/start.py {export_folder}/")
+    shutil.copy2(connectors_src / project_slug / "start.py", Path(export_folder) / "start.py")
 
     # change the docker compose image: to reflect the new image tag
-    file_path = Path(f"{export_folder}/docker-compose-{connector_name}.yaml")
-
-    with file_path.open("r") as f:
-        content = f.read()
-        content = content.replace("__VERSION__", version)
-    with file_path.open("w") as f:
-        f.write(content)
+    # (only needed when the compose already sat at the export root, i.e. legacy deploy/ layouts)
+    if not primary_stamped:
+        file_path = Path(f"{export_folder}/docker-compose-{connector_name}.yaml")
+        file_path.write_text(file_path.read_text().replace("__VERSION__", version))
 
 
 def prepare_dsx_connect_files(c: Context, project_root: str, export_folder: str):
@@ -169,16 +212,24 @@ def prepare_dsx_connect_files(c: Context, project_root: str, export_folder: str)
     return
 
 
-def zip_export(c: Context, export_folder: str, build_dir: str):
+def zip_export(c: Context, export_folder: str, build_dir: str, compresslevel: int | None = None,
+               stored: bool = False):
     """
     Zip the contents of the export_folder into a .zip file alongside it.
+    compresslevel is the deflate level (None = zlib default); stored=True skips compression entirely.
     """
-    zip_file = f"{export_folder}.zip"
+    base = os.path.basename(export_folder)
+    zip_file = os.path.join(build_dir, f"{base}.zip")
     print(f"Zipping contents of {export_folder} into {zip_file}...")
-    # Change directory to build_dir to ensure correct zip structure
-    c.run(
-        f"cd {build_dir} && zip -r {os.path.basename(zip_file)} {os.path.basename(export_folder)}"
-    )
+    # Entries are relative to build_dir so they start with the export folder's name (as `cd build_dir && zip -r`
+    # did), written in-process: no shell spawn and no quoting issues with paths containing spaces
+    method = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(zip_file, "w", method, compresslevel=None if stored else compresslevel) as zf:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(build_dir, base)):
+            rel_dir = os.path.relpath(dirpath, build_dir)
+            zf.write(dirpath, rel_dir)
+            for fname in filenames:
+                zf.write(os.path.join(dirpath, fname), os.path.join(rel_dir, fname))
 
 
 def build_image(c: Context, name: str, version: str, export_folder: str):
@@ -222,45 +273,81 @@ def push_image(c: Context, repo: str, name: str, version: str, push_latest: bool
         c.run(f"docker push {latest_remote}")
 
 
+@functools.lru_cache(maxsize=None)
+def _image_pin_re(image_repo: str) -> re.Pattern:
+    return re.compile(rf"^(?P<prefix>\s*\w*IMAGE\s*=\s*{re.escape(image_repo)}:)(?P<tag>[^\s]+)", flags=re.MULTILINE)
+
+
 def update_env_sample_image(env_path: Path, image_repo: str, version: str):
     """Update an env sample file to pin the image tag to the given version."""
     if not env_path.exists():
         return
     text = env_path.read_text()
-    pattern = re.compile(rf"^(?P<prefix>\s*\w*IMAGE\s*=\s*{re.escape(image_repo)}:)(?P<tag>[^\s]+)", flags=re.MULTILINE)
-    new_text, count = pattern.subn(rf"\g<prefix>{version}", text, count=1)
+    new_text, count = _image_pin_re(image_repo).subn(rf"\g<prefix>{version}", text, count=1)
     if count:
         env_path.write_text(new_text)
 
 
 # -------------------- Version helpers --------------------
-_CONNECTOR_VERSION_RE = re.compile(r"CONNECTOR_VERSION\s*=\s*[\"'](\d+\.\d+\.\d+)[\"']")
+_CONNECTOR_VERSION_RE = re.compile(r"CONNECTOR_VERSION\s*=\s*[\"'](\d+\.\d+\.\d+)[\"']", re.ASCII)
 
 
 def _update_chart_yaml(chart_path: Path, version: str):
     if not chart_path.exists():
         return
-    lines = chart_path.read_text().splitlines()
+    original = chart_path.read_text()
+    lines = original.splitlines()
+    version_line = f"version: {version}"
+    app_line = f'appVersion: "{version}"'
     app_present = False
     version_idx = None
     for idx, line in enumerate(lines):
-        if line.startswith("version:"):
-            lines[idx] = f"version: {version}"
+        if not line.startswith(("version:", "appVersion:")):
+            continue
+        if line[0] == "v":
+            lines[idx] = version_line
             version_idx = idx
-        elif line.startswith("appVersion:"):
-            lines[idx] = f'appVersion: "{version}"'
+        else:
+            lines[idx] = app_line
             app_present = True
     if not app_present:
         insert_at = version_idx + 1 if version_idx is not None else len(lines)
-        lines.insert(insert_at, f'appVersion: "{version}"')
-    chart_path.write_text("\n".join(lines) + "\n")
+        lines.insert(insert_at, app_line)
+    new = "\n".join(lines) + "\n"
+    # Already in sync: leave the file (and its mtime) alone
+    if new != original:
+        chart_path.write_text(new)
+
+
+def _scan_connector_version(content: str) -> str | None:
+    """Plain `CONNECTOR_VERSION = "X.Y.Z"` lines via find/slice; anything fancier is left to the regex."""
+    for line in content.splitlines():
+        line = line.lstrip()
+        if not line.startswith("CONNECTOR_VERSION"):
+            continue
+        rest = line[len("CONNECTOR_VERSION"):].lstrip()
+        if rest[:1] != "=":
+            continue
+        rest = rest[1:].lstrip()
+        quote = rest[:1]
+        if quote not in ('"', "'"):
+            continue
+        end = rest.find(quote, 1)
+        parts = rest[1:end].split(".") if end > 0 else ()
+        if len(parts) == 3 and all(p.isascii() and p.isdigit() for p in parts):
+            return rest[1:end]
+    return None
 
 
 def read_connector_version(version_file: str) -> str:
     path = Path(version_file)
     if not path.exists():
         raise FileNotFoundError(f"Version file not found: {version_file}")
-    m = _CONNECTOR_VERSION_RE.search(path.read_text())
+    content = path.read_text()
+    version = _scan_connector_version(content)
+    if version is not None:
+        return version
+    m = _CONNECTOR_VERSION_RE.search(content)
     if not m:
         raise ValueError(f"CONNECTOR_VERSION not found in {version_file}")
     return m.group(1)
@@ -365,7 +452,7 @@ def helm_push_oci_connector(c: Context, project_slug: str, repo: str, charts_dir
         version = read_connector_version(str(root / "connectors" / project_slug / "version.py"))
     # The chart name comes from Chart.yaml 'name'. Read it to construct the packaged filename.
     chart_name_text = (root / "connectors" / project_slug / "deploy" / "helm" / "Chart.yaml").read_text()
-    m = re.search(r"^name:\s*([\w.-]+)", chart_name_text, flags=re.MULTILINE)
+    m = _CHART_NAME_RE.search(chart_name_text)
     if not m:
         raise ValueError("Chart.yaml must have a 'name:' field")
     chart_name = m.group(1)
@@ -5,8 +5,8 @@ from typing import Any, AsyncIterator, Dict, List, Optional
 import httpx
 
 from shared.dsx_logging import dsx_logging
-from shared.graph.base import MSGraphClientBase
-from shared.graph.drive import delta_changes, build_drive_item_path
+from shared.graph.base import MSGraphClientBase, graph_json
+from shared.graph.drive import DeltaStream, delta_changes, build_drive_item_path
 from connectors.onedrive.config import OneDriveConnectorConfig
 
 
@@ -76,7 +76,7 @@ class OneDriveClient(MSGraphClientBase):
                 except Exception:
                     pass
                 raise RuntimeError(f"Graph list children failed: {resp.status_code} path={path} body={detail}")
-            data = resp.json()
+            data = graph_json(resp)
             items.extend(data.get("value", []))
             url = data.get("@odata.nextLink")
         return items
@@ -100,12 +100,19 @@ class OneDriveClient(MSGraphClientBase):
         page_size = max(1, int(getattr(self._cfg, "sp_graph_page_size", 200) or 200))
         return await delta_changes(self, self.drive_resource, cursor, page_size=page_size)
 
+    async def delta_stream(self, cursor: Optional[str]) -> DeltaStream:
+        """Page-by-page delta iterator; its `cursor` is set once exhausted."""
+        await self._ensure_drive()
+        page_size = max(1, int(getattr(self._cfg, "sp_graph_page_size", 200) or 200))
+        return DeltaStream(self, self.drive_resource, cursor, page_size=page_size)
+
     async def iter_files_delta(self) -> AsyncIterator[Dict[str, Any]]:
         cursor: Optional[str] = None
         while True:
-            items, cursor = await self.delta_changes(cursor)
-            for item in items:
+            stream = await self.delta_stream(cursor)
+            async for item in stream:
                 yield item
+            cursor = stream.cursor
             if not cursor:
                 break
 
@@ -11,9 +11,8 @@ from connectors.framework.dsx_connector import DSXConnector
 from connectors.framework.auth_hmac import build_outbound_auth_header
 from shared.routes import service_url, API_PREFIX_V1, DSXConnectAPI
 from shared.dsx_logging import dsx_logging
-from shared.file_ops import relpath_matches_filter
 from shared.graph.subscriptions import GraphDriveSubscriptionManager
-from shared.graph.drive import build_drive_item_path, process_drive_delta_items
+from shared.graph.drive import build_drive_item_path, path_in_drive_scope, process_drive_delta_items
 from shared.models.connector_models import ConnectorInstanceModel, ItemActionEnum, ScanRequestModel
 from shared.models.status_responses import ItemActionStatusResponse, StatusResponse, StatusResponseEnum
 from connectors.onedrive.config import config
@@ -40,26 +39,8 @@ def _asset_scope() -> tuple[str, str]:
 
 
 def _path_in_scope(path: Optional[str]) -> tuple[bool, str]:
-    normalized = (path or "").strip("/")
-    norm_segments = [seg for seg in normalized.split("/") if seg]
     base_path, eff_filter = _asset_scope()
-    base_segments = [seg for seg in base_path.split("/") if seg]
-    rel_segments = norm_segments
-    if base_segments:
-        if not norm_segments or len(norm_segments) < len(base_segments):
-            return False, normalized
-        match_idx = None
-        for i in range(0, len(norm_segments) - len(base_segments) + 1):
-            if norm_segments[i:i + len(base_segments)] == base_segments:
-                match_idx = i
-                break
-        if match_idx is None:
-            return False, normalized
-        rel_segments = norm_segments[match_idx + len(base_segments):]
-    rel = "/".join(rel_segments)
-    if eff_filter and not relpath_matches_filter(rel, eff_filter):
-        return False, normalized
-    return True, "/".join(norm_segments)
+    return path_in_drive_scope(path, base_path, eff_filter)
 
 
 def _normalize_drive_path(path: str) -> str:
@@ -160,7 +141,11 @@ async def _initialize_delta_cursor() -> None:
         if await _kv_get(_DELTA_STATE_KEY):
             return
         try:
-            _, cursor = await client.delta_changes(None)
+            # Only the cursor matters here; drain the baseline without keeping items
+            stream = await client.delta_stream(None)
+            async for _ in stream:
+                pass
+            cursor = stream.cursor
             if cursor:
                 await _kv_put(_DELTA_STATE_KEY, cursor)
                 dsx_logging.debug("Initialized OneDrive delta cursor from baseline delta query.")
@@ -172,29 +157,31 @@ async def _run_delta_sync(reason: str = "webhook", exclude_ids: Optional[Set[str
     lock = _ensure_delta_lock()
     async with lock:
         cursor = await _kv_get(_DELTA_STATE_KEY)
-        try:
-            items, new_cursor = await client.delta_changes(cursor)
-        except Exception as exc:
-            dsx_logging.warning(f"OneDrive delta sync failed ({reason}): {exc}")
-            return 0
-        if new_cursor:
-            await _kv_put(_DELTA_STATE_KEY, new_cursor)
         base_path, eff_filter = _asset_scope()
 
         async def _enqueue(item_id: str, metainfo: str, item: dict[str, Any]) -> None:
             await connector.scan_file_request(ScanRequestModel(location=item_id, metainfo=str(metainfo)))
 
-        enqueued, _ = await process_drive_delta_items(
-            items,
-            exclude_ids=set(exclude_ids or ()),
-            path_in_scope=_path_in_scope,
-            enqueue_file=_enqueue,
-            log_prefix="OneDrive",
-            base_path=base_path,
-            filter_text=eff_filter,
-        )
-        if items:
-            dsx_logging.info(f"OneDrive delta sync ({reason}) items={len(items)} enqueued={enqueued}")
+        # Stream pages straight into the enqueue loop; the cursor is only advanced once
+        # every page has been processed, so a failed walk is retried from the old cursor.
+        try:
+            stream = await client.delta_stream(cursor)
+            enqueued, _ = await process_drive_delta_items(
+                stream,
+                exclude_ids=set(exclude_ids or ()),
+                path_in_scope=_path_in_scope,
+                enqueue_file=_enqueue,
+                log_prefix="OneDrive",
+                base_path=base_path,
+                filter_text=eff_filter,
+            )
+        except Exception as exc:
+            dsx_logging.warning(f"OneDrive delta sync failed ({reason}): {exc}")
+            return 0
+        if stream.cursor:
+            await _kv_put(_DELTA_STATE_KEY, stream.cursor)
+        if stream.count:
+            dsx_logging.info(f"OneDrive delta sync ({reason}) items={stream.count} enqueued={enqueued}")
         return enqueued
 
 
@@ -275,12 +262,16 @@ async def startup_event(base: ConnectorInstanceModel) -> ConnectorInstanceModel:
 @connector.shutdown
 async def shutdown_event():
     dsx_logging.info(f"Shutting down connector {connector.connector_id}")
-    global _subs_task
+    global _subs_task, _subs_mgr
     if _subs_task is not None:
         _subs_task.cancel()
         with contextlib.suppress(asyncio.CancelledError):
             await _subs_task
         _subs_task = None
+    if _subs_mgr is not None:
+        with contextlib.suppress(Exception):
+            await _subs_mgr.close()
+        _subs_mgr = None
     try:
         await client.close()
     except Exception:
@@ -6,8 +6,8 @@ from urllib.parse import parse_qs, unquote, urlparse
 import httpx
 
 from shared.dsx_logging import dsx_logging
-from shared.graph.base import MSGraphClientBase
-from shared.graph.drive import build_drive_item_path, delta_changes
+from shared.graph.base import MSGraphClientBase, graph_json
+from shared.graph.drive import DeltaStream, build_drive_item_path, delta_changes
 from connectors.sharepoint.config import SharepointConnectorConfig
 
 SPO_API = "https://{host}/sites/{site}/_api"
@@ -154,7 +154,7 @@ class SharePointClient(MSGraphClientBase):
                 except Exception:
                     pass
                 raise RuntimeError(f"Graph list children failed: {resp.status_code} path={path} body={detail}")
-            data = resp.json()
+            data = graph_json(resp)
             items.extend(data.get("value", []))
             url = data.get("@odata.nextLink")
         return items
@@ -174,18 +174,12 @@ class SharePointClient(MSGraphClientBase):
                     stack.append(rel_path)
 
     async def iter_files_delta(self) -> AsyncIterator[Dict[str, Any]]:
-        await self._ensure_site_and_drive()
         cursor: Optional[str] = None
-        page_size = max(1, int(getattr(self._cfg, "sp_graph_page_size", 200) or 200))
         while True:
-            items, cursor = await delta_changes(
-                self,
-                self._drive_resource,
-                cursor,
-                page_size=page_size,
-            )
-            for item in items:
+            stream = await self.delta_stream(cursor)
+            async for item in stream:
                 yield item
+            cursor = stream.cursor
             if not cursor:
                 break
 
@@ -194,6 +188,12 @@ class SharePointClient(MSGraphClientBase):
         page_size = max(1, int(getattr(self._cfg, "sp_graph_page_size", 200) or 200))
         return await delta_changes(self, self._drive_resource, cursor, page_size=page_size)
 
+    async def delta_stream(self, cursor: Optional[str]) -> DeltaStream:
+        """Page-by-page delta iterator; its `cursor` is set once exhausted."""
+        await self._ensure_site_and_drive()
+        page_size = max(1, int(getattr(self._cfg, "sp_graph_page_size", 200) or 200))
+        return DeltaStream(self, self._drive_resource, cursor, page_size=page_size)
+
     async def download_file(self, identifier: str) -> httpx.Response:
         await self._ensure_site_and_drive()
         client = await self.get_client()
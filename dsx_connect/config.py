@@ -65,6 +65,8 @@ class SyslogConfig(BaseSettings):
     tls_cert_file: str | None = None
     tls_key_file: str | None = None
     tls_insecure: bool = False
+    # TLS message framing: octet (RFC6587 octet counting) | lf (newline-delimited, older collectors)
+    tls_framing: str = "octet"
 
 class DiannaConfig(BaseSettings):
     model_config = SettingsConfigDict(env_nested_delimiter="__")
@@ -6,6 +6,7 @@ version and :latest. Helm chart packaging/push is available via helm_* tasks.
 """
 from __future__ import annotations
 
+import functools
 import os
 import pathlib
 import re
@@ -18,10 +19,15 @@ IMAGE_NAME = "dsx-connect"
 REPO_UNAME = "dsxconnect"
 DEFAULT_HELM_REPO = "oci://registry-1.docker.io/dsxconnect"
 
+# Patterns used by the version/chart helpers, compiled once
+_VERSION_RE = re.compile(r"DSX_CONNECT_VERSION\s*=\s*[\"'](\d+\.\d+\.\d+)[\"']", re.ASCII)
+_BUMP_RE = re.compile(r'(DSX_CONNECT_VERSION\s*=\s*["\'])(\d+)\.(\d+)\.(\d+)(["\'])', re.ASCII)
+_CHART_NAME_RE = re.compile(r"^name:\s*([\w.-]+)", flags=re.MULTILINE)
+
 
 def _read_version() -> str:
     content = (PROJECT_ROOT / "version.py").read_text()
-    m = re.search(r"DSX_CONNECT_VERSION\s*=\s*[\"'](\d+\.\d+\.\d+)[\"']", content)
+    m = _VERSION_RE.search(content)
     if not m:
         raise ValueError("DSX_CONNECT_VERSION not found in version.py")
     return m.group(1)
@@ -46,12 +52,16 @@ def _update_chart_yaml(chart_path: pathlib.Path, version: str):
     chart_path.write_text("\n".join(lines) + "\n")
 
 
+@functools.lru_cache(maxsize=None)
+def _image_pin_re(image_repo: str) -> re.Pattern:
+    return re.compile(rf"^(?P<prefix>\s*\w*IMAGE\s*=\s*{re.escape(image_repo)}:)(?P<tag>[^\s]+)", flags=re.MULTILINE)
+
+
 def _update_env_image_pin(env_path: pathlib.Path, image_repo: str, version: str):
     if not env_path.exists():
         return
     text = env_path.read_text()
-    pattern = re.compile(rf"^(?P<prefix>\s*\w*IMAGE\s*=\s*{re.escape(image_repo)}:)(?P<tag>[^\s]+)", flags=re.MULTILINE)
-    new_text, count = pattern.subn(rf"\g<prefix>{version}", text, count=1)
+    new_text, count = _image_pin_re(image_repo).subn(rf"\g<prefix>{version}", text, count=1)
     if count:
         env_path.write_text(new_text)
 
@@ -61,14 +71,13 @@ def bump(c):
     """Increment the patch version in dsx_connect/version.py."""
     filename = PROJECT_ROOT / "version.py"
     content = filename.read_text()
-    pat = r'(DSX_CONNECT_VERSION\s*=\s*["\'])(\d+)\.(\d+)\.(\d+)(["\'])'
-    m = re.search(pat, content)
+    m = _BUMP_RE.search(content)
     if not m:
         raise ValueError("Version string not found in version.py")
     major, minor, patch = int(m.group(2)), int(m.group(3)), int(m.group(4))
     new_version = f"{major}.{minor}.{patch + 1}"
     new_line = f"{m.group(1)}{new_version}{m.group(5)}"
-    filename.write_text(re.sub(pat, new_line, content))
+    filename.write_text(_BUMP_RE.sub(new_line, content))
     print(f"Bumped version to {new_version}")
     env_sample = PROJECT_ROOT / "deploy" / "docker" / ".sample.core.env"
     _update_env_image_pin(env_sample, f"{REPO_UNAME}/{IMAGE_NAME}", new_version)
@@ -163,7 +172,7 @@ def helm_push(c, repo=DEFAULT_HELM_REPO, charts_dir="dist/charts", version=None)
     if version is None:
         version = _read_version()
     chart_yaml = PROJECT_ROOT / "deploy" / "helm" / "Chart.yaml"
-    m = re.search(r"^name:\s*([\w.-]+)", chart_yaml.read_text(), flags=re.MULTILINE)
+    m = _CHART_NAME_RE.search(chart_yaml.read_text())
     if not m:
         raise ValueError("Chart.yaml missing name")
     chart_name = m.group(1)
@@ -4,7 +4,7 @@ from typing import Any, Dict
 import time
 import redis as _redis
 from celery import signals
-from celery.signals import worker_process_init
+from celery.signals import worker_process_init, worker_process_shutdown
 from functools import cached_property
 
 from pydantic import ValidationError
@@ -14,7 +14,7 @@ from dsx_connect.taskworkers.names import Tasks, Queues
 from dsx_connect.taskworkers.workers.base_worker import BaseWorker, RetryGroup, RetryGroups
 from dsx_connect.taskworkers.dlq_store import enqueue_scan_result_dlq_sync, \
     make_scan_result_dlq_item
-from dsx_connect.taskworkers.errors import TaskError, MalformedScanRequest, MalformedResponse
+from dsx_connect.taskworkers.errors import MalformedScanRequest, MalformedResponse
 
 from dsx_connect.dsxa_client.verdict_models import DPAVerdictModel2
 from shared.models.connector_models import ScanRequestModel, ItemActionModel
@@ -27,29 +27,26 @@ from shared.models.status_responses import ItemActionStatusResponse
 # If you have helpers, import them here; otherwise keep the try/except blocks inline.
 
 def _send_syslog(scan_result: ScanResultModel, original_task_id: str, current_task_id: str) -> None:
-    """Attempt to send syslog; if uninitialized, warn with task context.
+    """Queue the verdict chain for syslog; if uninitialized, warn with task context.
 
-    Only raise a retryable error if an unexpected exception bubbles up.
+    Delivery happens on log_chain's dispatcher thread, which logs its own failures, so
+    there is nothing here for the task to retry.
     """
-    try:
-        from shared.log_chain import log_verdict_chain
-        sent = log_verdict_chain(
-            scan_result=scan_result,
-            scan_request_task_id=original_task_id,
-            current_task_id=current_task_id,
+    from shared.log_chain import log_verdict_chain
+    queued = log_verdict_chain(
+        scan_result=scan_result,
+        scan_request_task_id=original_task_id,
+        current_task_id=current_task_id,
+    )
+    if queued:
+        dsx_logging.debug(
+            f"[scan_result:{current_task_id}] syslog queued for {scan_result.scan_request.location}"
+        )
+    else:
+        # Provide worker-context warning to make logs clearer than MainProcess warning
+        dsx_logging.warning(
+            f"[scan_result:{current_task_id}] syslog not initialized; skipping for {scan_result.scan_request.location}"
         )
-        if sent:
-            dsx_logging.debug(
-                f"[scan_result:{current_task_id}] syslog sent for {scan_result.scan_request.location}"
-            )
-        else:
-            # Provide worker-context warning to make logs clearer than MainProcess warning
-            dsx_logging.warning(
-                f"[scan_result:{current_task_id}] syslog not initialized; skipping for {scan_result.scan_request.location}"
-            )
-    except Exception as e:
-        # Mark as retriable so BaseWorker will backoff/retry
-        raise TaskError(retriable=True, reason="syslog_failure") from e
 
 
 class ScanResultWorker(BaseWorker):
@@ -117,7 +114,7 @@ class ScanResultWorker(BaseWorker):
         except Exception:
             scan_result.status = ScanResultStatusEnum.SCANNED
 
-        # 3) critical: send syslog (retryable on failure)
+        # 3) critical: queue the verdict chain for syslog (written by log_chain's dispatcher)
         _send_syslog(scan_result, original_task_id=scan_request_task_id, current_task_id=self.context.task_id)
 
         # 4) optional extras (best-effort; never raise to retry)
@@ -332,6 +329,7 @@ def _init_syslog_for_worker(**kwargs):
             tls_cert=getattr(cfg.syslog, "tls_cert_file", None),
             tls_key=getattr(cfg.syslog, "tls_key_file", None),
             tls_insecure=bool(getattr(cfg.syslog, "tls_insecure", False)),
+            tls_framing=str(getattr(cfg.syslog, "tls_framing", "octet")),
         )
         try:
             dsx_logging.info(
@@ -345,3 +343,16 @@ def _init_syslog_for_worker(**kwargs):
             dsx_logging.warning(f"[scan_result] syslog init failed: {e}")
         except Exception:
             pass
+
+
+# Pool processes exit via os._exit, so atexit never runs there: write out queued verdict chains here
+@worker_process_shutdown.connect
+def _flush_syslog_for_worker(**kwargs):
+    try:
+        from shared.log_chain import flush_verdict_chain
+        flush_verdict_chain()
+    except Exception as e:
+        try:
+            dsx_logging.warning(f"[scan_result] syslog flush at shutdown failed: {e}")
+        except Exception:
+            pass
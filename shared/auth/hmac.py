@@ -1,6 +1,5 @@
 from __future__ import annotations
 import base64
-import hashlib
 import hmac as _hmac
 import os
 import time
@@ -11,16 +10,35 @@ def b64(v: bytes) -> str:
     return base64.b64encode(v).decode()
 
 
+def _message_prefix(method: str, path_q: str, ts: int | str, nonce: str) -> bytes:
+    # One f-string and one encode for the whole canonical header part
+    return f"{method.upper()}|{path_q}|{ts}|{nonce}|".encode()
+
+
 def build_message(method: str, path_q: str, ts: int | str, nonce: str, body: bytes | None) -> bytes:
-    return f"{method.upper()}|{path_q}|{ts}|{nonce}|".encode() + (body or b"")
+    return _message_prefix(method, path_q, ts, nonce) + (body or b"")
+
+
+# Above this, the body is fed to the MAC separately instead of being copied onto the prefix
+_INLINE_BODY_MAX = 64 * 1024
+
+
+def _signature(secret: str, method: str, path_q: str, ts: int | str, nonce: str, body: bytes | None) -> bytes:
+    """Raw HMAC-SHA256 of build_message(...), without materializing it for large bodies."""
+    prefix = _message_prefix(method, path_q, ts, nonce)
+    if not body or len(body) <= _INLINE_BODY_MAX:
+        # One-shot hmac.digest runs entirely in OpenSSL; no HMAC object per signature
+        return _hmac.digest(secret.encode(), prefix + (body or b""), "sha256")
+    mac = _hmac.new(secret.encode(), prefix, "sha256")
+    mac.update(body)
+    return mac.digest()
 
 
 def make_hmac_header(key_id: str, secret: str, method: str, path_q: str, body: bytes | None,
                      ts: int | None = None, nonce: str | None = None) -> str:
     ts = int(ts or time.time())
     nonce = nonce or b64(os.urandom(12))
-    msg = build_message(method, path_q, ts, nonce, body)
-    sig = b64(_hmac.new(secret.encode(), msg, hashlib.sha256).digest())
+    sig = b64(_signature(secret, method, path_q, ts, nonce, body))
     return f"DSX-HMAC key_id={key_id}, ts={ts}, nonce={nonce}, sig={sig}"
 
 
@@ -48,8 +66,9 @@ def verify_hmac(method: str, path_q: str, body: bytes | None, header: str,
     ts = int(parts.get("ts", 0))
     if abs(now - ts) > int(skew_seconds):
         raise ValueError("stale_request")
-    exp = b64(_hmac.new(secret.encode(), build_message(method, path_q, ts, parts.get("nonce", ""), body), hashlib.sha256).digest())
-    if not _hmac.compare_digest(exp, parts.get("sig", "")):
+    exp = base64.b64encode(_signature(secret, method, path_q, ts, parts.get("nonce", ""), body))
+    # Compare as bytes: no decode of the expected value, and a non-ASCII sig is just a mismatch
+    if not _hmac.compare_digest(exp, parts.get("sig", "").encode()):
         raise ValueError("bad_signature")
     return kid
 
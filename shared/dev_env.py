@@ -1,9 +1,14 @@
 import os
+import re
 from pathlib import Path
 from typing import Optional
 
 _DEVEVN_LOGGED = False
 
+# One KEY=VALUE assignment per line: optional indentation, key up to the first '=',
+# lines starting with '#' (comments) or '=' never match. Surrounding blanks are dropped.
+_ENV_LINE = re.compile(r"^[^\S\n]*([^#\s=][^=\n]*?)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$", re.MULTILINE)
+
 
 def load_devenv(default_path: Optional[Path] = None,
                 env_var: str = "DSXCONNECTOR_ENV_FILE") -> None:
@@ -20,23 +25,21 @@ def load_devenv(default_path: Optional[Path] = None,
     if not path:
         return
     try:
-        if not path.exists():
+        # A missing file is the common case outside dev; let the read itself be the existence check
+        try:
+            text = path.read_text()
+        except FileNotFoundError:
             return
         from shared.dsx_logging import dsx_logging
         import logging as _logging
-        applied = 0
-        for line in path.read_text().splitlines():
-            s = line.strip()
-            if not s or s.startswith("#"):
-                continue
-            if "=" not in s:
-                continue
-            key, val = s.split("=", 1)
-            key = key.strip()
-            val = val.strip().strip('"').strip("'")
-            if key and key not in os.environ:
-                os.environ[key] = val
-                applied += 1
+        updates: dict[str, str] = {}
+        for m in _ENV_LINE.finditer(text):
+            # First assignment of a key wins, as with line-by-line application
+            updates.setdefault(m.group(1), m.group(2).strip('"').strip("'"))
+        environ = os.environ
+        updates = {k: v for k, v in updates.items() if k not in environ}
+        environ.update(updates)
+        applied = len(updates)
 
         # Log once, at INFO, with summary including effective LOG_LEVEL if set
         # If LOG_LEVEL provided by .dev.env, update logger now (silent)
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 import asyncio
+import errno
 import fnmatch
+import functools
 import hashlib
 import io
+import itertools
 import os
 import pathlib
+import re
 import shutil
 import shlex
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path, PurePosixPath
-from typing import AsyncGenerator, Iterable, Iterator, List, Optional, Set, Tuple
+from typing import AsyncGenerator, Callable, Iterable, Iterator, List, Optional, Set, Tuple
 
 from shared.dsx_logging import dsx_logging
 
@@ -45,37 +53,130 @@ def calculate_sha256(filename: str | os.PathLike, chunk_size: int = 8192) -> str
     return h.hexdigest()
 
 
+_COPY_BATCH_SIZE = 256
+
+
+# errnos meaning "this kernel/filesystem can't do that copy primitive" → try the next one
+_KERNEL_COPY_FALLBACK_ERRNOS = frozenset(
+    e for e in (
+        getattr(errno, "ENOSYS", None), getattr(errno, "EXDEV", None), getattr(errno, "EINVAL", None),
+        getattr(errno, "EOPNOTSUPP", None), getattr(errno, "ENOTSUP", None), getattr(errno, "ENOTSOCK", None),
+    ) if e is not None
+)
+_KERNEL_COPY_CHUNK = 1 << 30
+
+
+def _kernel_copy_fds(in_fd: int, out_fd: int) -> bool:
+    """
+    Move all remaining bytes from in_fd to out_fd without a userspace buffer.
+    Tries copy_file_range, then sendfile; both advance the fd offsets, so a
+    fallback mid-copy resumes where the previous primitive stopped.
+    Returns False if neither primitive is usable before any byte was copied.
+    """
+    copied = 0
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is not None:
+        try:
+            while True:
+                n = copy_range(in_fd, out_fd, _KERNEL_COPY_CHUNK)
+                if n == 0:
+                    return True
+                copied += n
+        except OSError as e:
+            if e.errno not in _KERNEL_COPY_FALLBACK_ERRNOS:
+                raise
+    sendfile = getattr(os, "sendfile", None)
+    if sendfile is not None:
+        try:
+            while True:
+                n = sendfile(out_fd, in_fd, None, _KERNEL_COPY_CHUNK)
+                if n == 0:
+                    return True
+                copied += n
+        except OSError as e:
+            if e.errno not in _KERNEL_COPY_FALLBACK_ERRNOS:
+                raise
+    if copied:
+        raise OSError(errno.EIO, "in-kernel copy stopped part way", None)
+    return False
+
+
+def _kernel_copy(src: str | os.PathLike, dst: str | os.PathLike) -> None:
+    """
+    shutil.copy2 equivalent (contents + metadata) that keeps file data in the kernel
+    via copy_file_range/sendfile, falling back to shutil.copyfile where unsupported.
+    Like copy2, a directory dst receives the file under src's name, and a dst that is src
+    itself (same path, hardlink or symlink) raises shutil.SameFileError.
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    # Must come before open(dst, "wb"), which would truncate src if they are the same file
+    try:
+        same = os.path.samefile(src, dst)
+    except OSError:  # either side missing: nothing to clobber
+        same = False
+    if same:
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+        done = _kernel_copy_fds(fsrc.fileno(), fdst.fileno())
+    if not done:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
 def copy_file(source_file: str | os.PathLike, dest_file: str | os.PathLike) -> None:
     dest_dir = os.path.dirname(str(dest_file))
     if dest_dir:
         os.makedirs(dest_dir, exist_ok=True)
-    shutil.copy2(source_file, dest_file)
+    _kernel_copy(source_file, dest_file)
 
 
 def copy_files_recursively(
         source_dir: str | os.PathLike,
         destination_dir: str | os.PathLike,
         file_exclusions: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
 ) -> None:
     """
     Copy tree from source_dir to destination_dir, skipping files matching any of the
     fnmatch-style patterns in file_exclusions.
+
+    Copies are I/O-bound, so they are fanned out in batches to a bounded thread pool;
+    the first copy error is re-raised once the walk completes.
     """
-    src = Path(source_dir)
-    dst = Path(destination_dir)
+    src = str(source_dir)
+    dst = str(destination_dir)
     patterns = tuple(file_exclusions or ())
-
-    for root, subdirs, files in os.walk(src):
-        root_p = Path(root)
-        rel = root_p.relative_to(src)
-        target_root = dst / rel
-
-        for name in files:
-            rel_file_posix = (rel / name).as_posix()
-            if any(fnmatch.fnmatch(rel_file_posix, pat) for pat in patterns):
-                continue
-            target_root.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(root_p / name, target_root / name)
+    workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+
+    made_dirs: set[str] = set()
+    made_dirs_lock = threading.Lock()
+
+    def _copy_batch(batch: List[Tuple[str, str, str]]) -> None:
+        for src_file, target_dir, dst_file in batch:
+            if target_dir not in made_dirs:
+                os.makedirs(target_dir, exist_ok=True)
+                with made_dirs_lock:
+                    made_dirs.add(target_dir)
+            _kernel_copy(src_file, dst_file)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        batch: List[Tuple[str, str, str]] = []
+        for root, rel_dir, _subdirs, files in _scan_tree(src):
+            prefix = rel_dir + "/" if rel_dir else ""
+            target_root = os.path.join(dst, rel_dir) if rel_dir else dst
+            for name in files:
+                if any(fnmatch.fnmatch(prefix + name, pat) for pat in patterns):
+                    continue
+                batch.append((os.path.join(root, name), target_root, os.path.join(target_root, name)))
+                if len(batch) >= _COPY_BATCH_SIZE:
+                    futures.append(pool.submit(_copy_batch, batch))
+                    batch = []
+        if batch:
+            futures.append(pool.submit(_copy_batch, batch))
+        for fut in futures:
+            fut.result()
 
 
 async def read_file_async(filename: str | os.PathLike, chunk_size: int = -1) -> io.BytesIO:
@@ -86,9 +187,46 @@ async def read_file_async(filename: str | os.PathLike, chunk_size: int = -1) ->
     return data
 
 
+_READV_MIN_SIZE = 4 * 1024 * 1024
+_IOV_MAX = 1024
+
+
+def _readv_into(fd: int, view: memoryview, chunk_size: int) -> int:
+    """
+    Fill the writable `view` from fd's current offset with os.readv, `chunk_size` bytes per
+    iovec and up to _IOV_MAX iovecs per syscall. Short reads are resumed where they stopped;
+    returns the number of bytes read (less than len(view) only if EOF came early).
+    """
+    size = len(view)
+    filled = 0
+    while filled < size:
+        stop = min(size, filled + chunk_size * _IOV_MAX)
+        n = os.readv(fd, [view[i:min(i + chunk_size, stop)] for i in range(filled, stop, chunk_size)])
+        if n == 0:
+            break
+        filled += n
+    return filled
+
+
 def _read_file_blocking(filepath: Path, chunk_size: int = -1) -> io.BytesIO:
     b = io.BytesIO()
     with open(filepath, "rb") as f:
+        if chunk_size and chunk_size > 0 and hasattr(os, "readv"):
+            size = os.fstat(f.fileno()).st_size
+            if size >= _READV_MIN_SIZE:
+                # Size the BytesIO's own buffer up front and readv straight into it (getbuffer),
+                # many chunks per syscall and no second copy of the file in memory
+                b.seek(size - 1)
+                b.write(b"\0")
+                with b.getbuffer() as view:
+                    filled = _readv_into(f.fileno(), view, chunk_size)
+                # File shrank since fstat: drop the unfilled tail; grew: pick up the remainder
+                b.truncate(filled)
+                b.seek(filled)
+                for chunk in iter(lambda: os.read(f.fileno(), chunk_size), b""):
+                    b.write(chunk)
+                b.seek(0)
+                return b
         if chunk_size and chunk_size > 0:
             for chunk in iter(lambda: f.read(chunk_size), b""):
                 b.write(chunk)
@@ -105,9 +243,10 @@ def read_file(filepath: Path, chunk_size: int = -1) -> io.BytesIO:
 def validate_filepath(path: Path) -> bool:
     """
     Basic path sanity: exists, readable, not a broken symlink.
+    os.access() follows symlinks and fails for missing paths, so no separate exists() stat.
     """
     try:
-        return path.exists() and os.access(path, os.R_OK)
+        return os.access(path, os.R_OK)
     except Exception:
         return False
 
@@ -150,7 +289,7 @@ def _normalize_include_token(tok: str) -> Tuple[str, ...]:
     """
     - "" or "." handled by caller as include-all.
     - "*" → special: top-level only (handled later).
-    - Bare token like 'PDF' → keep literal; treated as base/'PDF' subtree by _expand_includes.
+    - Bare token like 'PDF' → keep literal; treated as base/'PDF' subtree by iter_files.
     - 'sub1/*' → keep literal (direct children).
     - Any glob/path (e.g., '**/*.pdf') → keep literal.
     - Comma list like '*.pdf,*.docx' → split by caller before calling this.
@@ -187,10 +326,13 @@ def _expand_rsync_dirs(includes: Tuple[str, ...]) -> Tuple[str, ...]:
     return tuple(out)
 
 
+@functools.lru_cache(maxsize=512)
 def parse_filter_spec(filter_str: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], bool, bool]:
     """
     Parse filter string into (includes, excludes, include_all, top_level_only)
 
+    Results are memoized: connectors evaluate the same filter for every listed item.
+
     Semantics:
       ""                → include_all=True (scan everything recursively)
       "*"               → top-level files only (no recursion)
@@ -239,185 +381,648 @@ def _split_excludes(excludes: Tuple[str, ...]) -> tuple[set[str], Tuple[str, ...
     return bare_dirs, tuple(glob_paths)
 
 
-def _is_excluded_rel(rel_posix: str, glob_paths: Tuple[str, ...]) -> bool:
-    p = PurePosixPath(rel_posix)           # enforces path-aware globbing
-    return any(p.match(pat) for pat in glob_paths)  # '?' won't match '/'
+def _translate_glob_part(part: str) -> str:
+    """
+    fnmatch-style translation of a single path component to a regex fragment.
+    Wildcards ('*', '?', '[!...]') never match '/', mirroring PurePosixPath.match.
+    """
+    i, n = 0, len(part)
+    out: List[str] = []
+    while i < n:
+        c = part[i]
+        i += 1
+        if c == "*":
+            if not out or out[-1] != "[^/]*":
+                out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i
+            if j < n and part[j] == "!":
+                j += 1
+            if j < n and part[j] == "]":
+                j += 1
+            while j < n and part[j] != "]":
+                j += 1
+            if j >= n:
+                out.append("\\[")
+                continue
+            stuff = part[i:j].replace("\\", "\\\\")
+            stuff = re.sub(r"([&~|\[\]])", r"\\\1", stuff)
+            i = j + 1
+            if stuff.startswith("!"):
+                stuff = "^/" + stuff[1:]
+            elif stuff.startswith("^"):
+                stuff = "\\" + stuff
+            out.append(f"[{stuff}]")
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
 
 
-def _should_descend(dir_abs: Path, base: Path,
-                    include_all: bool,
-                    include_prefixes: Tuple[str, ...],
-                    bare_ex_dirs: set[str],
-                    glob_ex_paths: Tuple[str, ...]) -> bool:
-    # prune by bare dir name first
-    if dir_abs.name in bare_ex_dirs:
-        return False
-    rel = dir_abs.relative_to(base).as_posix() if dir_abs != base else "."
-    # prune by glob/path excludes
-    if _is_excluded_rel(rel, glob_ex_paths):
-        return False
-    if include_all:
-        return True
-    # descend if this dir is on the path to any include (prefix match)
-    prefix = rel.rstrip("/") + "/"
-    return any(p.startswith(prefix) or p == rel for p in include_prefixes)
+def _never(_rel_posix: str) -> bool:
+    return False
 
 
-def _expand_includes(base: Path, token: str) -> Iterator[Path]:
+@functools.lru_cache(maxsize=256)
+def _glob_search(patterns: Tuple[str, ...]) -> Optional[Callable[[str], object]]:
     """
-    Yield files for a single include token using traversal-first logic.
+    Compile glob/path patterns into one regex and return its bound `search` (truthy on
+    a match for a non-empty POSIX relative path), or None if nothing can ever match.
+
+    Same semantics as any(PurePosixPath(rel).match(pat) for pat in patterns): relative
+    patterns match from the right, component by component; anchored ('/...') patterns
+    must match the whole path. '**' behaves like '*' within one component.
     """
-    if token == "":
-        # full recursive
-        yield from (p for p in base.rglob("*") if p.is_file())
-        return
+    relative: List[str] = []
+    anchored: List[str] = []
+    for pat in patterns:
+        parts = [p for p in pat.split("/") if p and p != "."]
+        if not parts:
+            continue
+        body = "/".join(_translate_glob_part(p) for p in parts)
+        (anchored if pat.startswith("/") else relative).append(body)
+    alts: List[str] = []
+    if relative:
+        alts.append("(?:\\A|/)(?:" + "|".join(relative) + ")")
+    if anchored:
+        alts.append("\\A/(?:" + "|".join(anchored) + ")")
+    if not alts:
+        return None
+    try:
+        return re.compile("(?:" + "|".join(alts) + ")\\Z").search
+    except re.error:
+        # Pathological character ranges: fall back to pathlib's own matching
+        return lambda rel_posix: any(PurePosixPath(rel_posix).match(pat) for pat in patterns)
 
-    if token == "*":
-        # top-level only
-        yield from (p for p in base.glob("*") if p.is_file())
-        return
 
-    # direct-children shorthand: 'sub1/*' with no extra glob chars in 'sub1'
-    if token.endswith("/*") and not _has_glob(token[:-2]):
-        sub = base / token[:-2]
-        if sub.is_dir():
-            yield from (p for p in sub.glob("*") if p.is_file())
-        elif sub.is_file():
-            # odd case 'file/*'
-            pass
-        return
+@functools.lru_cache(maxsize=256)
+def _glob_matcher(patterns: Tuple[str, ...]) -> Callable[[str], bool]:
+    """Boolean predicate form of _glob_search; empty paths never match."""
+    search = _glob_search(patterns)
+    if search is None:
+        return _never
+    return lambda rel_posix: bool(rel_posix) and bool(search(rel_posix))
 
-    # BARE path (no glob chars): treat as subtree RELATIVE to base
-    if not _has_glob(token):
-        sub = base / token
-        if sub.is_dir():
-            yield from (p for p in sub.rglob("*") if p.is_file())
-        elif sub.is_file():
-            yield sub
-        return
 
-    # Glob/path pattern (supports '**')
-    for p in base.rglob(token):
-        if p.is_file():
-            yield p
+def _is_excluded_rel(rel_posix: str, glob_paths: Tuple[str, ...]) -> bool:
+    return _glob_matcher(glob_paths)(rel_posix)
 
 
-def iter_files(base_dir: str | os.PathLike, filter_str: str) -> Iterator[Path]:
-    base = Path(base_dir)
-    includes, excludes, include_all, top_level_only = parse_filter_spec(filter_str)
+def _split_entries(it) -> Tuple[List[str], List[str], Set[str]]:
+    """Split a scandir iterator into (subdirs, files, symlinked subdirs) using d_type only."""
+    subdirs: List[str] = []
+    files: List[str] = []
+    symlinked: Set[str] = set()
+    for entry in it:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            subdirs.append(entry.name)
+            if entry.is_symlink():
+                symlinked.add(entry.name)
+        else:
+            files.append(entry.name)
+    return subdirs, files, symlinked
 
-    # If only excludes were given → start from whole tree
-    include_tokens: List[str] = list(includes) if not include_all else [""]
 
-    bare_ex_dirs, glob_ex_paths = _split_excludes(excludes)
+# openat()-style descent is available when scandir accepts a directory fd and os.open
+# honours dir_fd (Linux/BSD/macOS); Windows keeps the path-based walker.
+_FD_WALK = os.scandir in os.supports_fd and os.open in os.supports_dir_fd
+_DIR_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_CLOEXEC", 0)
+_SUBDIR_OPEN_FLAGS = _DIR_OPEN_FLAGS | getattr(os, "O_NOFOLLOW", 0)
 
-    # Precompute include prefixes for pruning (dirs only)
-    include_prefixes: Tuple[str, ...] = tuple(
-        tok.rstrip("/") for tok in include_tokens if tok not in ("", "*")
-    )
 
-    seen: set[Path] = set()
+# Directory listings the walker may run ahead of its consumer (see _scan_tree_fd).
+# Off by default: with a warm dentry cache the GIL makes pooled listing slower than
+# serial; it pays off on cold or network-backed trees (NFS/SMB mounts).
+_WALK_WORKERS = int(os.getenv("DSXCONNECTOR_SCAN_WORKERS", "0") or 0)
+_WALK_PREFETCH = 64
 
-    for inc in include_tokens:
-        # 1) Empty token → whole tree, with pruning
-        if inc == "":
-            if top_level_only:
-                for p in (q for q in base.glob("*") if q.is_file()):
-                    if p not in seen:
-                        seen.add(p)
-                        yield p
-                continue
 
-            for cur, subdirs, files in os.walk(base):
-                cur_path = Path(cur)
-                # prune subdirs in-place
-                keep = []
-                for d in subdirs:
-                    child = cur_path / d
-                    if _should_descend(child, base, True, (), bare_ex_dirs, glob_ex_paths):
-                        keep.append(d)
-                subdirs[:] = keep
-
-                rel_dir = "." if cur_path == base else cur_path.relative_to(base).as_posix()
-                for fname in files:
-                    f = cur_path / fname
-                    rel = fname if rel_dir == "." else f"{rel_dir}/{fname}"
-                    if _is_excluded_rel(rel, glob_ex_paths) or f.parent.name in bare_ex_dirs:
-                        continue
-                    if f not in seen:
-                        seen.add(f)
-                        yield f
-            continue
+class _DirFd:
+    """Open directory fd shared by the not-yet-visited children that are opened relative to it."""
 
-        # 2) Top-level only
-        if inc == "*":
-            for p in (q for q in base.glob("*") if q.is_file()):
-                if p not in seen:
-                    seen.add(p)
-                    yield p
+    __slots__ = ("fd", "pending")
+
+    def __init__(self, fd: int, pending: int):
+        self.fd = fd
+        self.pending = pending
+
+
+def _scan_tree(
+    top: str, rel_top: str = "", workers: Optional[int] = None
+) -> Iterator[Tuple[str, str, List[str], List[str]]]:
+    """
+    Iterative os.scandir-based replacement for os.walk(top) (topdown, no symlink following).
+
+    Yields (dirpath, rel_dir, subdirs, files) with plain string names; callers may prune
+    `subdirs` in place exactly as with os.walk. `rel_dir` is the POSIX path of dirpath
+    relative to the scan base ("" for the base itself), built by string concatenation as
+    we descend so callers never need Path.relative_to(). DirEntry type checks reuse the
+    d_type returned by readdir, so no extra stat is issued per entry.
+
+    `workers` > 1 lists upcoming directories on a thread pool ahead of the consumer
+    (default: _WALK_WORKERS); the yield order is the same as the serial walk.
+    """
+    if _FD_WALK:
+        return _scan_tree_fd(top, rel_top, _WALK_WORKERS if workers is None else workers)
+    return _scan_tree_path(top, rel_top)
+
+
+def _scan_tree_path(top: str, rel_top: str) -> Iterator[Tuple[str, str, List[str], List[str]]]:
+    stack = [(top, rel_top)]
+    while stack:
+        cur, rel_dir = stack.pop()
+        try:
+            with os.scandir(cur) as it:
+                subdirs, files, symlinked = _split_entries(it)
+        except OSError:
             continue
+        yield cur, rel_dir, subdirs, files
+        # Push in reverse so siblings are visited in listing order (matches os.walk)
+        prefix = rel_dir + "/" if rel_dir else ""
+        for d in reversed(subdirs):
+            if d not in symlinked:
+                stack.append((os.path.join(cur, d), prefix + d))
+
 
-        # 3) Bare subtree (no glob chars) → walk that subtree
-        if not _has_glob(inc) and not inc.endswith("/*"):
-            sub = base / inc
-            if sub.is_file():
-                rel = sub.relative_to(base).as_posix()
-                if not _is_excluded_rel(rel, glob_ex_paths) and sub.parent.name not in bare_ex_dirs:
-                    if sub not in seen:
-                        seen.add(sub); yield sub
+class _DirListingCache:
+    """
+    Bounded LRU of directory listings keyed by (st_dev, st_ino) and validated by the
+    directory's st_mtime_ns: adding, removing or renaming an entry bumps the mtime, so
+    an unchanged directory is served from one fstat() instead of a full readdir.
+    Listings whose mtime is within _RACY_NS of the wall clock are not stored, since a
+    coarse-granularity filesystem could still change them without moving the mtime.
+    Network mounts may not keep directory mtimes coherent across clients at all, so
+    scans there skip the cache by default (see _dir_cache_for).
+    """
+
+    _RACY_NS = 2_000_000_000
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[int, int], Tuple[int, List[str], List[str], Set[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, st: os.stat_result) -> Optional[Tuple[List[str], List[str], Set[str]]]:
+        key = (st.st_dev, st.st_ino)
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            if hit[0] != st.st_mtime_ns:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        # Fresh lists: callers prune subdirs in place
+        return list(hit[1]), list(hit[2]), hit[3]
+
+    def put(self, st: os.stat_result, subdirs: List[str], files: List[str], symlinked: Set[str]) -> None:
+        if st.st_mtime_ns > time.time_ns() - self._RACY_NS:
+            return
+        with self._lock:
+            self._data[(st.st_dev, st.st_ino)] = (st.st_mtime_ns, list(subdirs), list(files), symlinked)
+            self._data.move_to_end((st.st_dev, st.st_ino))
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_DIR_CACHE = _DirListingCache(maxsize=50_000)
+
+# DSXCONNECTOR_SCAN_DIR_CACHE: "auto" (default) uses _DIR_CACHE except for scan roots on a
+# network filesystem; "on" / "off" force it for every scan.
+_DIR_CACHE_MODE = (os.getenv("DSXCONNECTOR_SCAN_DIR_CACHE", "auto") or "auto").strip().lower()
+_NETWORK_FS_TYPES = frozenset({
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "afs", "ceph", "glusterfs", "lustre", "gpfs",
+    "davfs", "fuse.sshfs", "fuse.s3fs", "fuse.gcsfuse", "fuse.blobfuse", "fuse.rclone",
+})
+_MOUNTS_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+@functools.lru_cache(maxsize=64)
+def _fs_type(path: str, st_dev: int) -> Optional[str]:
+    """
+    Type of the filesystem mounted at `path`'s nearest mount point (Linux /proc); None if
+    unknown. Memoized per (path, st_dev): a scan root is resolved against the mount table
+    once, and mounting something else over it changes st_dev, which forces a fresh lookup.
+    """
+    try:
+        with open("/proc/self/mounts", encoding="utf-8", errors="replace") as f:
+            mounts = f.read().splitlines()
+    except OSError:
+        return None
+    path = os.path.realpath(path)
+    best, best_type = "", None
+    for line in mounts:
+        fields = line.split()
+        if len(fields) < 3:
+            continue
+        # Mount points escape spaces etc. as octal (\040)
+        mnt = _MOUNTS_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), fields[1])
+        if (path == mnt or path.startswith(mnt.rstrip("/") + "/")) and len(mnt) >= len(best):
+            best, best_type = mnt, fields[2]
+    return best_type
+
+
+def _dir_cache_for(top: str) -> Optional[_DirListingCache]:
+    """The listing cache a scan of `top` may use, or None to always readdir (see _DIR_CACHE_MODE)."""
+    if _DIR_CACHE_MODE in ("off", "0", "false", "no"):
+        return None
+    if _DIR_CACHE_MODE in ("on", "1", "true", "yes"):
+        return _DIR_CACHE
+    try:
+        st_dev = os.stat(top).st_dev
+    except OSError:  # the walk itself will skip an unreadable root
+        return None
+    return None if _fs_type(top, st_dev) in _NETWORK_FS_TYPES else _DIR_CACHE
+
+
+def _open_and_list(
+    parent: Optional[_DirFd],
+    name: str,
+    held: Set[_DirFd],
+    lock: threading.Lock,
+    cache: Optional[_DirListingCache],
+) -> Optional[Tuple[int, List[str], List[str], Set[str]]]:
+    """
+    Open `name` (relative to parent's fd, or as a path for the root) and list it, through
+    `cache` when one is given.
+    Returns (fd, subdirs, files, symlinked) with fd left open for the children, or None.
+    Runs on walker threads, so the parent's refcount is dropped under `lock`.
+    """
+    fd = -1
+    try:
+        if parent is None:
+            fd = os.open(name, _DIR_OPEN_FLAGS)
+        else:
+            fd = os.open(name, _SUBDIR_OPEN_FLAGS, dir_fd=parent.fd)
+    except OSError:
+        pass
+    finally:
+        if parent is not None:
+            with lock:
+                parent.pending -= 1
+                if not parent.pending:
+                    held.discard(parent)
+                    os.close(parent.fd)
+    if fd < 0:
+        return None
+    try:
+        if cache is not None:
+            st = os.fstat(fd)
+            cached = cache.get(st)
+            if cached is not None:
+                return (fd,) + cached
+        # scandir(fd) dup()s the descriptor, so fd stays ours to close
+        with os.scandir(fd) as it:
+            listing = _split_entries(it)
+        if cache is not None:
+            cache.put(st, *listing)
+        return (fd,) + listing
+    except OSError:
+        os.close(fd)
+        return None
+
+
+def _scan_tree_fd(
+    top: str, rel_top: str, workers: int
+) -> Iterator[Tuple[str, str, List[str], List[str]]]:
+    """
+    _scan_tree variant that opens each subdirectory relative to its parent's fd
+    (openat semantics), so the kernel resolves one component per directory instead of
+    re-walking the full path from the scan root on every scandir. A parent fd stays open
+    only while it still has unvisited children, which bounds open fds by tree depth.
+    O_NOFOLLOW keeps a directory swapped for a symlink mid-scan from being followed.
+
+    With workers > 1, child listings are submitted to a pool as soon as the consumer has
+    pruned a directory (at most _WALK_PREFETCH outstanding), so several readdir streams
+    are in flight while the caller processes the current one. The DFS order is unchanged.
+    """
+    lock = threading.Lock()
+    held: Set[_DirFd] = set()
+    cache = _dir_cache_for(top)
+    pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    outstanding = 0
+    # (parent, name, dirpath, rel_dir, pending listing or None to list inline)
+    stack: list = [(None, top, top, rel_top, None)]
+    try:
+        while stack:
+            parent, name, cur, rel_dir, fut = stack.pop()
+            if fut is not None:
+                outstanding -= 1
+                listing = fut.result()
+            else:
+                listing = _open_and_list(parent, name, held, lock, cache)
+            if listing is None:
                 continue
-            if not sub.is_dir():
+            fd, subdirs, files, symlinked = listing
+            try:
+                yield cur, rel_dir, subdirs, files
+            except BaseException:
+                os.close(fd)
+                raise
+            children = [d for d in subdirs if d not in symlinked]
+            if not children:
+                os.close(fd)
                 continue
-
-            for cur, subdirs, files in os.walk(sub):
-                cur_path = Path(cur)
-                # prune ONLY by excludes (since we're already scoped to the include subtree)
-                pruned = []
-                for d in subdirs:
-                    child = cur_path / d
-                    # dir-name exclude
-                    if d in bare_ex_dirs:
-                        continue
-                    # glob/path exclude on the child dir's rel path
-                    child_rel = child.relative_to(base).as_posix()
-                    if _is_excluded_rel(child_rel, glob_ex_paths):
-                        continue
-                    pruned.append(d)
-                subdirs[:] = pruned
-
-                rel_dir = cur_path.relative_to(base).as_posix()
-                for fname in files:
-                    f = cur_path / fname
-                    rel = f"{rel_dir}/{fname}"
-                    if _is_excluded_rel(rel, glob_ex_paths) or f.parent.name in bare_ex_dirs:
-                        continue
-                    if f not in seen:
-                        seen.add(f); yield f
+            holder = _DirFd(fd, len(children))
+            with lock:
+                held.add(holder)
+            prefix = rel_dir + "/" if rel_dir else ""
+            entries = []
+            for d in children:
+                fut = None
+                if pool is not None and outstanding < _WALK_PREFETCH:
+                    fut = pool.submit(_open_and_list, holder, d, held, lock, cache)
+                    outstanding += 1
+                entries.append((holder, d, os.path.join(cur, d), prefix + d, fut))
+            # Push in reverse so siblings are visited in listing order (matches os.walk)
+            stack.extend(reversed(entries))
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+            for entry in stack:
+                fut = entry[4]
+                if fut is not None and not fut.cancelled() and fut.exception() is None:
+                    listing = fut.result()
+                    if listing is not None:
+                        os.close(listing[0])
+        with lock:
+            for holder in held:
+                os.close(holder.fd)
+            held.clear()
+
+
+def _rglob_tokens(pattern: str) -> List[Optional[str]]:
+    """
+    Path.rglob(pattern) as a component list: None stands for a run of zero or more
+    directories ('**', including the implied leading one), other entries are fnmatch
+    components. Adjacent '**' runs are merged since they match the same paths.
+    """
+    tokens: List[Optional[str]] = [None]
+    for part in pattern.split("/"):
+        if not part or part == ".":
             continue
+        if part == "**":
+            if tokens[-1] is not None:
+                tokens.append(None)
+        else:
+            tokens.append(part)
+    return tokens
 
-        # 4) Direct-children form 'sub1/*'
-        if inc.endswith("/*") and not _has_glob(inc[:-2]):
-            sub = base / inc[:-2]
-            if sub.is_dir():
-                for f in (q for q in sub.glob("*") if q.is_file()):
-                    rel = f.relative_to(base).as_posix()
-                    if _is_excluded_rel(rel, glob_ex_paths) or f.parent.name in bare_ex_dirs:
+
+def _translate_rglob(pattern: str) -> str:
+    """
+    Regex for base-relative POSIX paths that Path.rglob(pattern) would yield: a '**/'
+    is implied in front, '**' components match zero or more directories, and other
+    components follow fnmatch rules without crossing '/'.
+    """
+    tokens = _rglob_tokens(pattern)
+    out = ["\\A"]
+    for i, tok in enumerate(tokens):
+        if tok is None:
+            out.append("(?:[^/]+/)*")
+        else:
+            out.append(_translate_glob_part(tok))
+            if i < len(tokens) - 1:
+                out.append("/")
+    out.append("\\Z")
+    return "".join(out)
+
+
+def _rglob_segment_matcher(pattern: str) -> Callable[[str], bool]:
+    """
+    Segment-wise matcher equivalent to _translate_rglob(pattern), for patterns with more
+    than one '**' run. Each run is a backtracking point for `re`, so a regex with k of
+    them costs O(segments^k) on a path that does not match (seconds for k=4 on a deep
+    path). This tracks the set of reachable segment positions per component instead:
+    O(components * segments) whatever the pattern.
+    """
+    tokens = [None if t is None else re.compile(_translate_glob_part(t)).fullmatch
+              for t in _rglob_tokens(pattern)]
+    trailing_run = tokens[-1] is None
+
+    def match(rel: str) -> bool:
+        segs = rel.split("/")
+        n = len(segs)
+        states = {0}
+        for tok in tokens:
+            nxt: Set[int] = set()
+            if tok is None:
+                # Zero or more non-empty directory segments, each followed by '/'
+                for i in states:
+                    nxt.add(i)
+                    while i < n - 1 and segs[i]:
+                        i += 1
+                        nxt.add(i)
+            else:
+                for i in states:
+                    if i < n and tok(segs[i]):
+                        nxt.add(i + 1)
+            if not nxt:
+                return False
+            states = nxt
+        if trailing_run:
+            # A trailing '**' only matches directories: the text must end in '/'
+            return n - 1 in states and segs[-1] == ""
+        return n in states
+
+    return match
+
+
+@functools.lru_cache(maxsize=256)
+def _rglob_search(patterns: Tuple[str, ...]) -> Callable[[str], object]:
+    """
+    Predicate answering "would any of Path.rglob(pattern) yield this rel path": one union
+    regex for patterns with a single '**' run, segment matchers for the rest.
+    """
+    simple = [p for p in patterns if _rglob_tokens(p).count(None) <= 1]
+    preds: List[Callable[[str], object]] = [
+        _rglob_segment_matcher(p) for p in patterns if _rglob_tokens(p).count(None) > 1
+    ]
+    if simple:
+        preds.insert(0, re.compile("|".join(f"(?:{_translate_rglob(p)})" for p in simple)).search)
+    if len(preds) == 1:
+        return preds[0]
+    return lambda rel: any(pred(rel) for pred in preds)
+
+
+@dataclass(frozen=True)
+class _CompiledFilter:
+    """
+    A parsed filter string, pre-sorted by traversal strategy so iter_files can plan its
+    walks once: glob includes share a single tree walk via one union regex.
+    """
+    include_all: bool
+    top_level: bool                      # '*' token: files directly under base
+    subtrees: Tuple[str, ...]            # bare tokens: recurse under base/tok
+    child_dirs: Tuple[str, ...]          # 'sub1/*' tokens: direct children of base/sub1
+    glob_search: Optional[Callable[[str], object]]  # union of glob tokens (rglob semantics)
+    bare_ex_dirs: frozenset
+    ex_search: Optional[Callable[[str], object]]    # glob/path excludes (None: none given)
+    is_excluded: Callable[[str], bool]
+
+    @property
+    def source_count(self) -> int:
+        return (int(self.include_all) + int(self.top_level) + len(self.subtrees)
+                + len(self.child_dirs) + int(self.glob_search is not None))
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_filter(filter_str: str) -> _CompiledFilter:
+    includes, excludes, include_all, _top_level_only = parse_filter_spec(filter_str)
+    bare_ex_dirs, glob_ex_paths = _split_excludes(excludes)
+
+    top_level = False
+    subtrees: List[str] = []
+    child_dirs: List[str] = []
+    globs: List[str] = []
+    for inc in includes:
+        if inc == "*":
+            top_level = True
+        elif inc.endswith("/*") and not _has_glob(inc[:-2]):
+            child_dirs.append(inc[:-2])
+        elif not _has_glob(inc):
+            subtrees.append(inc)
+        else:
+            globs.append(inc)
+
+    return _CompiledFilter(
+        include_all=include_all,
+        top_level=top_level,
+        subtrees=tuple(dict.fromkeys(subtrees)),
+        child_dirs=tuple(dict.fromkeys(child_dirs)),
+        glob_search=_rglob_search(tuple(globs)) if globs else None,
+        bare_ex_dirs=frozenset(bare_ex_dirs),
+        ex_search=_glob_search(glob_ex_paths),
+        is_excluded=_glob_matcher(glob_ex_paths),
+    )
+
+
+def _iter_dir_files(directory: Path) -> Iterator[Path]:
+    """Files directly under `directory` (symlinks to files included), like glob('*') + is_file()."""
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_file():
+                        yield Path(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        return
+
+
+def iter_files(base_dir: str | os.PathLike, filter_str: str) -> Iterator[Path]:
+    base = Path(base_dir)
+    if not (filter_str or "").strip():
+        # No filter (the common case): every file in the tree, no parsing, pruning or dedup
+        for cur, _rel_dir, _subdirs, files in _scan_tree(str(base)):
+            for fname in files:
+                yield Path(os.path.join(cur, fname))
+        return
+
+    flt = _compile_filter(filter_str)
+    bare_ex_dirs = flt.bare_ex_dirs
+    is_excluded = flt.is_excluded
+    # Raw regex search for the per-directory list filters in the walkers (None: no globs)
+    ex_search = flt.ex_search
+
+    # Dedup by path string (cheap hash). A single traversal cannot produce duplicates
+    # (symlinked dirs are not followed), so skip the set entirely in that case.
+    dedup = flt.source_count > 1
+    seen: set[str] = set()
+
+    def _walk_pruned(top: Path, rel_top: str) -> Iterator[Path]:
+        # Walk a subtree, pruning by excludes: dir-name excludes, then glob/path
+        # excludes on each child's base-relative path; filter whole listings per directory
+        for cur, rel_dir, subdirs, files in _scan_tree(str(top), rel_top):
+            prefix = rel_dir + "/" if rel_dir else ""
+            if bare_ex_dirs:
+                subdirs[:] = [d for d in subdirs if d not in bare_ex_dirs]
+            if ex_search is not None:
+                subdirs[:] = [d for d in subdirs if not ex_search(prefix + d)]
+
+            parent_name = rel_dir.rsplit("/", 1)[-1] if rel_dir else base.name
+            if parent_name in bare_ex_dirs:
+                continue
+            if ex_search is not None:
+                files = [f for f in files if not ex_search(prefix + f)]
+            for fname in files:
+                fpath = os.path.join(cur, fname)
+                if dedup:
+                    if fpath in seen:
                         continue
-                    if f not in seen:
-                        seen.add(f); yield f
+                    seen.add(fpath)
+                yield Path(fpath)
+
+    # 1) Only excludes were given → whole tree, with pruning
+    if flt.include_all:
+        yield from _walk_pruned(base, "")
+        return
+
+    # 2) Top-level only
+    if flt.top_level:
+        for p in _iter_dir_files(base):
+            key = str(p)
+            if not dedup or key not in seen:
+                seen.add(key)
+                yield p
+
+    # 3) Bare subtree (no glob chars) → walk that subtree
+    for inc in flt.subtrees:
+        sub = base / inc
+        if sub.is_file():
+            rel = sub.relative_to(base).as_posix()
+            if not is_excluded(rel) and sub.parent.name not in bare_ex_dirs:
+                key = str(sub)
+                if key not in seen:
+                    seen.add(key); yield sub
             continue
+        if sub.is_dir():
+            yield from _walk_pruned(sub, sub.relative_to(base).as_posix())
 
-        # 5) Glob/path form (supports **)
-        for f in base.rglob(inc):
-            if not f.is_file():
+    # 4) Direct-children form 'sub1/*'
+    for inc in flt.child_dirs:
+        sub = base / inc
+        if not sub.is_dir() or sub.name in bare_ex_dirs:
+            continue
+        prefix = sub.relative_to(base).as_posix() + "/"
+        for f in _iter_dir_files(sub):
+            if is_excluded(prefix + f.name):
                 continue
-            if top_level_only and f.parent != base:
+            key = str(f)
+            if not dedup or key not in seen:
+                seen.add(key); yield f
+
+    # 5) Glob/path forms (support **): rglob semantics, all globs in one scandir walk
+    inc_search = flt.glob_search
+    if inc_search is None:
+        return
+    for cur, rel_dir, _subdirs, files in _scan_tree(str(base)):
+        prefix = rel_dir + "/" if rel_dir else ""
+        if (rel_dir.rsplit("/", 1)[-1] if rel_dir else base.name) in bare_ex_dirs:
+            continue
+        for fname in files:
+            rel = prefix + fname
+            if not inc_search(rel) or is_excluded(rel):
                 continue
-            rel = f.relative_to(base).as_posix()
-            if _is_excluded_rel(rel, glob_ex_paths) or f.parent.name in bare_ex_dirs:
+            fpath = os.path.join(cur, fname)
+            if not os.path.isfile(fpath):
                 continue
-            if f not in seen:
-                seen.add(f); yield f
+            if dedup:
+                if fpath in seen:
+                    continue
+                seen.add(fpath)
+            yield Path(fpath)
+
 
 # ======================
 # Sync path enumeration
@@ -475,20 +1080,18 @@ def get_filepaths(path: str | Path, filter_str: str = "") -> List[Path]:
         # - bare filename equals rel_name
         # - glob without "/" matches rel_name
         # - pattern with "/" matches the full path string
-        name_pp = PurePosixPath(rel_name)
-        full_pp = PurePosixPath(rel_full)
         for inc in includes:
             if inc in ("", "*"):
                 return [root]
             if "/" in inc:
-                if full_pp.match(inc):
+                if _glob_matcher((inc,))(rel_full):
                     return [root]
                 continue
             if not _has_glob(inc):
                 if inc == rel_name:
                     return [root]
             else:
-                if name_pp.match(inc):
+                if _glob_matcher((inc,))(rel_name):
                     return [root]
         return []
 
@@ -526,11 +1129,12 @@ def path_matches_filter(base_dir: Path | str, file_path: Path | str, filter_str:
     except Exception:
         return False
 
-    includes, excludes, include_all, top_level_only = parse_filter_spec(filter_str)
-    bare_ex_dirs, glob_ex_paths = _split_excludes(excludes)
+    includes, _excludes, include_all, top_level_only = parse_filter_spec(filter_str)
+    flt = _compile_filter(filter_str)
+    bare_ex_dirs = flt.bare_ex_dirs
 
     # Apply excludes first
-    if _is_excluded_rel(rel, glob_ex_paths):
+    if flt.is_excluded(rel):
         return False
 
     # Bare directory excludes apply if any ancestor directory name matches
@@ -570,12 +1174,12 @@ def path_matches_filter(base_dir: Path | str, file_path: Path | str, filter_str:
         # General case: treat tok as a glob/path pattern relative to base
         try:
             # Primary check: pattern against relative path
-            if rel_pp.match(tok):
+            if _glob_matcher((tok,))(rel):
                 return True
             # Allow common '**/*.ext' style to match top-level files too
             if tok.startswith("**/"):
                 tail = tok[3:]
-                if PurePosixPath(rel_pp.name).match(tail):
+                if _glob_matcher((tail,))(rel_pp.name):
                     return True
             return False
         except Exception:
@@ -595,12 +1199,14 @@ def relpath_matches_filter(rel_posix: str, filter_str: str = "") -> bool:
     # Normalize to posix path semantics
     rel = rel_posix.strip("/")
     pp = PurePosixPath(rel)
+    norm = "/".join(pp.parts)  # collapses '//' and '.' segments like PurePosixPath does
 
-    includes, excludes, include_all, top_level_only = parse_filter_spec(filter_str)
-    bare_ex_dirs, glob_ex_paths = _split_excludes(excludes)
+    includes, _excludes, include_all, top_level_only = parse_filter_spec(filter_str)
+    flt = _compile_filter(filter_str)
+    bare_ex_dirs = flt.bare_ex_dirs
 
     # Exclude checks
-    if _is_excluded_rel(rel, glob_ex_paths):
+    if flt.is_excluded(norm):
         return False
     if bare_ex_dirs and any(part in bare_ex_dirs for part in pp.parts[:-1]):
         return False
@@ -622,11 +1228,11 @@ def relpath_matches_filter(rel_posix: str, filter_str: str = "") -> bool:
         if not _has_glob(tok) and "/" not in tok:
             return rel == tok or rel.startswith(tok + "/")
         # General glob/path pattern
-        if pp.match(tok):
+        if _glob_matcher((tok,))(norm):
             return True
         if tok.startswith("**/"):
             tail = tok[3:]
-            if PurePosixPath(pp.name).match(tail):
+            if _glob_matcher((tail,))(pp.name):
                 return True
         return False
 
@@ -682,40 +1288,23 @@ def compute_prefix_hints(filter_str: str) -> List[str]:
 # Async path enumeration
 # =======================
 
-async def _estimate_file_count(base_dir: pathlib.Path, sample_limit: int = 500) -> int:
+def _is_small_flat_dir(base_dir: pathlib.Path, max_entries: int) -> bool:
     """
-    Quick estimate of file count to decide between sync vs async approach.
-    Uses a sampling strategy to avoid traversing the entire tree.
+    Constant-time size hint: True if base_dir has fewer than `max_entries` entries and
+    no subdirectories, judged from at most `max_entries` entries of one scandir batch.
     """
     try:
-        count = 0
-        dirs_checked = 0
-        max_dirs_to_check = 10
-
-        for root, dirs, files in os.walk(base_dir):
-            count += len(files)
-            dirs_checked += 1
-
-            # Early exit if we find many files quickly
-            if count > sample_limit:
-                # Extrapolate based on directory depth and breadth
-                depth_factor = max(1, dirs_checked)
-                breadth_factor = max(1, len(dirs))
-                return min(count * depth_factor * breadth_factor, 1_000_000)  # Cap estimation
-
-            # Limit sampling to avoid long estimation times
-            if dirs_checked >= max_dirs_to_check:
-                break
-
-        return count
-    except Exception:
-        return sample_limit + 1  # Default to async if estimation fails
+        with os.scandir(base_dir) as it:
+            entries = list(itertools.islice(it, max_entries))
+    except OSError:
+        return False
+    return len(entries) < max_entries and not any(e.is_dir() for e in entries)
 
 
 async def get_filepaths_async(path: str | Path, filter_str: str = "") -> AsyncGenerator[Path, None]:
     """
     Optimized async generator yielding file paths with the same semantics as get_filepaths().
-    Automatically chooses between sync and async approaches based on estimated dataset size.
+    Directory walking happens off the event loop (see get_filepaths_rsync_async).
     """
     root = Path(path).expanduser()
     if not root.exists():
@@ -736,197 +1325,99 @@ async def get_filepaths_rsync_async(
         base_dir: pathlib.Path,
         filter_str: str = "",
         batch_size: int = 200,
-        small_dataset_threshold: int = 1000
+        small_dataset_threshold: int = 32
 ) -> AsyncGenerator[pathlib.Path, None]:
     """
     Highly optimized async version of the full rsync-like file filtering.
-    Uses hybrid sync/async approach and pathlib optimizations for best performance.
+
+    Top-level-only filters and small flat directories (fewer than
+    `small_dataset_threshold` entries, no subdirectories) are collected with a single
+    worker-thread call. Otherwise the directory walk (iter_files) runs in a worker
+    thread and hands paths to the event loop in batches of `batch_size` through a
+    bounded queue, so scandir/stat calls never block the loop and a slow consumer
+    throttles the walk.
     """
     # Use the existing sophisticated filter parsing
     includes, excludes, include_all, top_level_only = parse_filter_spec(filter_str)
 
     dsx_logging.info(f"Parsed filter - includes: {includes}, excludes: {excludes}, include_all: {include_all}, top_level_only: {top_level_only}")
 
-    # For small datasets, use sync version to avoid async overhead
-    estimated_count = await _estimate_file_count(base_dir, small_dataset_threshold // 2)
-    if estimated_count < small_dataset_threshold:
-        # Use sync version for small datasets - it's faster
-        for file_path in iter_files(base_dir, filter_str):
+    # Small listings: one thread hop for the whole result beats streaming overhead
+    if top_level_only or await asyncio.to_thread(_is_small_flat_dir, base_dir, small_dataset_threshold):
+        for file_path in await asyncio.to_thread(list, iter_files(base_dir, filter_str)):
             yield file_path
         return
 
-    # Convert to the internal format expected by the filtering functions
-    include_tokens = list(includes) if not include_all else [""]
-    bare_ex_dirs, glob_ex_paths = _split_excludes(excludes)
-
-    # Track seen files to avoid duplicates
-    seen = set()
-    yielded_count = 0
-
-    for inc in include_tokens:
-        async for file_path in _process_include_token_async_optimized(
-                inc, base_dir, top_level_only, bare_ex_dirs, glob_ex_paths, batch_size
-        ):
-            if file_path not in seen:
-                seen.add(file_path)
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    # Backpressure lives on the producer side: a batch needs a free slot before it is
+    # handed over, so the walker only waits when the consumer is _WALK_QUEUE_BATCHES behind
+    slots = threading.Semaphore(_WALK_QUEUE_BATCHES)
+    stop = threading.Event()
+    producer = asyncio.ensure_future(
+        asyncio.to_thread(_walk_to_queue, base_dir, filter_str, queue, loop, slots, stop, batch_size)
+    )
+    try:
+        while True:
+            item = await queue.get()
+            if item is _WALK_DONE:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            slots.release()
+            for file_path in item:
                 yield file_path
-                yielded_count += 1
+    finally:
+        # Consumer finished or went away: the walker notices within one slot wait
+        stop.set()
+        await producer
 
-                # Yield control less frequently for better performance
-                if yielded_count % batch_size == 0:
-                    await asyncio.sleep(0.001)  # Shorter sleep
 
+_WALK_DONE = object()
+_WALK_QUEUE_BATCHES = 8
+_WALK_SLOT_POLL_S = 0.1
 
-async def _process_include_token_async_optimized(
-        inc: str,
-        base: pathlib.Path,
-        top_level_only: bool,
-        bare_ex_dirs: tuple,
-        glob_ex_paths: tuple,
-        batch_size: int
-) -> AsyncGenerator[pathlib.Path, None]:
+
+def _walk_to_queue(
+        base_dir: pathlib.Path,
+        filter_str: str,
+        queue: asyncio.Queue,
+        loop: asyncio.AbstractEventLoop,
+        slots: threading.Semaphore,
+        stop: threading.Event,
+        batch_size: int,
+) -> None:
     """
-    Highly optimized async processing that maximizes pathlib usage and minimizes blocking.
+    Producer half of get_filepaths_rsync_async, run in a worker thread: walks with
+    iter_files and posts lists of paths to `queue` via call_soon_threadsafe, which
+    does not wait for the event loop. Blocks only while all `slots` are taken.
+    Ends with _WALK_DONE, or forwards the exception that stopped the walk.
     """
+    def _post(item) -> None:
+        if not stop.is_set():
+            loop.call_soon_threadsafe(queue.put_nowait, item)
 
-    # 1) Empty token → whole tree
-    if inc == "":
-        if top_level_only:
-            for p in base.glob("*"):
-                if p.is_file():
-                    yield p
-            return
+    def _put_batch(batch: List[Path]) -> bool:
+        while not slots.acquire(timeout=_WALK_SLOT_POLL_S):
+            if stop.is_set():
+                return False
+        _post(batch)
+        return not stop.is_set()
 
-        # For full tree, use optimized approach based on excludes
-        if not glob_ex_paths and not bare_ex_dirs:
-            # No excludes - use simple rglob (fastest path)
-            count = 0
-            for p in base.rglob("*"):
-                if p.is_file():
-                    yield p
-                    count += 1
-                    if count % batch_size == 0:
-                        await asyncio.sleep(0.001)
-            return
-
-        # With excludes, use rglob but filter
-        count = 0
-        for p in base.rglob("*"):
-            if not p.is_file():
-                continue
-
-            # Quick bare directory check
-            if bare_ex_dirs and p.parent.name in bare_ex_dirs:
-                continue
-
-            # Glob path check (more expensive)
-            if glob_ex_paths:
-                rel = p.relative_to(base).as_posix()
-                if _is_excluded_rel(rel, glob_ex_paths):
-                    continue
-
-            yield p
-            count += 1
-            if count % batch_size == 0:
-                await asyncio.sleep(0.001)
-        return
-
-    # 2) Top-level only
-    if inc == "*":
-        for p in base.glob("*"):
-            if p.is_file():
-                yield p
-        return
-
-    # 3) Bare subtree - use pathlib when possible
-    if not _has_glob(inc) and not inc.endswith("/*"):
-        sub = base / inc
-
-        if sub.is_file():
-            # Quick exclude check for single file
-            if bare_ex_dirs and sub.parent.name in bare_ex_dirs:
-                return
-            if glob_ex_paths:
-                rel = sub.relative_to(base).as_posix()
-                if _is_excluded_rel(rel, glob_ex_paths):
+    try:
+        batch: List[Path] = []
+        for file_path in iter_files(base_dir, filter_str):
+            batch.append(file_path)
+            if len(batch) >= batch_size:
+                if not _put_batch(batch):
                     return
-            yield sub
-            return
-
-        if not sub.is_dir():
-            return
-
-        # For subtree, optimize based on exclude patterns
-        count = 0
-        if not glob_ex_paths and not bare_ex_dirs:
-            # No excludes - use simple rglob (fastest)
-            for f in sub.rglob("*"):
-                if f.is_file():
-                    yield f
-                    count += 1
-                    if count % batch_size == 0:
-                        await asyncio.sleep(0.001)
-        else:
-            # With excludes
-            for f in sub.rglob("*"):
-                if not f.is_file():
-                    continue
-
-                # Quick bare directory check
-                if bare_ex_dirs and f.parent.name in bare_ex_dirs:
-                    continue
-
-                # Glob path check
-                if glob_ex_paths:
-                    rel = f.relative_to(base).as_posix()
-                    if _is_excluded_rel(rel, glob_ex_paths):
-                        continue
-
-                yield f
-                count += 1
-                if count % batch_size == 0:
-                    await asyncio.sleep(0.001)
-        return
-
-    # 4) Direct-children form 'sub1/*'
-    if inc.endswith("/*") and not _has_glob(inc[:-2]):
-        sub = base / inc[:-2]
-        if sub.is_dir():
-            for f in sub.glob("*"):
-                if not f.is_file():
-                    continue
-
-                # Quick exclude checks
-                if bare_ex_dirs and f.parent.name in bare_ex_dirs:
-                    continue
-                if glob_ex_paths:
-                    rel = f.relative_to(base).as_posix()
-                    if _is_excluded_rel(rel, glob_ex_paths):
-                        continue
-
-                yield f
-        return
-
-    # 5) Glob/path form - use rglob with optimizations
-    count = 0
-    for f in base.rglob(inc):
-        if not f.is_file():
-            continue
-        if top_level_only and f.parent != base:
-            continue
-
-        # Quick exclude checks
-        if bare_ex_dirs and f.parent.name in bare_ex_dirs:
-            continue
-        if glob_ex_paths:
-            rel = f.relative_to(base).as_posix()
-            if _is_excluded_rel(rel, glob_ex_paths):
-                continue
-
-        yield f
-        count += 1
-        if count % batch_size == 0:
-            await asyncio.sleep(0.001)
+                batch = []
+        if batch:
+            _put_batch(batch)
+    except Exception as e:
+        _post(e)
+    finally:
+        _post(_WALK_DONE)
 
 
 # ============================
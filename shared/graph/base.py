@@ -11,11 +11,26 @@ import httpx
 
 from shared.dsx_logging import dsx_logging
 
+try:  # optional C parser; delta and listing pages can carry hundreds of KB of JSON
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - stdlib fallback
+    _json_loads = json.loads
+
+
+def graph_json(resp: httpx.Response):
+    """Parse a Graph response body (bytes) with orjson when available, else stdlib json."""
+    return _json_loads(resp.content)
+
 
 class MSGraphClientBase:
     """Minimal wrapper around MSAL + httpx for Microsoft Graph."""
 
     GRAPH_BASE = "https://graph.microsoft.com/v1.0"
+    DEFAULT_SCOPES: Tuple[str, ...] = ("https://graph.microsoft.com/.default",)
+    # Refresh this many seconds before the token actually expires
+    TOKEN_REFRESH_MARGIN = 60.0
 
     def __init__(
         self,
@@ -38,8 +53,10 @@ class MSGraphClientBase:
 
         self._msal_app = None
         self._client_session: Optional[httpx.AsyncClient] = None
+        # scopes -> (token, time.monotonic() deadline after which it is refreshed)
         self._token_cache: dict[Tuple[str, ...], Tuple[str, float]] = {}
         self._claims_logged_scopes: set[Tuple[str, ...]] = set()
+        self._token_inflight: dict[Tuple[str, ...], asyncio.Future] = {}
 
     # ---------------------- MSAL helpers ----------------------
     def _ensure_msal_app(self):
@@ -53,12 +70,30 @@ class MSGraphClientBase:
 
     async def get_access_token(self, scopes: Optional[Sequence[str]] = None) -> str:
         """Acquire (and cache) an access token for the requested scopes."""
-        scopes_tuple = tuple(scopes or ["https://graph.microsoft.com/.default"])
-        now = time.time()
+        scopes_tuple = tuple(scopes) if scopes else self.DEFAULT_SCOPES
+        # Monotonic clock: immune to wall-clock (NTP) jumps
+        now = time.monotonic()
         cached = self._token_cache.get(scopes_tuple)
-        if cached and now < cached[1] - 60:  # 60s early refresh window
+        if cached and now < cached[1]:
             return cached[0]
 
+        # Single-flight: concurrent misses for the same scopes share one MSAL acquisition. It runs
+        # as its own task and every caller (the first included) awaits it through shield, so a
+        # cancelled caller never cancels the token the others are waiting on.
+        inflight = self._token_inflight.get(scopes_tuple)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._acquire_token(scopes_tuple, now))
+            self._token_inflight[scopes_tuple] = inflight
+            inflight.add_done_callback(lambda task: self._token_acquired(scopes_tuple, task))
+        return await asyncio.shield(inflight)
+
+    def _token_acquired(self, scopes_tuple: Tuple[str, ...], task: asyncio.Future) -> None:
+        if self._token_inflight.get(scopes_tuple) is task:
+            del self._token_inflight[scopes_tuple]
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every caller was cancelled meanwhile
+
+    async def _acquire_token(self, scopes_tuple: Tuple[str, ...], now: float) -> str:
         self._ensure_msal_app()
 
         def _acquire():
@@ -70,7 +105,7 @@ class MSGraphClientBase:
 
         token = result["access_token"]
         expires_in = float(result.get("expires_in", 3600))
-        self._token_cache[scopes_tuple] = (token, now + expires_in)
+        self._token_cache[scopes_tuple] = (token, now + expires_in - self.TOKEN_REFRESH_MARGIN)
 
         if self._log_token_claims and scopes_tuple not in self._claims_logged_scopes:
             try:
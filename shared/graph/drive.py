@@ -1,17 +1,168 @@
 from __future__ import annotations
 
-from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+import functools
+import logging
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-from shared.graph.base import MSGraphClientBase
+from shared.graph.base import MSGraphClientBase, graph_json
 from shared.dsx_logging import dsx_logging
+from shared.file_ops import relpath_matches_filter
+
+_DELTA_ACCEPT = "application/json;odata.metadata=none"
+_DELTA_SELECT = "id,name,file,folder,parentReference,lastModifiedDateTime,eTag,webUrl"
+
+
+_DRIVE_ROOT_PREFIX = "/drive/root:"
+_DRIVE_ROOT_PREFIX_LEN = len(_DRIVE_ROOT_PREFIX)
+
+
+@functools.lru_cache(maxsize=8192)
+def _drive_parent_prefix(path: str) -> str:
+    """'<folder>/' for a parentReference.path (drive-root prefix removed); shared by siblings."""
+    if path.startswith(_DRIVE_ROOT_PREFIX):
+        path = path[_DRIVE_ROOT_PREFIX_LEN:]
+    return path.strip("/") + "/" if path else ""
 
 
 def build_drive_item_path(parent_reference: dict, name: str) -> str:
     """Normalize a drive item's relative path inside its drive."""
-    path = (parent_reference or {}).get("path") or ""
-    if path.startswith("/drive/root:"):
-        path = path[len("/drive/root:"):]
-    return (path.strip("/") + "/" + name).strip("/") if path else name
+    path = parent_reference.get("path") if parent_reference else None
+    if not path:
+        return name
+    prefix = _drive_parent_prefix(path)
+    return (prefix + name).strip("/") if prefix else name
+
+
+def _rel_after_base(segments: Sequence[str], base_segments: Sequence[str]) -> Optional[List[str]]:
+    """Segments after the first occurrence of base_segments in segments (None: base not found)."""
+    n = len(base_segments)
+    for i in range(0, len(segments) - n + 1):
+        if segments[i:i + n] == base_segments:
+            return list(segments[i + n:])
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _scope_rel_dir(parent: str, base_path: str) -> Optional[Tuple[str, ...]]:
+    """
+    Base-relative segments of a parent folder, or None when the base does not occur
+    within the folder itself. Items in one folder share this, so a delta page resolves
+    the base once per folder rather than once per item.
+    """
+    parent_segments = [seg for seg in parent.split("/") if seg]
+    base_segments = [seg for seg in base_path.split("/") if seg]
+    if not base_segments:
+        return tuple(parent_segments)
+    rel = _rel_after_base(parent_segments, base_segments)
+    return None if rel is None else tuple(rel)
+
+
+def path_in_drive_scope(path: Optional[str], base_path: str, filter_text: str) -> Tuple[bool, str]:
+    """
+    Check a drive-relative item path against the monitored base folder and rsync-like filter.
+
+    The base may sit anywhere in the path (first occurrence wins); the filter is matched
+    against the remainder. Returns (in_scope, normalized_path).
+    """
+    normalized = (path or "").strip("/")
+    parent, _, name = normalized.rpartition("/")
+    rel_dir = _scope_rel_dir(parent, base_path)
+    if rel_dir is not None:
+        # The first base occurrence lies within the parent, so it is also the first in the full path
+        rel_segments = [*rel_dir, name] if name else list(rel_dir)
+    else:
+        # Base not inside the parent folder: it can only match a window ending at the item itself
+        norm_segments = [seg for seg in normalized.split("/") if seg]
+        base_segments = [seg for seg in base_path.split("/") if seg]
+        if not norm_segments or len(norm_segments) < len(base_segments):
+            return False, normalized
+        rel_segments = _rel_after_base(norm_segments, base_segments)
+        if rel_segments is None:
+            return False, normalized
+    if filter_text and not relpath_matches_filter("/".join(rel_segments), filter_text):
+        return False, normalized
+    if "//" in normalized:
+        return True, "/".join(seg for seg in normalized.split("/") if seg)
+    return True, normalized
+
+
+class DeltaStream:
+    """
+    Async iterator over drive changes since a delta cursor, fetched page by page.
+
+    Items are yielded as each @odata.nextLink page arrives, so memory stays at one page
+    and callers can enqueue work while the next page is in flight. Once the stream is
+    exhausted, `cursor` holds the new @odata.deltaLink and `count` the items yielded.
+    """
+
+    def __init__(
+        self,
+        client: MSGraphClientBase,
+        drive_resource: str,
+        cursor: Optional[str],
+        *,
+        page_size: int = 200,
+        select: Optional[str] = None,
+        skip_deleted: bool = True,
+    ):
+        self._client = client
+        self._drive_resource = drive_resource
+        self._start = cursor
+        self._page_size = page_size
+        self._select = select
+        self._skip_deleted = skip_deleted
+        self.cursor: Optional[str] = None
+        self.count = 0
+
+    def __aiter__(self) -> AsyncIterator[dict]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[dict]:
+        client = self._client
+        http_client = await client.get_client()
+        extra = {"Prefer": f"odata.maxpagesize={self._page_size}", "Accept": _DELTA_ACCEPT}
+        select_clause = self._select or _DELTA_SELECT
+        url = self._start or client.graph_url(
+            f"{self._drive_resource.rstrip('/')}/root/delta?$select={select_clause}"
+        )
+        skip_deleted = self._skip_deleted
+
+        while url:
+            # Callers do work between pages, so a long walk can outlive a token: fetch headers per
+            # page (get_access_token serves the cached token until it nears expiry)
+            headers = await client.auth_headers(extra=extra)
+            resp = await http_client.get(url, headers=headers)
+            resp.raise_for_status()
+            data = graph_json(resp)
+
+            for item in data.get("value", []):
+                if skip_deleted and item.get("deleted"):
+                    continue
+                name = item.get("name") or ""
+                item_path = build_drive_item_path(item.get("parentReference") or {}, name)
+                if item_path:
+                    # The page dict is ours alone, so annotate in place rather than copy
+                    item["path"] = item_path
+                self.count += 1
+                yield item
+
+            url = data.get("@odata.nextLink")
+            if not url:
+                self.cursor = data.get("@odata.deltaLink")
+            # Drop this page (body and parsed JSON) before fetching the next one
+            resp = data = None
 
 
 async def delta_changes(
@@ -26,49 +177,28 @@ async def delta_changes(
     """
     Fetch drive changes since the provided delta cursor.
 
-    Returns (items, new_cursor).
+    Returns (items, new_cursor). Prefer iterating a DeltaStream for large drives.
     """
-    http_client = await client.get_client()
-    headers = await client.auth_headers(
-        extra={
-            "Prefer": f"odata.maxpagesize={page_size}",
-            "Accept": "application/json;odata.metadata=none",
-        }
+    stream = DeltaStream(
+        client, drive_resource, cursor, page_size=page_size, select=select, skip_deleted=skip_deleted
     )
-    select_clause = select or "id,name,file,folder,parentReference,lastModifiedDateTime,eTag,webUrl"
-    url = cursor or client.graph_url(f"{drive_resource.rstrip('/')}/root/delta?$select={select_clause}")
-
-    collected: List[dict] = []
-    new_cursor: Optional[str] = None
-
-    while url:
-        resp = await http_client.get(url, headers=headers)
-        resp.raise_for_status()
-        data = resp.json()
-
-        for item in data.get("value", []):
-            if skip_deleted and item.get("deleted"):
-                continue
-            name = item.get("name") or ""
-            item_path = build_drive_item_path(item.get("parentReference") or {}, name)
-            if item_path:
-                item = {**item, "path": item_path}
-            collected.append(item)
-
-        next_url = data.get("@odata.nextLink")
-        if next_url:
-            url = next_url
-            continue
-        new_cursor = data.get("@odata.deltaLink")
-        break
+    collected = [item async for item in stream]
+    return collected, stream.cursor
 
-    return collected, new_cursor
+
+async def _aiter_items(items: Union[Iterable[dict], AsyncIterable[dict]]) -> AsyncIterator[dict]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
 
 
 async def process_drive_delta_items(
-    items: Sequence[dict],
+    items: Union[Iterable[dict], AsyncIterable[dict]],
     *,
-    exclude_ids: Optional[Set[str]] = None,
+    exclude_ids: Optional[Iterable[str]] = None,
     path_in_scope: Callable[[Optional[str]], Tuple[bool, str]],
     enqueue_file: Callable[[str, str, dict], Awaitable[None]],
     log_prefix: str,
@@ -80,37 +210,45 @@ async def process_drive_delta_items(
     """
     Apply scoped filtering and enqueue callbacks for delta items common to SharePoint/OneDrive connectors.
 
+    `items` may be a list or an async iterable such as a DeltaStream, in which case items
+    are enqueued while later pages are still being fetched.
+
     Returns a tuple of (enqueued_count, skip_counts).
     """
-    exclude: Set[str] = set(exclude_ids or ())
-    skip_counts: Dict[str, int] = {"out_of_scope": 0, "folder": 0, "no_file": 0}
+    # Membership only: reuse a caller's set as-is instead of copying it per sync
+    exclude = exclude_ids if isinstance(exclude_ids, (set, frozenset)) else frozenset(exclude_ids or ())
+    out_of_scope = folders = no_file = 0
     enqueued = 0
     sampler_limit = max(0, sample_limit)
     metainfo = metainfo_fn or (lambda normalized, item, item_id: normalized or item.get("name") or item_id)
 
-    for item in items:
+    # Resolve the level once; steady state is INFO, so skip building debug messages
+    debug = dsx_logging.isEnabledFor(logging.DEBUG)
+
+    async for item in _aiter_items(items):
         item_id = str(item.get("id") or "").strip()
         if not item_id or item_id in exclude:
             continue
         path = item.get("path") or item.get("name") or ""
         in_scope, normalized = path_in_scope(path)
         if not in_scope:
-            skip_counts["out_of_scope"] += 1
-            if skip_counts["out_of_scope"] <= sampler_limit:
+            out_of_scope += 1
+            if debug and out_of_scope <= sampler_limit:
                 dsx_logging.debug(
                     f"{log_prefix} delta skip (out-of-scope) item_id={item_id} path='{path}' "
                     f"base='{base_path}' filter='{filter_text}'"
                 )
             continue
-        if item.get("folder") and not item.get("file"):
-            skip_counts["folder"] += 1
-            if skip_counts["folder"] <= sampler_limit:
-                dsx_logging.debug(f"{log_prefix} delta skip (folder) item_id={item_id} path='{path}'")
-            continue
-        if not item.get("file"):
-            skip_counts["no_file"] += 1
-            if skip_counts["no_file"] <= sampler_limit:
-                dsx_logging.debug(f"{log_prefix} delta skip (no file) item_id={item_id} path='{path}'")
+        file_facet = item.get("file")
+        if not file_facet:
+            if item.get("folder"):
+                folders += 1
+                if debug and folders <= sampler_limit:
+                    dsx_logging.debug(f"{log_prefix} delta skip (folder) item_id={item_id} path='{path}'")
+            else:
+                no_file += 1
+                if debug and no_file <= sampler_limit:
+                    dsx_logging.debug(f"{log_prefix} delta skip (no file) item_id={item_id} path='{path}'")
             continue
         try:
             await enqueue_file(item_id, metainfo(normalized, item, item_id), item)
@@ -118,10 +256,11 @@ async def process_drive_delta_items(
         except Exception as exc:
             dsx_logging.warning(f"{log_prefix} delta enqueue failed for item {item_id}: {exc}")
 
-    if any(skip_counts.values()):
+    skip_counts: Dict[str, int] = {"out_of_scope": out_of_scope, "folder": folders, "no_file": no_file}
+    if debug and (out_of_scope or folders or no_file):
         dsx_logging.debug(
-            f"{log_prefix} delta skip summary: out_of_scope={skip_counts['out_of_scope']} "
-            f"folder={skip_counts['folder']} no_file={skip_counts['no_file']} "
+            f"{log_prefix} delta skip summary: out_of_scope={out_of_scope} "
+            f"folder={folders} no_file={no_file} "
             f"(logged first {sampler_limit} per type)"
         )
 
@@ -5,6 +5,8 @@ from typing import Awaitable, Callable, Dict, List, Optional
 
 import httpx
 
+from shared.graph.base import graph_json
+
 
 class GraphDriveSubscriptionManager:
     """Manage Microsoft Graph subscriptions for a specific drive resource."""
@@ -14,6 +16,26 @@ class GraphDriveSubscriptionManager:
     def __init__(self, token_getter: Callable[[], Awaitable[str]], resource: str):
         self._token_getter = token_getter
         self._resource = resource
+        self._sub_url_base = self.GRAPH_SUBSCRIPTIONS_URL + "/"
+        # Cleared once Graph rejects $filter on /subscriptions; later lookups page everything
+        self._filter_supported = True
+        # One pooled client for every subscription call; created on first use
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=30.0)
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @staticmethod
+    def _expiry(minutes: int) -> str:
+        """UTC expiry `minutes` from now, formatted as Graph expects (whole seconds, 'Z')."""
+        return (dt.datetime.now(dt.timezone.utc) + dt.timedelta(minutes=minutes)).strftime("%Y-%m-%dT%H:%M:%SZ")
 
     async def _auth_headers(self) -> dict:
         token = await self._token_getter()
@@ -22,16 +44,47 @@ class GraphDriveSubscriptionManager:
     async def list_all(self) -> List[dict]:
         headers = await self._auth_headers()
         subs: List[dict] = []
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            next_url: Optional[str] = self.GRAPH_SUBSCRIPTIONS_URL
-            while next_url:
-                resp = await client.get(next_url, headers=headers)
-                resp.raise_for_status()
-                data = resp.json()
-                subs.extend(data.get("value", []))
-                next_url = data.get("@odata.nextLink")
+        client = self._get_client()
+        next_url: Optional[str] = self.GRAPH_SUBSCRIPTIONS_URL
+        while next_url:
+            resp = await client.get(next_url, headers=headers)
+            resp.raise_for_status()
+            data = graph_json(resp)
+            subs.extend(data.get("value", []))
+            next_url = data.get("@odata.nextLink")
         return subs
 
+    async def find_for_resource(self, notification_url: str) -> Optional[dict]:
+        """
+        Return the first subscription for this resource that targets `notification_url`.
+
+        Asks Graph to filter by resource so this is normally a single small page, and
+        stops paging at the first match. If Graph rejects the $filter, falls back to
+        paging every subscription (still stopping early) and stops asking.
+        """
+        headers = await self._auth_headers()
+        client = self._get_client()
+        params: Optional[dict] = None
+        if self._filter_supported:
+            literal = self._resource.replace("'", "''")
+            params = {"$filter": f"resource eq '{literal}'"}
+        next_url: Optional[str] = self.GRAPH_SUBSCRIPTIONS_URL
+        while next_url:
+            resp = await client.get(next_url, headers=headers, params=params)
+            if params and resp.status_code in (400, 501):
+                self._filter_supported = False
+                params = None
+                continue
+            resp.raise_for_status()
+            # nextLink already carries the query
+            params = None
+            data = graph_json(resp)
+            for sub in data.get("value", []):
+                if sub.get("resource") == self._resource and sub.get("notificationUrl") == notification_url:
+                    return sub
+            next_url = data.get("@odata.nextLink")
+        return None
+
     async def create(
         self,
         notification_url: str,
@@ -41,7 +94,7 @@ class GraphDriveSubscriptionManager:
         expiry_minutes: int = 60,
     ) -> dict:
         headers = await self._auth_headers()
-        expires = (dt.datetime.utcnow().replace(microsecond=0) + dt.timedelta(minutes=expiry_minutes)).isoformat() + "Z"
+        expires = self._expiry(expiry_minutes)
         payload = {
             "resource": self._resource,
             "changeType": change_types,
@@ -51,18 +104,17 @@ class GraphDriveSubscriptionManager:
         }
         if client_state:
             payload["clientState"] = client_state
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(self.GRAPH_SUBSCRIPTIONS_URL, json=payload, headers=headers)
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get_client().post(self.GRAPH_SUBSCRIPTIONS_URL, json=payload, headers=headers)
+        resp.raise_for_status()
+        return resp.json()
 
     async def renew(self, subscription_id: str, *, expiry_minutes: int = 60) -> None:
         headers = await self._auth_headers()
-        expires = (dt.datetime.utcnow().replace(microsecond=0) + dt.timedelta(minutes=expiry_minutes)).isoformat() + "Z"
-        url = f"{self.GRAPH_SUBSCRIPTIONS_URL}/{subscription_id}"
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.patch(url, json={"expirationDateTime": expires}, headers=headers)
-            resp.raise_for_status()
+        url = self._sub_url_base + subscription_id
+        resp = await self._get_client().patch(
+            url, json={"expirationDateTime": self._expiry(expiry_minutes)}, headers=headers
+        )
+        resp.raise_for_status()
 
     async def reconcile(
         self,
@@ -74,14 +126,8 @@ class GraphDriveSubscriptionManager:
     ) -> dict:
         """Ensure a subscription exists for this drive resource."""
         summary = {"created": 0, "renewed": 0, "resource": self._resource}
-        subs = await self.list_all()
-        matches = [
-            s
-            for s in subs
-            if s.get("resource") == self._resource and s.get("notificationUrl") == notification_url
-        ]
-        if matches:
-            sub = matches[0]
+        sub = await self.find_for_resource(notification_url)
+        if sub:
             if self._needs_renewal(sub, expiry_minutes):
                 await self.renew(sub["id"], expiry_minutes=expiry_minutes)
                 summary["renewed"] += 1
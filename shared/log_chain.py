@@ -1,15 +1,24 @@
+import atexit
 import logging
 import logging.handlers
 import json
+import queue
 import socket
 import ssl
+import threading
+import time
+from collections import deque
 from datetime import datetime
 
 from typing import Optional
 
-from fastapi.encoders import jsonable_encoder
 from dsx_connect.models.scan_result import ScanResultModel
 
+try:  # optional; faster serialization of verdict-chain records
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
 
 # -------------------------------------------------------------------
 # 1) APPLICATION LOGGER (console, file, etc.)
@@ -27,19 +36,38 @@ syslog_logger.setLevel(logging.INFO)  # Only INFO or above go to syslog
 
 _syslog_handler: Optional[logging.Handler] = None
 
+# Verdict chains are serialized and written off the caller's thread (see log_verdict_chain);
+# None on the queue tells the dispatcher to stop (see flush_verdict_chain)
+_verdict_queue: "queue.SimpleQueue[Optional[tuple[str, ScanResultModel]]]" = queue.SimpleQueue()
+_verdict_thread: Optional[threading.Thread] = None
+_verdict_thread_lock = threading.Lock()
+
 
 class TLSSysLogHandler(logging.Handler):
-    """Minimal TLS syslog handler using newline-delimited framing.
+    """TLS syslog handler that ships records from a background sender thread.
 
-    Note: Many servers accept LF-delimited frames; for strict RFC6587 octet-counting,
-    this can be extended to prefix the length. This implementation aims for practicality.
+    emit() only frames the record and queues it, so the calling thread (often the one
+    producing verdicts) never waits on an SSL write. The sender drains the queue in
+    batches of up to ~15KB per sendall() so many records share one TLS record, and
+    frames each message with RFC6587 octet counting ("<len> <msg>", as RFC5425 requires
+    for syslog over TLS); framing="lf" (DSXCONNECT_SYSLOG__TLS_FRAMING=lf) keeps the
+    newline-delimited framing for collectors that only split on newlines.
+    When the collector is unreachable, reconnects back off exponentially (capped at 30s)
+    while up to `max_pending` records are held; beyond that the oldest are dropped and
+    counted in `dropped` (logged once the collector is reachable again).
     """
 
+    _BATCH_BYTES = 15 * 1024
+    _BACKOFF_MIN_S = 0.5
+    _BACKOFF_MAX_S = 30.0
+
     def __init__(self, host: str, port: int, *,
                  ca_file: str | None = None,
                  cert_file: str | None = None,
                  key_file: str | None = None,
-                 insecure: bool = False):
+                 insecure: bool = False,
+                 framing: str = "octet",
+                 max_pending: int = 10_000):
         super().__init__()
         self.host = host
         self.port = port
@@ -50,39 +78,126 @@ class TLSSysLogHandler(logging.Handler):
         if cert_file and key_file:
             ctx.load_cert_chain(certfile=cert_file, keyfile=key_file)
         self._ctx = ctx
+        framing = framing.lower()
+        if framing not in ("octet", "lf"):
+            raise ValueError(f"Unsupported syslog TLS framing: {framing}")
+        self._octet = framing == "octet"
         self._sock: ssl.SSLSocket | None = None
+        # Unbounded on purpose: the cap is applied by _trim, which drops the oldest records
+        # and counts them (a maxlen deque would drop silently, from either end)
+        self._pending: deque[bytes] = deque()
+        self._max_pending = max_pending
+        self.dropped = 0
+        self._dropped_reported = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._backoff = self._BACKOFF_MIN_S
+        self._retry_at = 0.0
         self._connect()
+        self._sender = threading.Thread(target=self._run, name="tls-syslog-sender", daemon=True)
+        self._sender.start()
 
-    def _connect(self):
+    def _connect(self) -> bool:
         try:
             raw = socket.create_connection((self.host, self.port), timeout=5.0)
+            raw.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self._sock = self._ctx.wrap_socket(raw, server_hostname=self.host)
         except Exception:
             self._sock = None
+            self._retry_at = time.monotonic() + self._backoff
+            self._backoff = min(self._backoff * 2, self._BACKOFF_MAX_S)
+            return False
+        self._backoff = self._BACKOFF_MIN_S
+        if self.dropped != self._dropped_reported:
+            dsx_logging.warning(
+                f"TLS syslog: dropped {self.dropped - self._dropped_reported} record(s) while "
+                f"{self.host}:{self.port} was unreachable (max_pending={self._max_pending})"
+            )
+            self._dropped_reported = self.dropped
+        return True
+
+    def _drop_socket(self) -> None:
+        try:
+            if self._sock:
+                self._sock.close()
+        except Exception:
+            pass
+        self._sock = None
+
+    def _frame(self, msg: str) -> bytes:
+        data = msg.encode("utf-8", errors="ignore")
+        if self._octet:
+            return b"%d %s" % (len(data), data)
+        return data + b"\n"
 
     def emit(self, record: logging.LogRecord) -> None:
-        msg = self.format(record)
-        data = (msg + "\n").encode("utf-8", errors="ignore")
-        if not self._sock:
-            self._connect()
-        if not self._sock:
-            return
         try:
-            self._sock.sendall(data)
+            frame = self._frame(self.format(record))
         except Exception:
-            # reconnect once
+            self.handleError(record)
+            return
+        self._pending.append(frame)
+        self._trim()
+        self._wake.set()
+
+    def _trim(self) -> None:
+        """Drop the oldest pending records beyond max_pending, counting them."""
+        pending = self._pending
+        while len(pending) > self._max_pending:
             try:
-                if self._sock:
-                    self._sock.close()
-            except Exception:
-                pass
-            self._sock = None
-            self._connect()
-            if self._sock:
+                pending.popleft()
+            except IndexError:  # the sender drained it meanwhile
+                break
+            self.dropped += 1
+
+    def _take_batch(self) -> list[bytes]:
+        batch: list[bytes] = []
+        size = 0
+        pending = self._pending
+        while pending and (not batch or size + len(pending[0]) <= self._BATCH_BYTES):
+            frame = pending.popleft()
+            batch.append(frame)
+            size += len(frame)
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            while self._pending and not self._stop.is_set():
+                if not self._sock:
+                    delay = self._retry_at - time.monotonic()
+                    if delay > 0:
+                        # Collector unreachable: hold records until the next attempt
+                        self._stop.wait(delay)
+                        continue
+                    if not self._connect():
+                        continue
+                batch = self._take_batch()
                 try:
-                    self._sock.sendall(data)
+                    self._sock.sendall(b"".join(batch))
                 except Exception:
-                    pass
+                    # Put the batch back (it may be partially delivered) ahead of newer records,
+                    # then trim: if records kept arriving meanwhile, the oldest go first
+                    self._pending.extendleft(reversed(batch))
+                    self._trim()
+                    self._drop_socket()
+                    self._connect()
+
+    def flush(self) -> None:
+        """Best-effort wait (up to 5s) for queued records to be handed to the socket."""
+        deadline = time.monotonic() + 5.0
+        while self._pending and self._sock and time.monotonic() < deadline:
+            self._wake.set()
+            time.sleep(0.01)
+
+    def close(self) -> None:
+        self.flush()
+        self._stop.set()
+        self._wake.set()
+        self._sender.join(timeout=5.0)
+        self._drop_socket()
+        super().close()
 
 
 def init_syslog_handler(syslog_host: str = "localhost", syslog_port: int = 514,
@@ -90,10 +205,13 @@ def init_syslog_handler(syslog_host: str = "localhost", syslog_port: int = 514,
                         tls_ca: str | None = None,
                         tls_cert: str | None = None,
                         tls_key: str | None = None,
-                        tls_insecure: bool = False):
+                        tls_insecure: bool = False,
+                        tls_framing: str = "octet"):
     """Initialize the syslog handler for the worker process.
 
     transport: 'tcp' (default), 'udp', or 'tls'
+    tls_framing: 'octet' (RFC6587 octet counting, default) or 'lf' for collectors that
+    only split TLS syslog on newlines
     """
     global _syslog_handler
     if _syslog_handler:
@@ -120,14 +238,16 @@ def init_syslog_handler(syslog_host: str = "localhost", syslog_port: int = 514,
                 cert_file=tls_cert,
                 key_file=tls_key,
                 insecure=bool(tls_insecure),
+                framing=tls_framing,
             )
         else:
             raise ValueError(f"Unsupported syslog transport: {transport}")
         # Prefix with a static tag and newline for UDP/TCP so downstream collectors/SIEMs
-        # can easily spot dsx-connect scan events. TLS handler already appends a newline on write.
+        # can easily spot dsx-connect scan events. The TLS handler frames each message itself.
         fmt = "dsx-connect %(message)s\n" if transport.lower() in ("udp", "tcp") else "dsx-connect %(message)s"
         _syslog_handler.setFormatter(logging.Formatter(fmt))
         syslog_logger.addHandler(_syslog_handler)
+        _ensure_verdict_dispatcher()
 
         # Emit the initial “workers initialized” message to remote syslog
         syslog_logger.info("dsx-connect-workers initialized to use syslog")
@@ -138,57 +258,102 @@ def init_syslog_handler(syslog_host: str = "localhost", syslog_port: int = 514,
         dsx_logging.warning(f"Syslog handler not initialized: {e}")
 
 
+def _dumps(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _dump_model(model) -> Optional[dict]:
+    # mode="json" already renders enums/datetimes as JSON types; no jsonable_encoder pass needed
+    return model.model_dump(mode="json") if model is not None else None
+
+
+def _format_verdict_chain(timestamp: str, scan_result: ScanResultModel) -> str:
+    # Only emit the parts operators care about: the request, verdict, and action.
+    return _dumps({
+        "timestamp": timestamp,
+        "source": "dsx-connect",
+        "scan_request": _dump_model(scan_result.scan_request),
+        "verdict": _dump_model(scan_result.verdict),
+        "item_action": _dump_model(scan_result.item_action),
+    })
+
+
+def _verdict_dispatcher() -> None:
+    while True:
+        item = _verdict_queue.get()
+        if item is None:
+            return
+        timestamp, scan_result = item
+        try:
+            syslog_message = _format_verdict_chain(timestamp, scan_result)
+            syslog_logger.info(syslog_message)
+            if dsx_logging.isEnabledFor(logging.DEBUG):
+                dsx_logging.debug(f"Sent verdict chain to syslog: {syslog_message}")
+        except Exception as e:
+            dsx_logging.error(f"Failed to log verdict chain to syslog: {e}", exc_info=True)
+
+
+def _ensure_verdict_dispatcher() -> None:
+    """Start the dispatcher thread (again, after a fork: threads do not survive it)."""
+    global _verdict_thread
+    with _verdict_thread_lock:
+        if _verdict_thread is None or not _verdict_thread.is_alive():
+            _verdict_thread = threading.Thread(target=_verdict_dispatcher, name="verdict-syslog", daemon=True)
+            _verdict_thread.start()
+
+
+def flush_verdict_chain(timeout: float = 5.0) -> None:
+    """
+    Write out every verdict chain queued so far, waiting up to `timeout` seconds, then flush
+    the syslog handler. Called at interpreter exit and from the results worker's
+    worker_process_shutdown hook (Celery pool processes leave via os._exit, skipping atexit).
+    A later log_verdict_chain starts a new dispatcher.
+    """
+    if not _syslog_handler:
+        return
+    _ensure_verdict_dispatcher()
+    thread = _verdict_thread
+    _verdict_queue.put(None)
+    thread.join(timeout)
+    if thread.is_alive():
+        dsx_logging.warning(f"Verdict chains still queued for syslog after {timeout}s at shutdown")
+    try:
+        _syslog_handler.flush()
+    except Exception:
+        pass
+
+
+# Registered after logging's own atexit hook, so this runs first and logging.shutdown()
+# then closes the handlers with the drained records
+atexit.register(flush_verdict_chain)
+
+
 def log_verdict_chain(
     scan_result: ScanResultModel,
     scan_request_task_id: str,
     current_task_id: Optional[str] = None,
 ) -> bool:
     """
-    Log the complete chain (scan request, verdict, and item action) to syslog.
+    Queue the complete chain (scan request, verdict, and item action) for syslog.
+
+    Serialization and the syslog write happen on a background dispatcher thread, so the
+    caller only pays for a queue put; failures there are logged, not raised, and a True
+    return means queued, not delivered. Queued chains are written out at process shutdown
+    by flush_verdict_chain. The result must not be mutated after this call.
 
     Args:
-        scan_request: The original scan request details.
-        verdict: The scan verdict result.
-        item_action_status: Whether the item_action (if triggered) was successful and the action performed.
+        scan_result: The scan result carrying the request, verdict and item action.
         scan_request_task_id: The task ID of the initiating scan_request_task.
         current_task_id: The task ID of the verdict_task (optional).
 
+    Returns False (nothing queued) when the syslog handler is not initialized.
     """
-    global _syslog_handler
     if not _syslog_handler:
         dsx_logging.warning("Syslog handler not initialized, skipping log")
         return False
 
-    try:
-        # Derive optional fields for easier downstream parsing
-        try:
-            job_id = getattr(scan_result, "scan_job_id", None) or (
-                getattr(getattr(scan_result, "scan_request", None), "scan_job_id", None)
-            )
-        except Exception:
-            job_id = None
-        try:
-            status = getattr(scan_result, "status", None)
-        except Exception:
-            status = None
-        try:
-            rid = getattr(scan_result, "id", None)
-        except Exception:
-            rid = None
-
-        # Only emit the parts operators care about: the request, verdict, and action.
-        log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "source": "dsx-connect",
-            "scan_request": scan_result.scan_request.model_dump(),
-            "verdict": scan_result.verdict.model_dump(),
-            "item_action": scan_result.item_action.model_dump(),
-        }
-        syslog_message = json.dumps(jsonable_encoder(log_data))
-        syslog_logger.info(syslog_message)
-
-        dsx_logging.debug(f"Sent verdict chain to syslog: {syslog_message}")
-        return True
-    except Exception as e:
-        dsx_logging.error(f"Failed to log verdict chain to syslog: {e}", exc_info=True)
-        return False
+    _ensure_verdict_dispatcher()
+    _verdict_queue.put((datetime.utcnow().isoformat(), scan_result))
+    return True
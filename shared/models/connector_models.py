@@ -16,7 +16,7 @@ class ItemActionEnum(str, Enum):
 
 class ItemActionModel(BaseModel):
     action_type: ItemActionEnum = ItemActionEnum.NOTHING
-    action_meta: str = None
+    action_meta: str | None = None
 
 
 class ConnectorStatusEnum(str, Enum):
@@ -45,10 +45,10 @@ class ConnectorInstanceModel(BaseModel):
 
 
 class ScanRequestModel(BaseModel):
-    connector: ConnectorInstanceModel = None
+    connector: ConnectorInstanceModel | None = None
     location: str
     metainfo: str
-    connector_url: str = None
+    connector_url: str | None = None
     # Logical job identifier to associate related scan requests.
     # For connector full scans, all enqueued items share a job id.
     # For single events (e.g., webhook), a unique job id represents a job of one.
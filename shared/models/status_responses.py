@@ -21,3 +21,8 @@ class StatusResponse(BaseModel):
 
 class ItemActionStatusResponse(StatusResponse):
     item_action: ItemActionEnum = ItemActionEnum.NOTHING
+
+
+def dump_status(resp: StatusResponse) -> bytes:
+    """JSON-encode a status response straight through pydantic's compiled serializer."""
+    return resp.__pydantic_serializer__.to_json(resp)
@@ -1,10 +1,18 @@
 # shared/endpoints.py
+import functools
+import string
+from operator import attrgetter
 from enum import Enum
 from typing import Iterable, Union, Optional
 
 SERVICE_SLUG = "dsx-connect"
 API_MAJOR = 1
 API_PREFIX_V1 = f"{SERVICE_SLUG}/api/v{API_MAJOR}"
+_API_ROOT_V1 = f"/{API_PREFIX_V1}/"
+
+# Route/URL builders below are pure functions of (hashable) enum members and strings and run
+# for every route registration and outbound call, so their results are memoized.
+_ROUTE_CACHE_SIZE = 2048
 
 
 class DSXConnectAPI(str, Enum):
@@ -97,6 +105,54 @@ class Action(str, Enum):
 
 # ----------------- helpers -----------------
 
+_ROUTE_ENUMS = (DSXConnectAPI, ScanPath, NotificationPath, ConnectorPath, DeadLetterPath, ConnectorAPI, Action)
+
+
+def _compute_slug(s: str) -> str:
+    return s.replace("/", ".").replace("{", "").replace("}", "").replace("-", "_")
+
+
+# Text and slug of every route enum member, computed once at import. The members are str
+# enums, so they hash and compare like their values and a plain string key hits too.
+_VALUE_CACHE: dict = {m: m.value for cls in _ROUTE_ENUMS for m in cls}
+_SLUG_CACHE: dict = {m: _compute_slug(m.value) for cls in _ROUTE_ENUMS for m in cls}
+
+
+def _parse_template(s: str) -> Optional[tuple]:
+    """(literal, field) pairs for a route template with plain '{name}' fields, else None."""
+    segments = []
+    for literal, field, spec, conversion in string.Formatter().parse(s):
+        if field is not None and (spec or conversion or not field.isidentifier()):
+            return None
+        segments.append((literal, field))
+    return tuple(segments)
+
+
+# Pre-parsed templates for the members with placeholders (e.g. "unregister/{connector_uuid}")
+_TEMPLATE_CACHE: dict = {
+    m: t for cls in _ROUTE_ENUMS for m in cls
+    if "{" in m.value and (t := _parse_template(m.value.strip("/"))) is not None
+}
+
+
+_get_value = attrgetter("_value_")
+
+
+def _enum_text(p: Union[str, Enum]) -> str:
+    """Value of an Enum member, else str(p); avoids an isinstance(Enum) check on the common path."""
+    try:
+        return _get_value(p)
+    except AttributeError:
+        return str(p)
+
+
+def _text(p: Union[str, Enum]) -> str:
+    s = _VALUE_CACHE.get(p)
+    if s is None:
+        s = _enum_text(p)
+    return s
+
+
 def _assert_rel(segment: str) -> str:
     """Ensure segment is relative (no leading/trailing slash). Allow internal '/' for subpaths/templates."""
     if not segment:
@@ -106,27 +162,47 @@ def _assert_rel(segment: str) -> str:
     return segment
 
 
+# Enum values are route constants; validate them once here so the builders can trust them.
+for _m in _VALUE_CACHE:
+    _assert_rel(_m.value)
+
+
 def _normalized_parts(parts: Iterable[Union[str, Enum]]) -> str:
     segs = []
     for p in parts:
-        s = p.value if isinstance(p, Enum) else str(p)
+        s = _VALUE_CACHE.get(p)
+        if s is not None:
+            # Known route constant: already relative, never a URL
+            segs.append(s)
+            continue
+        s = _enum_text(p)
         # Allow full URLs as the *first* arg to join_url; otherwise enforce relative
-        if s.startswith("http://") or s.startswith("https://"):
+        if s[:4] == "http" and (s[4:7] == "://" or s[4:8] == "s://"):
             segs.append(s.rstrip("/"))
         else:
             segs.append(_assert_rel(s))
-    # If first element was a URL, keep it as-is; otherwise it's all relative
-    if segs and (segs[0].startswith("http://") or segs[0].startswith("https://")):
-        head, *tail = segs
-        return head + ("/" + "/".join(tail) if tail else "")
     return "/".join(segs)
 
 
+# Full API path of every bare endpoint, e.g. '/dsx-connect/api/v1/config'
+_ENDPOINT_PATHS: dict = {ep: _API_ROOT_V1 + ep.value for ep in DSXConnectAPI}
+
+
+@functools.lru_cache(maxsize=_ROUTE_CACHE_SIZE)
+def _api_subpath(ep: DSXConnectAPI, *subpaths: Union[str, Enum]) -> str:
+    return _API_ROOT_V1 + _normalized_parts((ep, *subpaths))
+
+
 def api_path(ep: DSXConnectAPI, *subpaths: Union[str, Enum]) -> str:
     """Path-only (no scheme/host), always starting a '/'  Example: '/api/v1/dsx-connect/scan-request/123'"""
-    rel = _normalized_parts((ep, *subpaths)) if subpaths else ep.value
-    return f"/{API_PREFIX_V1}/{rel}"
+    if not subpaths:
+        path = _ENDPOINT_PATHS.get(ep)
+        if path is not None:
+            return path
+        return _API_ROOT_V1 + ep.value
+    return _api_subpath(ep, *subpaths)
 
+@functools.lru_cache(maxsize=_ROUTE_CACHE_SIZE)
 def format_route(template: Union[str, Enum], **params) -> str:
     """
     Format a templated *relative* route segment into a concrete path component.
@@ -143,30 +219,38 @@ def format_route(template: Union[str, Enum], **params) -> str:
         format_route(ConnectorPath.UNREGISTER_CONNECTORS, connector_uuid="1234")
         -> "unregister/1234"
     """
-    s = template.value if isinstance(template, Enum) else str(template)
-    out = s.strip("/").format(**params)
+    segments = _TEMPLATE_CACHE.get(template)
+    if segments is not None:
+        out = "".join(lit + str(params[field]) if field is not None else lit for lit, field in segments)
+    else:
+        out = _text(template).strip("/").format(**params)
     if out.startswith("/") or out.endswith("/"):
         raise ValueError(f"Route segment must be relative: {out!r}")
     return out
 
 def _slug(p: Union[str, Enum]) -> str:
-    s = p.value if isinstance(p, Enum) else str(p)
-    return s.replace("/", ".").replace("{", "").replace("}", "").replace("-", "_")
+    return _SLUG_CACHE.get(p) or _compute_slug(_enum_text(p))
 
+@functools.lru_cache(maxsize=_ROUTE_CACHE_SIZE)
 def route_path(*parts: Union[str, Enum]) -> str:
     """For FastAPI route prefix and path definition. Always starts with '/'."""
-    def seg(p):
-        s = p.value if isinstance(p, Enum) else str(p)
-        return s.strip("/")
-    return "/" + "/".join(seg(p) for p in parts if str(p))
+    out = []
+    for p in parts:
+        s = _text(p)
+        if not s:
+            continue
+        if s[0] == "/" or s[-1] == "/":
+            s = s.strip("/")
+        out.append(s)
+    return "/" + "/".join(out)
 
-def route_name(
+@functools.lru_cache(maxsize=_ROUTE_CACHE_SIZE)
+def _compute_route_name(
         endpoint: DSXConnectAPI,
         path: Optional[Union[str, Enum]] = None,
-        action: Optional["Action"] = None,   # keep your small Action enum
-        method: Optional[str] = None,         # only if you ever need it
+        action: Optional["Action"] = None,
+        method: Optional[str] = None,
 ) -> str:
-    """For FastAPI route name"""
     parts = [_slug(endpoint)]
     if path is not None:
         parts.append(_slug(path))
@@ -176,12 +260,61 @@ def route_name(
         parts.append(method.lower())
     return ".".join(parts)
 
+
+# Sub-path enum that belongs under each prefix endpoint
+_PREFIX_PATHS = {
+    DSXConnectAPI.SCAN_PREFIX: ScanPath,
+    DSXConnectAPI.CONNECTORS_PREFIX: ConnectorPath,
+    DSXConnectAPI.NOTIFICATIONS_PREFIX: NotificationPath,
+    DSXConnectAPI.ADMIN_DEAD_LETTER_QUEUE_PREFIX: DeadLetterPath,
+}
+
+# Every (endpoint, path, action) name the routers can register, built once at import
+ROUTE_NAMES: dict = {
+    (ep, path, action): _compute_route_name(ep, path, action)
+    for ep in DSXConnectAPI
+    for path in (None, *_PREFIX_PATHS.get(ep, ()))
+    for action in (None, *Action)
+}
+
+
+def route_name(
+        endpoint: DSXConnectAPI,
+        path: Optional[Union[str, Enum]] = None,
+        action: Optional["Action"] = None,   # keep your small Action enum
+        method: Optional[str] = None,         # only if you ever need it
+) -> str:
+    """For FastAPI route name"""
+    if not method:
+        name = ROUTE_NAMES.get((endpoint, path, action))
+        if name is not None:
+            return name
+    return _compute_route_name(endpoint, path, action, method)
+
+@functools.lru_cache(maxsize=32)
+def _clean_base(base: str) -> str:
+    # A process talks to a handful of base URLs (dsx-connect, registered connectors)
+    return base.rstrip("/")
+
+
 def service_url(base: str, *parts: Union[str, Enum]) -> str:
     """
     For outbound HTTP calls. base='http://host:port', parts must be relative.
       join_url('http://host:8599', API_PREFIX, DSXConnectAPI.SCAN_REQUEST) ->
          'http://host:8599/api/v1/dsx-connect/scan-request'
     """
-    base_clean = base.rstrip("/")
-    tail = _normalized_parts(parts) if parts else ""
+    base_clean = _clean_base(base)
+    if not parts:
+        return base_clean
+    if len(parts) == 2 and parts[0] == API_PREFIX_V1:
+        # Most calls are (API_PREFIX_V1, <endpoint>); that path is precomputed
+        path = _ENDPOINT_PATHS.get(parts[1])
+        if path is not None:
+            return base_clean + path
+    tail = _normalized_parts(parts)
     return f"{base_clean}/{tail}" if tail else base_clean
+
+
+def build_endpoint_url(base: str, ep: DSXConnectAPI) -> str:
+    """Full URL of a bare dsx-connect endpoint, e.g. 'http://host:8586/dsx-connect/api/v1/config'."""
+    return _clean_base(base) + _ENDPOINT_PATHS[ep]
@@ -0,0 +1,159 @@
+import os
+import shutil
+
+import pytest
+
+from shared.file_ops import (
+    copy_file,
+    copy_files_recursively,
+    get_filepaths,
+    get_filepaths_rsync_async,
+    read_file,
+)
+from shared import file_ops
+from shared.file_ops import _rglob_search, _scan_tree
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for rel in [
+        "top.txt",
+        "PDF/a.pdf",
+        "PDF/sub1/b.pdf",
+        "PDF/tmp/c.pdf",
+        "sub1/x/y.txt",
+        "deep/a/b/c.bak",
+    ]:
+        p = tmp_path / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(rel)
+    # Symlinked directories are listed but never followed (os.walk semantics)
+    os.symlink(tmp_path / "PDF", tmp_path / "pdflink")
+    return tmp_path
+
+
+def _rel(base, paths):
+    return sorted(p.relative_to(base).as_posix() for p in paths)
+
+
+@pytest.mark.parametrize(
+    "filt, expected",
+    [
+        ("", ["PDF/a.pdf", "PDF/sub1/b.pdf", "PDF/tmp/c.pdf", "deep/a/b/c.bak", "sub1/x/y.txt", "top.txt"]),
+        ("*", ["top.txt"]),
+        ("PDF", ["PDF/a.pdf", "PDF/sub1/b.pdf", "PDF/tmp/c.pdf"]),
+        ("PDF/*", ["PDF/a.pdf"]),
+        ("PDF -tmp", ["PDF/a.pdf", "PDF/sub1/b.pdf"]),
+        ("-**/*.bak -PDF", ["sub1/x/y.txt", "top.txt"]),
+        ("**/*.pdf", ["PDF/a.pdf", "PDF/sub1/b.pdf", "PDF/tmp/c.pdf"]),
+        ("**/*.txt *.bak", ["deep/a/b/c.bak", "sub1/x/y.txt", "top.txt"]),
+        ("PDF **/*.pdf -tmp", ["PDF/a.pdf", "PDF/sub1/b.pdf"]),
+    ],
+)
+def test_get_filepaths_traversal(tree, filt, expected):
+    assert _rel(tree, get_filepaths(tree, filt)) == expected
+
+
+def test_rglob_search_many_double_star_runs_stays_linear():
+    pattern = "/".join(["**", "*a*"] * 6) + "/x.txt"
+    deep = "/".join(["aaa"] * 40)
+    search = _rglob_search((pattern,))
+    # A backtracking regex needs O(segments^6) steps to reject this path
+    assert not search(deep + "/y.txt")
+    assert search(deep + "/x.txt")
+    assert not search("aaa/x.txt")
+
+
+def test_scan_tree_pooled_matches_serial(tree):
+    def walk(workers):
+        out = []
+        for cur, rel_dir, subdirs, files in _scan_tree(str(tree), workers=workers):
+            subdirs[:] = [d for d in subdirs if d != "tmp"]
+            out.append((rel_dir, sorted(subdirs), sorted(files)))
+        return out
+
+    serial = walk(0)
+    assert ("PDF/tmp", [], ["c.pdf"]) not in serial
+    assert walk(4) == serial
+
+
+def test_scan_tree_cached_listing_sees_new_files(tmp_path):
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / "a.txt").write_text("a")
+    # Age the directories past the racy window so their listings are cached
+    for d in (tmp_path, sub):
+        os.utime(d, ns=(1_000_000_000, 1_000_000_000))
+    assert _rel(tmp_path, get_filepaths(tmp_path)) == ["sub/a.txt"]
+    assert _rel(tmp_path, get_filepaths(tmp_path)) == ["sub/a.txt"]
+    (sub / "b.txt").write_text("b")
+    assert _rel(tmp_path, get_filepaths(tmp_path)) == ["sub/a.txt", "sub/b.txt"]
+
+
+@pytest.mark.parametrize(
+    "mode, fs_type, cached",
+    [("auto", "ext4", True), ("auto", "nfs4", False), ("auto", "cifs", False), ("on", "nfs4", True), ("off", "ext4", False)],
+)
+def test_dir_cache_skipped_on_network_mounts(monkeypatch, mode, fs_type, cached):
+    monkeypatch.setattr(file_ops, "_DIR_CACHE_MODE", mode)
+    monkeypatch.setattr(file_ops, "_fs_type", lambda path, st_dev: fs_type)
+    assert (file_ops._dir_cache_for("/") is file_ops._DIR_CACHE) is cached
+
+
+def test_copy_files_recursively_skips_exclusions(tree, tmp_path_factory):
+    dst = tmp_path_factory.mktemp("dst")
+    copy_files_recursively(tree, dst, file_exclusions=["*.bak", "PDF/tmp/*"], max_workers=2)
+    assert _rel(dst, (p for p in dst.rglob("*") if p.is_file())) == [
+        "PDF/a.pdf", "PDF/sub1/b.pdf", "sub1/x/y.txt", "top.txt",
+    ]
+    assert (dst / "top.txt").read_text() == "top.txt"
+
+
+def test_copy_file_preserves_content_and_mtime(tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(os.urandom(3 * 1024 * 1024 + 7))
+    os.utime(src, (1_600_000_000, 1_600_000_000))
+    dst = tmp_path / "out" / "dst.bin"
+    copy_file(src, dst)
+    assert dst.read_bytes() == src.read_bytes()
+    assert dst.stat().st_mtime == src.stat().st_mtime
+
+
+@pytest.mark.parametrize("alias", ["self", "hardlink", "symlink"])
+def test_copy_file_refuses_same_file(tmp_path, alias):
+    src = tmp_path / "src.txt"
+    src.write_text("keep me")
+    dst = {"self": src, "hardlink": tmp_path / "hard.txt", "symlink": tmp_path / "link.txt"}[alias]
+    if alias == "hardlink":
+        os.link(src, dst)
+    elif alias == "symlink":
+        os.symlink(src, dst)
+    with pytest.raises(shutil.SameFileError):
+        copy_file(src, dst)
+    assert src.read_text() == "keep me"
+
+
+def test_copy_file_into_directory_uses_source_name(tmp_path):
+    src = tmp_path / "src.txt"
+    src.write_text("data")
+    out = tmp_path / "out"
+    out.mkdir()
+    copy_file(src, out)
+    assert (out / "src.txt").read_text() == "data"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filt", ["", "PDF -tmp", "**/*.pdf"])
+async def test_get_filepaths_rsync_async_threaded_walk_matches_sync(tree, filt):
+    # small_dataset_threshold=0 forces the worker-thread producer path
+    got = [p async for p in get_filepaths_rsync_async(tree, filt, batch_size=2, small_dataset_threshold=0)]
+    assert _rel(tree, got) == _rel(tree, get_filepaths(tree, filt))
+
+
+@pytest.mark.parametrize("size", [10, 5 * 1024 * 1024 + 3])
+def test_read_file_chunked_matches_contents(tmp_path, size):
+    src = tmp_path / "blob.bin"
+    data = os.urandom(size)
+    src.write_bytes(data)
+    assert read_file(src, chunk_size=64 * 1024).getvalue() == data
+    assert read_file(src).getvalue() == data
@@ -1,7 +1,10 @@
+from pathlib import PurePosixPath
+
 import pytest
 
 from shared.file_ops import parse_filter_spec
 from shared.file_ops import _has_glob
+from shared.file_ops import _glob_matcher
 from shared.file_ops import relpath_matches_filter
 from shared.file_ops import compute_prefix_hints
 
@@ -45,3 +48,23 @@ def test_relpath_matches_filter(filt, path, expect):
 )
 def test_compute_prefix_hints(filt, expected):
     assert compute_prefix_hints(filt) == expected
+
+
+@pytest.mark.parametrize(
+    "rel, pat",
+    [
+        ("a/b/c.txt", "*.txt"),
+        ("a/b/c.txt", "b/*.txt"),
+        ("a/b/c.txt", "a/*.txt"),
+        ("a/b/c.txt", "**/c.txt"),
+        ("a/b/c.txt", "a/**/c.txt"),
+        ("a/tmp/x", "tmp/**"),
+        ("a/b", "a?b"),
+        ("x/ab", "[!b]b"),
+        ("x/]b", "[!]]b"),
+        ("x/-b", "[a-]b"),
+        ("a/b", "/a/b"),
+    ],
+)
+def test_glob_matcher_matches_pathlib(rel, pat):
+    assert _glob_matcher((pat,))(rel) is PurePosixPath(rel).match(pat)
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from shared.graph.base import MSGraphClientBase
+
+
+class _SlowTokenClient(MSGraphClientBase):
+    def __init__(self):
+        super().__init__("tenant", "client", "secret")
+        self.acquisitions = 0
+
+    async def _acquire_token(self, scopes_tuple, now):
+        self.acquisitions += 1
+        await asyncio.sleep(0.05)
+        return f"tok{self.acquisitions}"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_first_caller_does_not_fail_waiting_callers():
+    client = _SlowTokenClient()
+    first = asyncio.create_task(client.get_access_token())
+    await asyncio.sleep(0)
+    waiting = [asyncio.create_task(client.get_access_token()) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert await asyncio.gather(*waiting) == ["tok1"] * 3
+    assert client.acquisitions == 1
+    assert first.cancelled()
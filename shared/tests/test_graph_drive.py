@@ -0,0 +1,85 @@
+import httpx
+import pytest
+
+from shared.graph.drive import DeltaStream, path_in_drive_scope, process_drive_delta_items
+
+
+@pytest.mark.parametrize(
+    "path, base, filt, expected",
+    [
+        ("/Docs/a.pdf", "", "", (True, "Docs/a.pdf")),
+        ("Sites/Docs/sub/a.pdf", "Docs", "", (True, "Sites/Docs/sub/a.pdf")),
+        ("Other/a.pdf", "Docs", "", (False, "Other/a.pdf")),
+        ("Docs/sub/a.pdf", "Docs", "sub", (True, "Docs/sub/a.pdf")),
+        ("Docs/tmp/a.pdf", "Docs", "-tmp", (False, "Docs/tmp/a.pdf")),
+        ("Docs//sub/a.txt", "Docs", "*.pdf", (False, "Docs//sub/a.txt")),
+        ("Docs//a.pdf", "Docs", "", (True, "Docs/a.pdf")),
+        # Base naming the item itself
+        ("Docs/a.pdf", "Docs/a.pdf", "", (True, "Docs/a.pdf")),
+        ("Docs", "Docs/a.pdf", "", (False, "Docs")),
+    ],
+)
+def test_path_in_drive_scope(path, base, filt, expected):
+    assert path_in_drive_scope(path, base, filt) == expected
+
+
+class _FakeGraph:
+    GRAPH = "https://graph.test/v1.0"
+
+    def __init__(self, pages):
+        self.requests = []
+        self.tokens = []
+        self._issued = 0
+
+        def handler(request):
+            self.requests.append(str(request.url))
+            self.tokens.append(request.headers.get("Authorization"))
+            return httpx.Response(200, json=pages[len(self.requests) - 1])
+
+        self._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def get_client(self):
+        return self._http
+
+    async def auth_headers(self, extra=None):
+        # A new token each call, so tests can see which pages asked for headers
+        self._issued += 1
+        return {"Authorization": f"Bearer t{self._issued}", **(extra or {})}
+
+    def graph_url(self, path):
+        return f"{self.GRAPH}/{path}"
+
+
+@pytest.mark.asyncio
+async def test_delta_stream_pages_and_cursor():
+    pages = [
+        {
+            "value": [
+                {"id": "1", "name": "a.pdf", "file": {"mimeType": "application/pdf"}, "parentReference": {"path": "/drive/root:/Docs"}},
+                {"id": "2", "name": "gone.pdf", "deleted": {"state": "deleted"}},
+            ],
+            "@odata.nextLink": "https://graph.test/next",
+        },
+        {"value": [{"id": "3", "name": "Docs", "folder": {"childCount": 1}}], "@odata.deltaLink": "https://graph.test/delta?t=1"},
+    ]
+    graph = _FakeGraph(pages)
+    stream = DeltaStream(graph, "drives/x", None)
+    enqueued = []
+
+    async def _enqueue(item_id, metainfo, item):
+        enqueued.append((item_id, metainfo))
+
+    count, skips = await process_drive_delta_items(
+        stream,
+        path_in_scope=lambda p: (True, p),
+        enqueue_file=_enqueue,
+        log_prefix="test",
+        base_path="",
+        filter_text="",
+    )
+    assert (count, enqueued, skips["folder"]) == (1, [("1", "Docs/a.pdf")], 1)
+    assert stream.cursor == "https://graph.test/delta?t=1"
+    assert stream.count == 2
+    assert graph.requests[1] == "https://graph.test/next"
+    # Headers are fetched per page, so a token refreshed mid-walk is picked up
+    assert graph.tokens == ["Bearer t1", "Bearer t2"]
@@ -0,0 +1,35 @@
+import httpx
+import pytest
+
+from shared.graph.subscriptions import GraphDriveSubscriptionManager
+
+
+async def _token():
+    return "token"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filter_rejected", [False, True])
+async def test_reconcile_finds_existing_subscription(filter_rejected):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.method == "PATCH":
+            return httpx.Response(200, json={})
+        if filter_rejected and "filter" in request.url.query.decode():
+            return httpx.Response(400, json={"error": {"code": "BadRequest"}})
+        return httpx.Response(200, json={"value": [
+            {"id": "other", "resource": "drives/y", "notificationUrl": "https://hook"},
+            {"id": "s1", "resource": "drives/x", "notificationUrl": "https://hook",
+             "expirationDateTime": "2000-01-01T00:00:00Z"},
+        ]})
+
+    mgr = GraphDriveSubscriptionManager(_token, "drives/x")
+    mgr._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    summary = await mgr.reconcile("https://hook")
+    await mgr.close()
+
+    assert (summary["created"], summary["renewed"]) == (0, 1)
+    assert requests[-1].method == "PATCH" and requests[-1].url.path.endswith("/subscriptions/s1")
+    assert mgr._filter_supported is not filter_rejected
@@ -1,9 +1,24 @@
 import os
 import re
+import sys
+import queue
+import atexit
 import json
+import mmap
+import inspect
+import asyncio
+import shlex
 import shutil
+import tarfile
+import threading
+import time
+import functools
+import subprocess
+import importlib.util
 from pathlib import Path
-from invoke import task, Exit
+from invoke import task, Exit, Collection, Executor
+from invoke.exceptions import UnexpectedExit
+from invoke.runners import Local
 from concurrent.futures import ThreadPoolExecutor, as_completed
 ## Note: test-related imports and tasks have been moved to test-tasks.py
 
@@ -24,42 +39,252 @@ CONNECTORS_CONFIG = [
 # Regex to extract X.Y.Z from a VERSION = "X.Y.Z" line
 # Match common version constants in version.py files
 # e.g., VERSION = "1.2.3" or DSX_CONNECT_VERSION = "1.2.3" or CONNECTOR_VERSION = "1.2.3"
-VERSION_PATTERN = re.compile(r"(?:VERSION|DSX_CONNECT_VERSION|CONNECTOR_VERSION)\s*=\s*[\"'](\d+\.\d+\.\d+)[\"']")
+# Compiled as bytes so version.py can be matched without a decode pass
+VERSION_PATTERN = re.compile(rb"(?:VERSION|DSX_CONNECT_VERSION|CONNECTOR_VERSION)\s*=\s*[\"'](\d+\.\d+\.\d+)[\"']")
+# The version constant sits at the top of version.py; only this much is read up front
+_VERSION_HEAD_BYTES = 4096
+_VERSION_NAMES = (b"DSX_CONNECT_VERSION", b"CONNECTOR_VERSION", b"VERSION")
 
 # Base directories
 PROJECT_ROOT = Path(__file__).parent.resolve()
 CORE_VERSION_FILE = PROJECT_ROOT / "dsx_connect" / "version.py"
+CORE_CHART_YAML = PROJECT_ROOT / "dsx_connect" / "deploy" / "helm" / "Chart.yaml"
 CONNECTORS_DIR = PROJECT_ROOT / "connectors"
 DEPLOYMENT_DIR = "docker_bundle"
 
 
-def read_version_file(path: Path) -> str:
-    """Read and return the version string from a version.py file."""
-    content = path.read_text()
-    match = VERSION_PATTERN.search(content)
-    if not match:
-        raise ValueError(f"No VERSION found in {path}")
-    return match.group(1)
+def _scan_version_lines(content: bytes) -> bytes | None:
+    """Plain `NAME = "X.Y.Z"` lines, checked with prefix tests; anything fancier is left to VERSION_PATTERN."""
+    for line in content.splitlines():
+        line = line.lstrip()
+        # One C-level prefix test rejects the usual non-version line before the per-name loop
+        if not line.startswith(_VERSION_NAMES):
+            continue
+        for name in _VERSION_NAMES:
+            if line.startswith(name):
+                rest = line[len(name):].lstrip()
+                if rest[:1] == b"=":
+                    value = rest[1:].strip()
+                    if len(value) > 2 and value[0] == value[-1] and value[:1] in (b'"', b"'"):
+                        parts = value[1:-1].split(b".")
+                        if len(parts) == 3 and all(p.isdigit() for p in parts):
+                            return value[1:-1]
+                break
+    return None
+
+
+# (path, mtime_ns) keys _read_version_cached has answered, so callers can tell a hit from a miss up front
+_VERSION_KEYS_SEEN: set[tuple[str, int]] = set()
+
+
+@functools.lru_cache(maxsize=256)
+def _read_version_cached(path: str | os.PathLike, mtime_ns: int) -> str:
+    _VERSION_KEYS_SEEN.add((path, mtime_ns))
+    with open(path, "rb") as f:
+        content = f.read(_VERSION_HEAD_BYTES)
+        version = None
+        if len(content) == _VERSION_HEAD_BYTES:
+            # Scan the head's complete lines first; the rest of the file is only read on a miss
+            version = _scan_version_lines(content[:content.rfind(b"\n") + 1])
+            if version is None:
+                content += f.read()
+    if version is None:
+        version = _scan_version_lines(content)
+    if version is None:
+        match = VERSION_PATTERN.search(content)
+        if not match:
+            raise ValueError(f"No VERSION found in {path}")
+        version = match.group(1)
+    return version.decode("ascii")
+
+
+def read_version_file(path: str | os.PathLike) -> str:
+    """
+    Read and return the version string from a version.py file.
+    Cached per (path, mtime), so repeat reads in one invocation are a stat plus a dict hit
+    and a bumped file is picked up without any explicit invalidation.
+    """
+    # Key on the plain string so Path and str spellings of the same file share one entry
+    path = os.fspath(path)
+    return _read_version_cached(path, os.stat(path).st_mtime_ns)
+
+
+_CONNECTOR_DIRS_CACHE: list[tuple[str, str]] | None = None
+
+
+def _connector_dirs() -> list[tuple[str, str]]:
+    """(folder name, path) of every directory under ./connectors, sorted; listed once per process."""
+    global _CONNECTOR_DIRS_CACHE
+    if _CONNECTOR_DIRS_CACHE is None:
+        try:
+            with os.scandir(CONNECTORS_DIR) as it:
+                _CONNECTOR_DIRS_CACHE = sorted((entry.name, entry.path) for entry in it if entry.is_dir())
+        except FileNotFoundError:
+            _CONNECTOR_DIRS_CACHE = []
+    return _CONNECTOR_DIRS_CACHE
+
+
+def _connector_version_files() -> list[tuple[str, str, int]]:
+    """
+    (connector folder name, version.py path, mtime_ns) for every ./connectors/*/version.py.
+    Scans actual dirs (not CONNECTORS_CONFIG) so it's accurate even for disabled connectors.
+    """
+    found = []
+    for name, path in _connector_dirs():
+        vf = os.path.join(path, "version.py")
+        try:
+            found.append((name, vf, os.stat(vf).st_mtime_ns))
+        except FileNotFoundError:
+            continue
+    return found
+
+
+_EXECUTORS: dict[int, ThreadPoolExecutor] = {}
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Shared thread pool of the given size, created on first use and kept for the rest of the run.
+    release-all, bundle, etc. reuse it instead of spinning a pool up and down for every stage.
+    """
+    max_workers = max(1, max_workers)
+    ex = _EXECUTORS.get(max_workers)
+    if ex is None:
+        ex = _EXECUTORS[max_workers] = ThreadPoolExecutor(max_workers=max_workers)
+    return ex
+
+
+@atexit.register
+def _shutdown_executors() -> None:
+    for ex in _EXECUTORS.values():
+        ex.shutdown(wait=True)
+    _EXECUTORS.clear()
+
+
+def _connector_versions(files: list[tuple[str, str, int]] | None = None) -> dict[str, str]:
+    """Map connector folder name -> version, reading the version.py files concurrently."""
+    if files is None:
+        files = _connector_version_files()
+    # Cache-first: files read earlier in this process, then ones the on-disk cache still vouches for
+    # (same mtime); only what's left is actually opened, on the pool
+    on_disk = _load_version_disk_cache()
+    versions: dict[str, str] = {}
+    misses: list[tuple[str, str, int]] = []
+    for name, vf, mtime in files:
+        if (vf, mtime) in _VERSION_KEYS_SEEN:
+            versions[name] = _read_version_cached(vf, mtime)
+            continue
+        hit = on_disk.get(os.path.relpath(vf, PROJECT_ROOT))
+        if hit and hit[0] == mtime:
+            versions[name] = hit[1]
+        else:
+            misses.append((name, vf, mtime))
+    if misses:
+        ex = _get_executor(min(8, len(misses)))
+        read = ex.map(_read_version_cached, [vf for _, vf, _ in misses], [mtime for _, _, mtime in misses])
+        for (name, vf, mtime), version in zip(misses, read):
+            versions[name] = version
+            on_disk[os.path.relpath(vf, PROJECT_ROOT)] = [mtime, version]
+        _save_version_disk_cache(on_disk)
+    # Keep folder order (callers and the manifest rely on it being sorted)
+    return {name: versions[name] for name, _, _ in files}
+
+
+# Cross-invocation cache of connector versions: {relpath: [mtime_ns, version]}. Purely an accelerator;
+# unreadable or stale entries are just re-read from version.py.
+_VERSION_DISK_CACHE = PROJECT_ROOT / ".invoke_cache" / "versions.json"
+
+
+def _load_version_disk_cache() -> dict[str, list]:
+    try:
+        data = json.loads(_VERSION_DISK_CACHE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_version_disk_cache(data: dict[str, list]) -> None:
+    try:
+        _VERSION_DISK_CACHE.parent.mkdir(exist_ok=True)
+        tmp = _VERSION_DISK_CACHE.with_name(f".{_VERSION_DISK_CACHE.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, sort_keys=True))
+        os.replace(tmp, _VERSION_DISK_CACHE)
+    except OSError:
+        pass
+
+
+def _write_manifest(out_path: Path, manifest: dict[str, str]) -> None:
+    """Write the manifest unless the file already holds exactly this content (keeps its mtime stable)."""
+    data = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+    try:
+        # A size mismatch settles it from the stat alone; otherwise compare the raw bytes (no decode)
+        if os.stat(out_path).st_size == len(data) and out_path.read_bytes() == data:
+            print(f"[manifest] {out_path.name} unchanged")
+            return
+    except FileNotFoundError:
+        pass
+    # Write-then-rename so a concurrent release never reads a half-written manifest
+    tmp = out_path.with_name(f".{out_path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, out_path)
+    print(f"Manifest written to {out_path.name}")
+
+
+def get_manifest(c, out: str = "versions.json") -> dict[str, str]:
+    """
+    Return the {component: version} manifest, (re)writing `out` only when a version.py changed.
+
+    The manifest is kept on the invoke Context keyed by the mtimes of every version.py, so tasks
+    that need it (release_all, bundle, ...) can call this directly and chained tasks in one
+    invocation scan the files once.
+    """
+    files = _connector_version_files()
+    core_mtime = os.stat(CORE_VERSION_FILE).st_mtime_ns
+    sig = (out, core_mtime, tuple((vf, mtime) for _, vf, mtime in files))
+    cached = c.config.get("_manifest_cache")
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    # Core rides in the same batch as the connectors: one cache-first pass, misses read concurrently
+    manifest = _connector_versions([("dsx_connect", os.fspath(CORE_VERSION_FILE), core_mtime), *files])
+    _write_manifest(PROJECT_ROOT / out, manifest)
+    c.config["_manifest_cache"] = (sig, manifest)
+    return manifest
+
+
+# Top-level version:/appVersion: lines of a Chart.yaml, found in one pass over the bytes
+_CHART_VERSION_LINE_RE = re.compile(rb"^(version|appVersion):[^\r\n]*", re.MULTILINE)
 
 
 def _sync_chart_yaml(chart_path: Path, version: str) -> None:
     """Ensure Chart.yaml has matching version/appVersion."""
-    if not chart_path.exists():
-        raise FileNotFoundError(f"Chart.yaml not found at {chart_path}")
-    lines = chart_path.read_text().splitlines()
-    version_idx = None
-    app_idx = None
-    for idx, line in enumerate(lines):
-        if line.startswith("version:"):
-            lines[idx] = f"version: {version}"
-            version_idx = idx
-        elif line.startswith("appVersion:"):
-            lines[idx] = f'appVersion: "{version}"'
-            app_idx = idx
-    if app_idx is None:
-        insert_at = version_idx + 1 if version_idx is not None else len(lines)
-        lines.insert(insert_at, f'appVersion: "{version}"')
-    chart_path.write_text("\n".join(lines) + "\n")
+    try:
+        original = chart_path.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Chart.yaml not found at {chart_path}") from None
+    v = version.encode("ascii")
+    version_line = b"version: " + v
+    app_line = b'appVersion: "' + v + b'"'
+    matches = list(_CHART_VERSION_LINE_RE.finditer(original))
+    has_app = any(m[1] == b"appVersion" for m in matches)
+    last_version = max((i for i, m in enumerate(matches) if m[1] == b"version"), default=None)
+    parts = []
+    pos = 0
+    for i, m in enumerate(matches):
+        parts.append(original[pos:m.start()])
+        parts.append(version_line if m[1] == b"version" else app_line)
+        # No appVersion anywhere: it goes right after the (last) version line
+        if i == last_version and not has_app:
+            parts.append(b"\n" + app_line)
+        pos = m.end()
+    parts.append(original[pos:])
+    new = b"".join(parts)
+    if new and not new.endswith(b"\n"):
+        new += b"\n"
+    if not has_app and last_version is None:
+        new += app_line + b"\n"
+    # Already in sync: leave the file (and its mtime) alone
+    if new != original:
+        chart_path.write_bytes(new)
 
 
 from connectors.framework.tasks.common import (
@@ -70,6 +295,8 @@ from connectors.framework.tasks.common import (
 
 # Default OCI Helm repo base (Docker Hub requires namespace-only base; chart name becomes the repo)
 DEFAULT_HELM_REPO = "oci://registry-1.docker.io/dsxconnect"
+# Fallback when --repo is passed empty; HELM_REPO is read once per process
+_HELM_REPO_ENV = os.environ.get("HELM_REPO", DEFAULT_HELM_REPO)
 
 
 @task
@@ -78,16 +305,25 @@ def release_connector_nobump(c, name: str, repo_uname: str = "dsxconnect"):
     _release_connector_no_bump_impl(c, project_slug=name, repo_uname=repo_uname)
 
 
+def _sync_core_chart() -> str:
+    """
+    Sync the core Chart.yaml to dsx_connect/version.py and return that version. The one place the
+    release chain reads the core version after an image release (which may have bumped it), so it
+    can't be threaded through from an earlier read; repeat calls are (path, mtime) cache hits.
+    """
+    version = read_version_file(CORE_VERSION_FILE)
+    _sync_chart_yaml(CORE_CHART_YAML, version)
+    return version
+
+
 @task
 def sync_core_chart_version(c):
     """
     Sync dsx-connect Helm Chart.yaml version/appVersion with dsx_connect/version.py.
     Run this before packaging/pushing the core Helm chart to avoid drift.
     """
-    version = read_version_file(CORE_VERSION_FILE)
-    chart_path = PROJECT_ROOT / "dsx_connect" / "deploy" / "helm" / "Chart.yaml"
-    _sync_chart_yaml(chart_path, version)
-    print(f"[sync] Updated {chart_path} to version {version}")
+    version = _sync_core_chart()
+    print(f"[sync] Updated {CORE_CHART_YAML} to version {version}")
 
 
 @task
@@ -113,68 +349,53 @@ def helm_release(
       inv helm-release --skip=google_cloud_storage
       inv helm-release --repo=oci://registry-1.docker.io/dsxconnect
     """
-    import os as _os
+    repo = repo or _HELM_REPO_ENV
+    # Pushing charts to the 'dsxconnect' namespace is safe because chart names carry a '-chart' suffix.
+    cmd = f"invoke helm-release --repo={repo}"
+    core_work: list[tuple[str, str, Path]] = []
     if include_core:
-        version = read_version_file(CORE_VERSION_FILE)
-        chart_path = PROJECT_ROOT / "dsx_connect" / "deploy" / "helm" / "Chart.yaml"
-        _sync_chart_yaml(chart_path, version)
+        version = _sync_core_chart()
         print(f"[helm-release] Core Chart.yaml synced to {version}")
-        print("=== Helm release: core (dsx_connect) ===")
-        repo = repo or _os.environ.get("HELM_REPO", DEFAULT_HELM_REPO)
-        # Pushing charts to the 'dsxconnect' namespace is safe because chart names carry a '-chart' suffix.
-        core_cmd = f"invoke helm-release --repo={repo}"
-        code = _run(c, core_cmd, cwd=PROJECT_ROOT / "dsx_connect", dry_run=dry_run)
-        if code != 0:
-            raise Exit(code)
-
-    chosen = _configured_names(include_disabled=False)
-    if only:
-        wanted = {n.strip() for n in only.split(",") if n.strip()}
-        unknown = wanted - set(_configured_names(include_disabled=True))
-        if unknown:
-            raise Exit(f"Unknown connector(s) in --only: {', '.join(sorted(unknown))}", code=2)
-        chosen = [n for n in chosen if n in wanted]
-    if skip:
-        banned = {n.strip() for n in skip.split(",") if n.strip()}
-        unknown = banned - set(_configured_names(include_disabled=True))
-        if unknown:
-            raise Exit(f"Unknown connector(s) in --skip: {', '.join(sorted(unknown))}", code=2)
-        chosen = [n for n in chosen if n not in banned]
+        core_work.append(("dsx_connect", cmd, PROJECT_ROOT / "dsx_connect"))
+        if not parallel:
+            print("=== Helm release: core (dsx_connect) ===")
+            code = _run(c, cmd, cwd=PROJECT_ROOT / "dsx_connect", dry_run=dry_run, in_process=True)
+            if code != 0:
+                raise Exit(code)
 
-    if not chosen:
+    chosen = _select_connectors(only, skip)
+
+    if not chosen and not (parallel and core_work):
         print("[helm-release] No connectors selected.")
         return
 
-    print("=== Helm release: connectors ===")
     # Build work list, skipping connectors without a Helm chart directory
-    work: list[tuple[str, str]] = []
+    work: list[tuple[str, str, Path]] = []
     for n in chosen:
         chart_dir = CONNECTORS_DIR / n / "deploy" / "helm"
-        if not chart_dir.exists():
+        if not chart_dir.is_dir():
             print(f"[helm-release] Skipping {n}: no Helm chart dir at {chart_dir}")
             continue
-        eff_repo = repo or _os.environ.get("HELM_REPO", DEFAULT_HELM_REPO)
-        cmd = f"invoke helm-release --repo={eff_repo}"
-        work.append((n, cmd))
+        work.append((n, cmd, CONNECTORS_DIR / n))
     errors: list[tuple[str, int]] = []
 
-    def _do(n: str, cmd: str) -> tuple[str, int]:
-        code = _run(c, cmd, cwd=CONNECTORS_DIR / n, dry_run=dry_run)
-        return (n, code)
-
     if parallel:
-        with ThreadPoolExecutor(max_workers=max_workers) as ex:
-            futures = {ex.submit(_do, n, cmd): n for n, cmd in work}
-            for fut in as_completed(futures):
-                n, code = fut.result()
-                if code != 0:
-                    print(f"[helm-release] FAILED: {n} (exit {code})")
-                    errors.append((n, code))
-                    if not continue_on_error:
-                        raise Exit(code)
+        # The chart pushes are independent uploads, so core goes out alongside the connectors;
+        # all of them are awaited on one event loop, longest-first
+        print("=== Helm release: core + connectors ===" if core_work else "=== Helm release: connectors ===")
+        results = _run_in_connectors(
+            c, core_work + work, max_workers=max_workers, dry_run=dry_run, stop_on_error=not continue_on_error
+        )
+        for n, code in results:
+            if code != 0:
+                print(f"[helm-release] FAILED: {n} (exit {code})")
+                errors.append((n, code))
+        if errors and not continue_on_error:
+            raise Exit(errors[0][1])
     else:
-        for n, cmd in work:
-            _, code = _do(n, cmd)
+        print("=== Helm release: connectors ===")
+        for n, cmd, cwd in work:
+            code = _run(c, cmd, cwd=cwd, dry_run=dry_run, in_process=True)
             if code != 0:
                 errors.append((n, code))
                 if not continue_on_error:
@@ -190,25 +411,48 @@ def generate_manifest(c, out: str = "versions.json"):
     """
     Scan the core and connector version.py files, write a JSON manifest of their versions.
     """
-    manifest = {}
-    # Core
-    manifest["dsx_connect"] = read_version_file(CORE_VERSION_FILE)
-    # Connectors (manifest still scans actual dirs so it's accurate even if disabled)
-    if CONNECTORS_DIR.exists():
-        for connector_path in CONNECTORS_DIR.iterdir():
-            version_file = connector_path / "version.py"
-            if version_file.exists():
-                manifest[connector_path.name] = read_version_file(version_file)
-    # Write manifest
-    (PROJECT_ROOT / out).write_text(json.dumps(manifest, indent=2))
-    print(f"Manifest written to {out}")
-
-
-def _configured_names(include_disabled: bool = False) -> list[str]:
-    names = []
-    for cfg in CONNECTORS_CONFIG:
-        if include_disabled or cfg.get("enabled", True):
-            names.append(cfg["name"])
+    get_manifest(c, out=out)
+
+
+# CONNECTORS_CONFIG is fixed at import; resolve the name lists once
+_NAME_TO_CFG: dict[str, dict] = {cfg["name"]: cfg for cfg in CONNECTORS_CONFIG}
+_ALL_NAMES: frozenset[str] = frozenset(_NAME_TO_CFG)
+_ENABLED_NAMES: tuple[str, ...] = tuple(n for n, cfg in _NAME_TO_CFG.items() if cfg.get("enabled", True))
+_ENABLED_SET: frozenset[str] = frozenset(_ENABLED_NAMES)
+
+
+_CONFIGURED_NAMES: tuple[str, ...] = tuple(_NAME_TO_CFG)
+# Bundle folder slug per connector ("aws_s3" -> "aws-s3-connector"); unconfigured folders are added on first use
+_CONNECTOR_SLUGS: dict[str, str] = {n: n.replace("_", "-") + "-connector" for n in _NAME_TO_CFG}
+
+
+def _connector_slug(name: str) -> str:
+    slug = _CONNECTOR_SLUGS.get(name)
+    if slug is None:
+        slug = _CONNECTOR_SLUGS[name] = name.replace("_", "-") + "-connector"
+    return slug
+
+
+def _configured_names(include_disabled: bool = False) -> tuple[str, ...]:
+    # Both answers are fixed at import; hand back the shared tuples rather than a fresh list per call
+    return _CONFIGURED_NAMES if include_disabled else _ENABLED_NAMES
+
+
+def _select_connectors(only: str = "", skip: str = "") -> list[str]:
+    """
+    Enabled connectors narrowed by --only / --skip (CSV of names), in CONNECTORS_CONFIG order.
+    Raises Exit(2) if either list names a connector that isn't configured.
+    """
+    wanted = _parse_names(only, "--only") if only else None
+    banned = _parse_names(skip, "--skip") if skip else frozenset()
+    return [n for n in _ENABLED_NAMES if (wanted is None or n in wanted) and n not in banned]
+
+
+def _parse_names(csv: str, flag: str) -> set[str]:
+    names = {n for n in (part.strip() for part in csv.split(",")) if n}
+    unknown = names - _ALL_NAMES
+    if unknown:
+        raise Exit(f"Unknown connector(s) in {flag}: {', '.join(sorted(unknown))}", code=2)
     return names
 
 
@@ -230,11 +474,108 @@ def _connector_cmd(name: str, extra: str = "") -> str:
     return f"invoke release{(' ' + extra) if extra else ''}"
 
 
-def _run(c, cmd: str, *, cwd: Path | None = None, dry_run: bool = False, env: dict | None = None) -> int:
+# Environment for every child command: ours plus the repo root on PYTHONPATH.
+_ENV_OVERRIDES = {"PYTHONPATH": str(PROJECT_ROOT)}
+_ENV_EXPORTED = False
+
+
+def _child_env(env: dict | None) -> dict | None:
+    """
+    env= for subprocess/asyncio spawns. The overrides are exported into our own environment once,
+    so the common no-extra-env case returns None and children simply inherit it, rather than every
+    spawn re-encoding a full copy of the environment into the child's envp.
+    """
+    global _ENV_EXPORTED
+    if not _ENV_EXPORTED:
+        os.environ.update(_ENV_OVERRIDES)
+        _ENV_EXPORTED = True
+    # os.environ | env builds the merged dict in one go (PEP 584) rather than via two splats
+    return os.environ | env if env else None
+
+
+def _env_overrides(env: dict | None) -> dict:
+    # For c.run: invoke layers these over os.environ itself, so handing it the full
+    # environment would only make it copy and re-hash every entry a second time.
+    return _ENV_OVERRIDES | env if env else _ENV_OVERRIDES
+
+
+# Anything a shell would interpret goes through invoke's runner instead of the direct exec path
+_SHELL_META = re.compile(r"[|&;<>()$`*?~\n]")
+
+
+# `invoke <task> [--name=value ...]`; anything else (bare flags, positionals) goes to a subprocess
+_INVOKE_CMD = re.compile(r"invoke (?P<task>[\w-]+)(?P<args>(?: --[\w-]+=\S+)*)")
+
+
+@functools.lru_cache(maxsize=None)
+def _task_collection(tasks_file: Path) -> Collection:
+    spec = importlib.util.spec_from_file_location(f"_tasks_{tasks_file.parent.name}", tasks_file)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return Collection.from_module(mod)
+
+
+def _run_task_in_process(c, cmd: str, cwd: Path) -> int | None:
+    """
+    Run `invoke <task> --k=v ...` against cwd/tasks.py in this interpreter (chdir'd into cwd),
+    skipping the interpreter start and imports of a nested `invoke`. Pre/post tasks run through
+    invoke's Executor as usual. Returns None when the command can't be run this way.
+    Changes the process cwd, so callers must not be running anything else concurrently.
+    """
+    m = _INVOKE_CMD.fullmatch(cmd.strip())
+    tasks_file = cwd / "tasks.py"
+    if not m or not tasks_file.is_file():
+        return None
+    try:
+        collection = _task_collection(tasks_file)
+        target = collection[m["task"]]
+    except Exception:
+        return None
+    kwargs = {}
+    for arg in m["args"].split():
+        key, value = arg[2:].split("=", 1)
+        kwargs[key.replace("-", "_")] = value
+    params = inspect.signature(target.body).parameters
+    # Only plain string options can be passed through without invoke's CLI type coercion
+    if any(k not in params or not isinstance(params[k].default, (str, type(None))) for k in kwargs):
+        return None
+    prev = os.getcwd()
+    os.chdir(cwd)
+    try:
+        Executor(collection, config=c.config).execute((m["task"], kwargs))
+    except UnexpectedExit as e:
+        return e.result.exited or 1
+    except Exit as e:
+        if e.message:
+            print(e.message)
+        return e.code
+    except Exception as e:
+        # A subprocess would have exited nonzero here; keep callers' per-task failure accounting
+        print(f"[in-process] {cmd} failed: {e}")
+        return 1
+    finally:
+        os.chdir(prev)
+    return 0
+
+
+def _run(c, cmd: str, *, cwd: Path | None = None, dry_run: bool = False, env: dict | None = None,
+         in_process: bool = False) -> int:
     print(f"[release] {cmd} (cwd={cwd or PROJECT_ROOT})")
     if dry_run:
         return 0
-    run_env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT), **(env or {})}
+    if in_process and cwd and not env:
+        code = _run_task_in_process(c, cmd, Path(cwd))
+        if code is not None:
+            return code
+    if c.config.runners.local is Local and not _SHELL_META.search(cmd):
+        # Plain command on the default runner: let the child inherit our stdout/stderr
+        # rather than having invoke read and re-echo every line.
+        try:
+            return subprocess.run(shlex.split(cmd), cwd=str(cwd) if cwd else None, env=_child_env(env)).returncode
+        except FileNotFoundError:
+            print(f"[release] command not found: {cmd.split()[0]}")
+            return 127
+    run_env = _env_overrides(env)
     if cwd:
         with c.cd(str(cwd)):
             r = c.run(cmd, hide=False, warn=True, env=run_env)
@@ -243,6 +584,212 @@ def _run(c, cmd: str, *, cwd: Path | None = None, dry_run: bool = False, env: di
     return r.exited
 
 
+async def _run_async(cmd: str, *, cwd: Path | None = None, env: dict | None = None) -> int:
+    """Async counterpart of _run's direct-exec path: the child inherits our stdout/stderr."""
+    run_env = _child_env(env)
+    run_cwd = str(cwd) if cwd else None
+    if _SHELL_META.search(cmd):
+        proc = await asyncio.create_subprocess_shell(cmd, cwd=run_cwd, env=run_env)
+    else:
+        try:
+            proc = await asyncio.create_subprocess_exec(*shlex.split(cmd), cwd=run_cwd, env=run_env)
+        except FileNotFoundError:
+            print(f"[release] command not found: {cmd.split()[0]}")
+            return 127
+    return await proc.wait()
+
+
+# Last observed wall time per "<task>:<component>" (e.g. "release:sharepoint"), so parallel runs can
+# start the slowest jobs first. Purely advisory: a missing or corrupt file just means default ordering.
+_DURATIONS_FILE = PROJECT_ROOT / ".connector-durations.json"
+_DURATIONS: dict[str, float] | None = None
+_DEFAULT_DURATION = 60.0
+
+
+def _durations() -> dict[str, float]:
+    global _DURATIONS
+    if _DURATIONS is None:
+        try:
+            _DURATIONS = json.loads(_DURATIONS_FILE.read_text())
+        except (FileNotFoundError, ValueError):
+            _DURATIONS = {}
+        atexit.register(_save_durations, dict(_DURATIONS))
+    return _DURATIONS
+
+
+def _save_durations(loaded: dict[str, float]) -> None:
+    if _DURATIONS and _DURATIONS != loaded:
+        try:
+            _DURATIONS_FILE.write_text(json.dumps(_DURATIONS, indent=2, sort_keys=True))
+        except OSError:
+            pass
+
+
+def _duration_key(name: str, cmd: str) -> str:
+    # "invoke release --bump=patch" -> "release:<name>"
+    parts = cmd.split(maxsplit=2)
+    return f"{parts[1] if len(parts) > 1 else cmd}:{name}"
+
+
+def _longest_first(work: list, cmd_at: int = 1) -> list:
+    """Order (name, cmd, ...) jobs by last recorded duration, slowest first (LPT scheduling)."""
+    known = _durations()
+    return sorted(work, key=lambda w: -known.get(_duration_key(w[0], w[cmd_at]), _DEFAULT_DURATION))
+
+
+def _timed(name: str, cmd: str, started: float, code: int) -> int:
+    if code == 0:
+        _durations()[_duration_key(name, cmd)] = round(time.monotonic() - started, 1)
+    return code
+
+
+def _work_cwd(w: tuple) -> Path:
+    # (name, cmd[, cwd]) job -> where it runs; the connector folder unless given
+    return w[2] if len(w) > 2 else CONNECTORS_DIR / w[0]
+
+
+def _run_in_connectors(c, work: list[tuple], *, max_workers: int, dry_run: bool = False,
+                       stop_on_error: bool = False) -> list[tuple[str, int]]:
+    """
+    Run each (name, cmd[, cwd]) job, at most `max_workers` at a time; cwd defaults to the connector
+    folder. Returns (name, exit code) in completion order. With stop_on_error, jobs not yet started
+    when one fails are skipped (and left out of the result).
+
+    Children are awaited on one event loop rather than one blocked thread each; a custom invoke
+    runner still goes through c.run on a thread pool.
+    """
+    # Slowest-last-time first, so a long build isn't the one left running alone at the end
+    work = _longest_first(work)
+    failed = threading.Event()
+    _cwd = _work_cwd
+
+    def _finish(n: str, cmd: str, started: float, code: int) -> int:
+        if code != 0 and stop_on_error:
+            failed.set()
+        return code if dry_run else _timed(n, cmd, started, code)
+
+    if c.config.runners.local is not Local:
+        def _one_sync(w: tuple) -> int | None:
+            if failed.is_set():
+                return None
+            started = time.monotonic()
+            return _finish(w[0], w[1], started, _run(c, w[1], cwd=_cwd(w), dry_run=dry_run))
+
+        ex = _get_executor(max_workers)
+        futures = {ex.submit(_one_sync, w): w[0] for w in work}
+        results = [(futures[fut], fut.result()) for fut in as_completed(futures)]
+        return [(n, code) for n, code in results if code is not None]
+
+    async def _one(sem: asyncio.Semaphore, w: tuple) -> tuple[str, int | None]:
+        n, cmd = w[0], w[1]
+        async with sem:
+            if failed.is_set():
+                return n, None
+            cwd = _cwd(w)
+            print(f"[release] {cmd} (cwd={cwd})")
+            if dry_run:
+                return n, 0
+            started = time.monotonic()
+            return n, _finish(n, cmd, started, await _run_async(cmd, cwd=cwd))
+
+    async def _all() -> list[tuple[str, int]]:
+        sem = asyncio.Semaphore(max(1, max_workers))
+        # Tasks are created (and so queue on the semaphore) in work order
+        jobs = [asyncio.create_task(_one(sem, w)) for w in work]
+        results = [await fut for fut in asyncio.as_completed(jobs)]
+        return [(n, code) for n, code in results if code is not None]
+
+    return asyncio.run(_all())
+
+
+# argv[1] that puts `python tasks.py` into batch-worker mode (see _batch_worker)
+_BATCH_WORKER_ARG = "--batch-worker"
+
+
+def _run_batch(c, work: list[tuple], *, max_workers: int,
+               stop_on_error: bool = False) -> list[tuple[str, int]]:
+    """
+    Like _run_in_connectors, but the `invoke <task>` jobs are handed to `max_workers` long-lived
+    `python tasks.py --batch-worker` processes, so each worker pays for the interpreter start and
+    the invoke/framework imports once rather than once per connector. Jobs are fed one at a time
+    (a JSON spec per line on one pipe, the exit code back on another) from a shared queue, slowest
+    first. A job whose worker dies counts as failed; jobs no worker got to go through _run_in_connectors.
+    """
+    jobs: queue.SimpleQueue = queue.SimpleQueue()
+    for w in _longest_first(work):
+        jobs.put(w)
+    failed = threading.Event()
+    results: list[tuple[str, int]] = []
+    lock = threading.Lock()
+
+    def _drive() -> None:
+        spec_r, spec_w = os.pipe()
+        code_r, code_w = os.pipe()
+        # stdin stays closed: invoke's runner forwards the parent's stdin to its own children
+        proc = subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), _BATCH_WORKER_ARG, str(spec_r), str(code_w)],
+            stdin=subprocess.DEVNULL, pass_fds=(spec_r, code_w), env=_child_env(None),
+        )
+        os.close(spec_r)
+        os.close(code_w)
+        with os.fdopen(spec_w, "w", buffering=1) as specs, os.fdopen(code_r) as codes:
+            while not failed.is_set():
+                try:
+                    w = jobs.get_nowait()
+                except queue.Empty:
+                    break
+                n, cmd = w[0], w[1]
+                started = time.monotonic()
+                try:
+                    specs.write(json.dumps({"cmd": cmd, "cwd": str(_work_cwd(w))}) + "\n")
+                    reply = codes.readline()
+                except BrokenPipeError:
+                    reply = ""
+                if not reply:
+                    # Worker died mid-job: report it failed (a release isn't safe to retry) and stop
+                    # driving it; jobs it never got go through the fallback pass
+                    code = proc.wait() or 1
+                    with lock:
+                        results.append((n, code))
+                    if stop_on_error:
+                        failed.set()
+                    break
+                code = _timed(n, cmd, started, json.loads(reply)["code"])
+                if code != 0 and stop_on_error:
+                    failed.set()
+                with lock:
+                    results.append((n, code))
+        proc.wait()
+
+    threads = [threading.Thread(target=_drive) for _ in range(max(1, min(max_workers, len(work))))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    leftover = []
+    while not jobs.empty():
+        leftover.append(jobs.get_nowait())
+    if leftover and not failed.is_set():
+        results.extend(_run_in_connectors(c, leftover, max_workers=max_workers, stop_on_error=stop_on_error))
+    return results
+
+
+def _batch_worker(spec_fd: int, code_fd: int) -> None:
+    """Worker side of _run_batch: run each spec in this interpreter and report its exit code."""
+    from invoke import Context
+    c = Context()
+    with os.fdopen(spec_fd) as specs, os.fdopen(code_fd, "w", buffering=1) as codes:
+        for line in specs:
+            spec = json.loads(line)
+            try:
+                code = _run(c, spec["cmd"], cwd=Path(spec["cwd"]), in_process=True)
+            except Exception as e:
+                print(f"[release] {spec['cmd']} failed: {e}")
+                code = 1
+            sys.stdout.flush()
+            codes.write(json.dumps({"code": code}) + "\n")
+
+
 @task
 def release_core(c, extra: str = "", dry_run: bool = False):
     """Run the core dsx_connect release task (passes through any 'extra' flags)."""
@@ -252,6 +799,7 @@ def release_core(c, extra: str = "", dry_run: bool = False):
         cmd,
         cwd=PROJECT_ROOT / "dsx_connect",  # <<< key change
         dry_run=dry_run,
+        in_process=True,
     )
     if code != 0:
         raise Exit(code)
@@ -261,10 +809,10 @@ def release_core(c, extra: str = "", dry_run: bool = False):
 @task
 def release_connector(c, name: str, extra: str = "", dry_run: bool = False):
     """Run release for a single connector by name (e.g., inv release-connector --name=aws_s3)."""
-    if name not in _configured_names(include_disabled=True):
+    if name not in _ALL_NAMES:
         raise Exit(f"Connector '{name}' is not in CONNECTORS_CONFIG.", code=2)
     cmd = _connector_cmd(name, extra=extra)
-    code = _run(c, cmd, cwd=CONNECTORS_DIR / name, dry_run=dry_run)
+    code = _run(c, cmd, cwd=CONNECTORS_DIR / name, dry_run=dry_run, in_process=True)
     if code != 0:
         raise Exit(code)
 
@@ -275,12 +823,10 @@ def connectors_list(c, all: bool = False):
     Print the configured connector list.
     Use --all to include disabled ones.
     """
-    names = _configured_names(include_disabled=all)
     print("Configured connectors:")
-    for cfg in CONNECTORS_CONFIG:
-        if cfg["name"] in names:
-            mark = "✅" if cfg.get("enabled", True) else "⛔"
-            print(f"  {mark} {cfg['name']}")
+    for n in _configured_names(include_disabled=all):
+        mark = "✅" if n in _ENABLED_SET else "⛔"
+        print(f"  {mark} {n}")
 
 
 @task
@@ -293,53 +839,40 @@ def release_connectors(
         max_workers: int = 4,
         continue_on_error: bool = True,
         dry_run: bool = False,
+        batch: bool = True,        # parallel only: reuse max_workers long-lived worker interpreters
 ):
     """
     Release for many connectors based on the explicit CONNECTORS_CONFIG list.
     - By default runs all connectors with enabled=True.
     - Use --only to run a subset:   inv release-connectors --only=aws_s3,filesystem
     - Use --skip to exclude some:   inv release-connectors --skip=google_cloud_storage
+    - With --parallel, releases run in --max-workers reused worker interpreters (--no-batch: one `invoke` each)
     """
-    chosen = _configured_names(include_disabled=False)
-
-    if only:
-        wanted = {n.strip() for n in only.split(",") if n.strip()}
-        unknown = wanted - set(_configured_names(include_disabled=True))
-        if unknown:
-            raise Exit(f"Unknown connector(s) in --only: {', '.join(sorted(unknown))}", code=2)
-        chosen = [n for n in chosen if n in wanted]
-
-    if skip:
-        banned = {n.strip() for n in skip.split(",") if n.strip()}
-        unknown = banned - set(_configured_names(include_disabled=True))
-        if unknown:
-            raise Exit(f"Unknown connector(s) in --skip: {', '.join(sorted(unknown))}", code=2)
-        chosen = [n for n in chosen if n not in banned]
+    chosen = _select_connectors(only, skip)
 
     if not chosen:
         print("[release] No connectors selected.")
         return
 
-    work = [(n, _connector_cmd(n, extra=extra)) for n in chosen]
+    # The command is the same for every connector (only the cwd differs); format it once
+    cmd = _connector_cmd("", extra=extra)
+    work = [(n, cmd) for n in chosen]
     errors: list[tuple[str, int]] = []
 
-    def _do(n: str, cmd: str) -> tuple[str, int]:
-        code = _run(c, cmd, cwd=CONNECTORS_DIR / n, dry_run=dry_run)
-        return (n, code)
-
     if parallel:
-        with ThreadPoolExecutor(max_workers=max_workers) as ex:
-            futures = {ex.submit(_do, n, cmd): n for n, cmd in work}
-            for fut in as_completed(futures):
-                n, code = fut.result()
-                if code != 0:
-                    print(f"[release] FAILED: {n} (exit {code})")
-                    errors.append((n, code))
-                    if not continue_on_error:
-                        raise Exit(code)
+        if batch and not dry_run and c.config.runners.local is Local:
+            results = _run_batch(c, work, max_workers=max_workers)
+        else:
+            results = _run_in_connectors(c, work, max_workers=max_workers, dry_run=dry_run)
+        for n, code in results:
+            if code != 0:
+                print(f"[release] FAILED: {n} (exit {code})")
+                errors.append((n, code))
+        if errors and not continue_on_error:
+            raise Exit(errors[0][1])
     else:
         for n, cmd in work:
-            _, code = _do(n, cmd)
+            code = _run(c, cmd, cwd=CONNECTORS_DIR / n, dry_run=dry_run, in_process=True)
             if code != 0:
                 errors.append((n, code))
                 if not continue_on_error:
@@ -353,7 +886,48 @@ def release_connectors(
 ## Note: test tasks moved to test-tasks.py. Use: invoke -c test-tasks <task>
 
 
-@task(pre=[generate_manifest])
+def _release_all_pipelined(c, extra_core: str, extra_connectors: str, chosen: list[str], *, repo: str,
+                           max_workers: int = 4, dry_run: bool = False) -> None:
+    """
+    release-all --parallel: image release -> Helm release per component, components side by side.
+    Helm for a component depends only on its own image, so no stage waits on the whole fleet.
+    """
+    helm_cmd = f"invoke helm-release --repo={repo}"
+
+    def _core() -> tuple[str, int]:
+        cwd = PROJECT_ROOT / "dsx_connect"
+        code = _run(c, _build_core_cmd(extra=extra_core), cwd=cwd, dry_run=dry_run)
+        if code != 0:
+            return ("dsx_connect", code)
+        # The image release may have bumped the version; sync the chart to whatever it is now
+        _sync_core_chart()
+        return ("dsx_connect", _run(c, helm_cmd, cwd=cwd, dry_run=dry_run))
+
+    def _connector(n: str) -> tuple[str, int]:
+        cwd = CONNECTORS_DIR / n
+        code = _run(c, _connector_cmd(n, extra=extra_connectors), cwd=cwd, dry_run=dry_run)
+        if code != 0:
+            return (n, code)
+        if not (cwd / "deploy" / "helm").exists():
+            print(f"[helm-release] Skipping {n}: no Helm chart dir at {cwd / 'deploy' / 'helm'}")
+            return (n, 0)
+        return (n, _run(c, helm_cmd, cwd=cwd, dry_run=dry_run))
+
+    print("=== Releasing core + connectors (image, then Helm, per component) ===")
+    ex = _get_executor(max_workers)
+    futures = [ex.submit(_core)] + [ex.submit(_connector, n) for n in chosen]
+    errors: list[tuple[str, int]] = []
+    for fut in as_completed(futures):
+        n, code = fut.result()
+        if code != 0:
+            print(f"[release] FAILED: {n} (exit {code})")
+            errors.append((n, code))
+    if errors:
+        bad = ", ".join([f"{n}:{code}" for n, code in errors])
+        raise Exit(f"Some releases failed: {bad}", code=1)
+
+
+@task
 def release_all(
         c,
         extra_core: str = "",
@@ -361,12 +935,23 @@ def release_all(
         only: str = "",
         skip: str = "",
         parallel: bool = False,
+        repo: str = "",
         dry_run: bool = False,
 ):
     """
-    Release core + selected connectors. Uses generate_manifest first.
+    Release core + selected connectors. Refreshes the version manifest first.
     You can restrict connectors with --only/--skip (same semantics as release-connectors).
+    Charts go to --repo, else $HELM_REPO, else the default Docker Hub OCI repo.
+    With --parallel, each component's image release and Helm release run as one chain, and the
+    chains run concurrently: a chart is pushed as soon as its own image is out.
     """
+    get_manifest(c)
+    repo = repo or _HELM_REPO_ENV
+    if parallel:
+        _release_all_pipelined(
+            c, extra_core, extra_connectors, _select_connectors(only, skip), repo=repo, dry_run=dry_run
+        )
+        return
     print("=== Releasing core (dsx_connect) ===")
     release_core(c, extra=extra_core, dry_run=dry_run)
     print("=== Releasing connectors ===")
@@ -379,7 +964,7 @@ def release_all(
         dry_run=dry_run,
     )
     # After image releases, perform Helm releases for core + selected connectors
-    helm_release(c, only=only, skip=skip, include_core=True, parallel=parallel, dry_run=dry_run)
+    helm_release(c, repo=repo, only=only, skip=skip, include_core=True, parallel=parallel, dry_run=dry_run)
 
 
 @task
@@ -406,19 +991,7 @@ def build_all(
     if code != 0:
         raise Exit(code)
 
-    chosen = _configured_names(include_disabled=False)
-    if only:
-        wanted = {n.strip() for n in only.split(",") if n.strip()}
-        unknown = wanted - set(_configured_names(include_disabled=True))
-        if unknown:
-            raise Exit(f"Unknown connector(s) in --only: {', '.join(sorted(unknown))}", code=2)
-        chosen = [n for n in chosen if n in wanted]
-    if skip:
-        banned = {n.strip() for n in skip.split(",") if n.strip()}
-        unknown = banned - set(_configured_names(include_disabled=True))
-        if unknown:
-            raise Exit(f"Unknown connector(s) in --skip: {', '.join(sorted(unknown))}", code=2)
-        chosen = [n for n in chosen if n not in banned]
+    chosen = _select_connectors(only, skip)
 
     if not chosen:
         print("[build_all] No connectors selected.")
@@ -427,23 +1000,18 @@ def build_all(
     print("=== Building connectors ===")
     errors: list[tuple[str, int]] = []
 
-    def _build_connector(name: str) -> int:
-        cmd = f"invoke build{(' ' + extra_connectors) if extra_connectors else ''}"
-        return _run(c, cmd, cwd=CONNECTORS_DIR / name, dry_run=dry_run)
+    cmd = f"invoke build{(' ' + extra_connectors) if extra_connectors else ''}"
 
     if parallel:
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-        with ThreadPoolExecutor(max_workers=min(4, len(chosen))) as ex:
-            futs = {ex.submit(_build_connector, n): n for n in chosen}
-            for fut in as_completed(futs):
-                n = futs[fut]
-                code = fut.result()
-                if code != 0:
-                    print(f"[build_all] FAILED: {n} (exit {code})")
-                    errors.append((n, code))
+        # Builds are awaited on one event loop, same as release-connectors --parallel
+        work = [(n, cmd) for n in chosen]
+        for n, code in _run_in_connectors(c, work, max_workers=min(4, len(chosen)), dry_run=dry_run):
+            if code != 0:
+                print(f"[build_all] FAILED: {n} (exit {code})")
+                errors.append((n, code))
     else:
         for n in chosen:
-            code = _build_connector(n)
+            code = _run(c, cmd, cwd=CONNECTORS_DIR / n, dry_run=dry_run, in_process=True)
             if code != 0:
                 errors.append((n, code))
 
@@ -452,121 +1020,160 @@ def build_all(
         raise Exit(f"Some connector builds failed: {bad}", code=1)
 
 
-@task(pre=[generate_manifest])
-def bundle(c):
+# Bundle copies go through shutil.copyfile/copy2/copytree, which on Linux already move file data in-kernel
+# (os.sendfile fast path), so there is no user-space buffer bounce for a custom copier to remove.
+
+
+def _bundle_core_files(bundle_dir: str) -> None:
+    """Copy the core compose files and env sample into the top of bundle_dir."""
+    core_docker_dir = os.path.join(PROJECT_ROOT, "dsx_connect", "deploy", "docker")
+    for fname in ("docker-compose-dsx-connect-all-services.yaml", "docker-compose-dsxa.yaml", ".sample.core.env"):
+        src = os.path.join(core_docker_dir, fname)
+        if os.path.exists(src):
+            shutil.copyfile(src, os.path.join(bundle_dir, fname))
+
+
+def _bundle_one_connector(connector_name: str, version: str, bundle_dir: str) -> None:
+    """Copy one connector's compose files and env samples into bundle_dir/<slug>-<version>/."""
+    connector_slug = _connector_slug(connector_name)
+    dest = os.path.join(bundle_dir, f"{connector_slug}-{version}")
+    # bundle_dir was just wiped by bundle(), so there's nothing stale to remove here
+    os.makedirs(dest, exist_ok=True)
+    deploy_dir = os.path.join(CONNECTORS_DIR, connector_name, "deploy")
+    # Copy compose files and env samples from deploy/docker if present (one readdir pass)
+    docker_src_dir = os.path.join(deploy_dir, "docker")
+    has_docker_dir = os.path.isdir(docker_src_dir)
+    try:
+        entries = list(os.scandir(docker_src_dir if has_docker_dir else deploy_dir))
+    except FileNotFoundError:
+        entries = []
+    for entry in entries:
+        n = entry.name
+        if (n.startswith("docker-compose-") and n.endswith(".yaml")) or (
+            has_docker_dir and n.startswith(".sample.") and n.endswith(".env")
+        ):
+            shutil.copyfile(entry.path, os.path.join(dest, n))
+
+
+@task
+def bundle(c, parallel: bool = True, max_workers: int = 8):
     """
     Bundle Docker assets for core and each connector into docker_bundle/.
     Uses files directly from the repo (no staging/export).
+    Connectors are copied concurrently unless --parallel=false.
     """
-    core_version = read_version_file(CORE_VERSION_FILE)
+    manifest = get_manifest(c)
+    core_version = manifest["dsx_connect"]
     core_bundle = PROJECT_ROOT / DEPLOYMENT_DIR / f"dsx-connect-{core_version}"
-    if core_bundle.exists():
-        shutil.rmtree(core_bundle)
+    shutil.rmtree(core_bundle, ignore_errors=True)
     core_bundle.mkdir(parents=True, exist_ok=True)
-    # Core compose + env sample
-    core_compose_src = PROJECT_ROOT / "dsx_connect" / "deploy" / "docker" / "docker-compose-dsx-connect-all-services.yaml"
-    dsxa_compose_src = PROJECT_ROOT / "dsx_connect" / "deploy" / "docker" / "docker-compose-dsxa.yaml"
-    env_core = PROJECT_ROOT / "dsx_connect" / "deploy" / "docker" / ".sample.core.env"
-    for src in (core_compose_src, dsxa_compose_src, env_core):
-        if src.exists():
-            c.run(f"cp -f {src} {core_bundle}/{src.name}")
-    _append_bundle_readme(core_bundle / "README.md")
-
-    # Connectors
-    if CONNECTORS_DIR.exists():
-        for connector_path in CONNECTORS_DIR.iterdir():
-            version_file = connector_path / "version.py"
-            if not version_file.exists():
-                continue
-            version = read_version_file(version_file)
-            connector_slug = connector_path.name.replace("_", "-") + "-connector"
-            dest_dir = core_bundle / f"{connector_slug}-{version}"
-            if dest_dir.exists():
-                shutil.rmtree(dest_dir)
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            deploy_dir = connector_path / "deploy"
-            # Copy compose files and env samples from deploy/docker if present
-            docker_src_dir = deploy_dir / "docker"
-            if docker_src_dir.exists():
-                for f in docker_src_dir.glob("docker-compose-*.yaml"):
-                    c.run(f"cp -f {f} {dest_dir}/{f.name}")
-                for env_sample in docker_src_dir.glob(".sample.*.env"):
-                    c.run(f"cp -f {env_sample} {dest_dir}/{env_sample.name}")
-            else:
-                for f in deploy_dir.glob("docker-compose-*.yaml"):
-                    c.run(f"cp -f {f} {dest_dir}/{f.name}")
-            _append_bundle_readme(dest_dir / "README.md")
+    core_dest = str(core_bundle)
+
+    # Connectors (versions come from the manifest; no version.py is re-read)
+    connectors = [(n, v) for n, v in manifest.items() if n != "dsx_connect"]
+    if parallel and connectors:
+        # Core and each connector write only their own files, so all of them copy concurrently
+        ex = _get_executor(max_workers)
+        futures = [ex.submit(_bundle_core_files, core_dest)]
+        futures += [ex.submit(_bundle_one_connector, n, v, core_dest) for n, v in connectors]
+        for fut in as_completed(futures):
+            fut.result()
+    else:
+        _bundle_core_files(core_dest)
+        for n, v in connectors:
+            _bundle_one_connector(n, v, core_dest)
     # Tarball the whole bundle for convenience
     tarball = core_bundle.parent / f"{core_bundle.name}.tar.gz"
-    if tarball.exists():
-        tarball.unlink()
-    c.run(f"cd {core_bundle.parent} && tar -czf {tarball.name} {core_bundle.name}")
+    tarball.unlink(missing_ok=True)
+    # Written in-process: no shell/tar spawn for a bundle of a few dozen small files
+    with tarfile.open(tarball, "w:gz") as tar:
+        tar.add(core_bundle, arcname=core_bundle.name)
     print(f"Copied bundle to {core_bundle}")
     print(f"Created archive {tarball}")
 
 
-@task(pre=[generate_manifest])
-def bundle_connector(c, name: str, zip_archive: bool = True):
+@task
+def bundle_connector(c, name: str, zip_archive: bool = True, compresslevel: int = 1, zip_stored: bool = False):
     """
     Bundle a single connector's docker assets into docker_bundle/<connector>-bundle-<version>.
     e.g. `inv bundle-connector --name filesystem`
+    The zip uses fast deflate (--compresslevel=1) since the payload is a few small YAML/env files;
+    --zip-stored skips compression altogether.
     """
-    available = set(_configured_names(include_disabled=True))
-    if name not in available:
-        raise Exit(f"Unknown connector '{name}'. Valid options: {', '.join(sorted(available))}", code=2)
+    manifest = get_manifest(c)
+    if name not in _ALL_NAMES:
+        raise Exit(f"Unknown connector '{name}'. Valid options: {', '.join(_CONFIGURED_NAMES)}", code=2)
 
-    connector_slug = name.replace("_", "-") + "-connector"
-    version_file = CONNECTORS_DIR / name / "version.py"
-    if not version_file.exists():
+    connector_slug = _connector_slug(name)
+    # The manifest is built from the version.py files that exist, so this doubles as the existence check
+    if name not in manifest:
         raise Exit(f"No version.py found for connector '{name}'", code=2)
-    version = read_version_file(version_file)
-    deploy_dir = CONNECTORS_DIR / name / "deploy"
-
-    def _copy_bundle_contents(dest_dir: Path):
-        if dest_dir.exists():
-            shutil.rmtree(dest_dir)
-        dest_dir.mkdir(parents=True, exist_ok=True)
-        docker_src = deploy_dir / "docker"
-        if docker_src.exists():
-            for f in docker_src.glob("*"):
-                shutil.copy2(f, dest_dir / f.name)
-        else:
-            for compose in deploy_dir.glob("docker-compose-*.yaml"):
-                shutil.copy2(compose, dest_dir / compose.name)
-        _append_bundle_readme(dest_dir / "README.md")
-
-    target_dir = PROJECT_ROOT / DEPLOYMENT_DIR / f"{connector_slug}-bundle-{version}"
-    _clean_export_impl(str(target_dir))
+    version = manifest[name]
+    deploy_dir = os.path.join(CONNECTORS_DIR, name, "deploy")
+
+    def _copy_bundle_contents(dest_dir: str):
+        # Callers have just cleared dest_dir via clean_export
+        os.makedirs(dest_dir, exist_ok=True)
+        docker_src = os.path.join(deploy_dir, "docker")
+        has_docker_dir = os.path.isdir(docker_src)
+        try:
+            entries = list(os.scandir(docker_src if has_docker_dir else deploy_dir))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            n = entry.name
+            if (has_docker_dir and entry.is_file()) or (n.startswith("docker-compose-") and n.endswith(".yaml")):
+                shutil.copy2(entry.path, os.path.join(dest_dir, n))
+        # deploy/docker is copied wholesale, so a legacy README may have come along with it
+        _append_bundle_readme(Path(dest_dir, "README.md"))
+
+    target_dir = os.path.join(PROJECT_ROOT, DEPLOYMENT_DIR, f"{connector_slug}-bundle-{version}")
+    _clean_export_impl(target_dir)
     _copy_bundle_contents(target_dir)
     print(f"[bundle-connector] Bundle copied to {target_dir}")
 
-    core_version = read_version_file(CORE_VERSION_FILE)
-    versioned_core_dir = PROJECT_ROOT / DEPLOYMENT_DIR / f"dsx-connect-{core_version}"
-    versioned_core_dir.mkdir(parents=True, exist_ok=True)
-    nested_target = versioned_core_dir / f"{connector_slug}-{version}"
-    _clean_export_impl(str(nested_target))
-    _copy_bundle_contents(nested_target)
+    core_version = manifest["dsx_connect"]
+    versioned_core_dir = os.path.join(PROJECT_ROOT, DEPLOYMENT_DIR, f"dsx-connect-{core_version}")
+    os.makedirs(versioned_core_dir, exist_ok=True)
+    nested_target = os.path.join(versioned_core_dir, f"{connector_slug}-{version}")
+    _clean_export_impl(nested_target)
+    # Same contents as target_dir: clone it rather than globbing deploy/ a second time
+    shutil.copytree(target_dir, nested_target)
     print(f"[bundle-connector] Also copied bundle to {nested_target}")
 
     if zip_archive:
-        _zip_export_impl(c, str(target_dir), str(target_dir.parent))
+        _zip_export_impl(c, target_dir, os.path.dirname(target_dir), compresslevel=compresslevel, stored=zip_stored)
         print(f"[bundle-connector] Created archive {target_dir}.zip")
 
 
+_QUICKSTART_MARKER = b"## Bundle Quickstart"
+
+
 def _append_bundle_readme(path: Path):
     """
     Historically appended a Bundle Quickstart README; now a no-op.
     Clean up legacy quickstart content if present so bundles stay lean.
     """
-    if not path.exists():
+    try:
+        with open(path, "rb") as f:
+            # Search the mapped pages, so the common case (no legacy section) neither copies nor decodes the file
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                idx = mm.find(_QUICKSTART_MARKER)
+                if idx < 0:
+                    return
+                data = mm[:idx]
+    except FileNotFoundError:
         return
-    content = path.read_text()
-    marker = "## Bundle Quickstart"
-    if marker not in content:
+    except ValueError:
+        # mmap refuses empty files, which have nothing to clean up anyway
         return
     # Remove the quickstart section and trim trailing whitespace; delete file if empty.
-    before_marker = content.split(marker)[0].rstrip()
+    before_marker = data.decode("utf-8").rstrip()
     if before_marker:
         path.write_text(before_marker + "\n")
     else:
         path.unlink()
+
+
+if __name__ == "__main__" and sys.argv[1:2] == [_BATCH_WORKER_ARG]:
+    _batch_worker(int(sys.argv[2]), int(sys.argv[3]))
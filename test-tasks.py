@@ -2,9 +2,10 @@ import os
 import time
 import signal
 import subprocess
-import random
-import string
-import json
+import secrets
+import threading
+import importlib.util
+from collections import deque
 from pathlib import Path
 from invoke import task, Exit
 
@@ -15,9 +16,245 @@ except Exception:
 
 PROJECT_ROOT = Path(__file__).parent.resolve()
 
+_SESSION = None
+
+# Signed body for the auth_check probe: json.dumps({}) as bytes, spelled out
+_EMPTY_JSON_BODY = b"{}"
+
+
+def _session():
+    """One pooled requests.Session for all smoke-test calls, so loopback connections are kept alive."""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+    return _SESSION
+
 
 def _rand_token(n: int = 12) -> str:
-    return ''.join(random.choice(string.ascii_letters + string.digits) for _ in range(n))
+    # One urandom read; URL-safe alphabet, so the token can go straight into headers and URLs
+    return secrets.token_urlsafe(n)[:n]
+
+
+class _OutputTail:
+    """
+    Last `maxlen` lines of a child's stdout (stderr merged), drained by a daemon thread so a chatty
+    child (LOG_LEVEL=debug) can never fill the pipe and stall while we wait on it.
+    """
+
+    def __init__(self, proc: subprocess.Popen, maxlen: int = 200):
+        self.lines: deque[bytes] = deque(maxlen=maxlen)
+        self._thread = threading.Thread(target=self._pump, args=(proc.stdout,), daemon=True)
+        self._thread.start()
+
+    def _pump(self, stream):
+        for line in iter(stream.readline, b""):
+            self.lines.append(line)
+
+    def text(self, timeout: float = 1.0) -> str:
+        # Once the child has exited, give the pump a moment to take in its last lines
+        self._thread.join(timeout)
+        return b"".join(self.lines).decode(errors="replace")
+
+
+def _spawn(args: list[str], env: dict) -> subprocess.Popen:
+    """Popen from the repo root with stdout+stderr captured into proc.output_tail (an _OutputTail)."""
+    # close_fds=False skips the child-side sweep of every open fd; Python creates fds non-inheritable
+    # (PEP 446), so only the stdio Popen wires up reaches the child anyway. The child stays in our
+    # process group, so a terminal Ctrl-C still reaches it even if cleanup never runs.
+    proc = subprocess.Popen(
+        args, cwd=str(PROJECT_ROOT), env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        close_fds=False,
+    )
+    proc.output_tail = _OutputTail(proc)
+    return proc
+
+
+def _output(proc: subprocess.Popen | None) -> str:
+    tail = getattr(proc, "output_tail", None)
+    return tail.text() if tail else ""
+
+
+# POSIX: readiness waits can sleep in sigtimedwait and wake when a child exits
+_CHLD_WAKEUP = hasattr(signal, "sigtimedwait") and hasattr(signal, "SIGCHLD")
+
+
+def _wait_http_ready(proc: subprocess.Popen, url: str, deadline: float, *, name: str = "uvicorn",
+                     initial: float = 0.025, cap: float = 0.5, timeout: float = 1.0, accept=None):
+    """
+    Poll `url` until it answers 200 (and `accept(response)` is truthy, if given), sleeping `initial`
+    seconds after the first miss and doubling up to `cap`. Returns accept's result (else the response),
+    or None once `deadline` (a time.time() value) passes. Raises Exit as soon as `proc` exits.
+    """
+    delay = initial
+    # Where supported, the sleeps wake on SIGCHLD so a crashed child is seen at once rather than a
+    # backoff step later. Blocked only for this loop: a child spawned meanwhile would inherit the mask.
+    old_mask = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGCHLD}) if _CHLD_WAKEUP else None
+    try:
+        while time.time() < deadline:
+            if proc.poll() is not None:
+                raise Exit(f"{name} exited early. Output:\n{_output(proc)}")
+            try:
+                r = _session().get(url, timeout=timeout)
+                if r.status_code == 200:
+                    result = accept(r) if accept else r
+                    if result:
+                        return result
+            except Exception:
+                pass
+            if old_mask is None:
+                time.sleep(delay)
+            else:
+                # Any child's exit ends the wait early; the poll() above decides whether it was ours
+                signal.sigtimedwait({signal.SIGCHLD}, delay)
+            delay = min(delay * 2, cap)
+        return None
+    finally:
+        if old_mask is not None:
+            signal.pthread_sigmask(signal.SIG_SETMASK, old_mask)
+
+
+_REDIS_MODES = ("docker", "fake", "external")
+
+
+def _install_fake_redis():
+    """
+    Point redis/redis.asyncio `from_url` at clients of one in-memory fakeredis server, so the
+    in-thread API and this task see the same data. Returns a callable that undoes the patch.
+    """
+    try:
+        import fakeredis  # type: ignore
+    except ImportError:
+        raise Exit("--redis-mode=fake needs the 'fakeredis' package (pip install fakeredis).")
+    import redis as _redis
+    import redis.asyncio as _aredis
+
+    server = fakeredis.FakeServer()
+
+    def _sync_from_url(url=None, **kwargs):
+        return fakeredis.FakeRedis(server=server, **kwargs)
+
+    def _async_from_url(url=None, **kwargs):
+        return fakeredis.FakeAsyncRedis(server=server, **kwargs)
+
+    patched = [
+        (_redis, "from_url", _sync_from_url),
+        (_redis.Redis, "from_url", _sync_from_url),
+        (_aredis, "from_url", _async_from_url),
+        (_aredis.Redis, "from_url", _async_from_url),
+    ]
+    originals = [(owner, name, owner.__dict__[name]) for owner, name, _ in patched]
+    for owner, name, fn in patched:
+        setattr(owner, name, fn)
+
+    def _undo():
+        for owner, name, original in originals:
+            setattr(owner, name, original)
+
+    return _undo
+
+
+def _prepare_redis(c, mode: str, *, use_subprocess: bool, tag: str):
+    """
+    Get Redis ready for a smoke task; returns (docker container id or None, undo callable or None).
+    docker: start redis:7-alpine (falling back to an already-running Redis if that fails);
+    fake: in-memory fakeredis patched into this process (needs the in-thread API);
+    external: use whatever --redis-url points at.
+    """
+    if mode not in _REDIS_MODES:
+        raise Exit(f"Unknown --redis-mode={mode!r}; expected one of: {', '.join(_REDIS_MODES)}")
+    if mode == "fake":
+        if use_subprocess:
+            raise Exit("--redis-mode=fake only works with the in-process API (drop --use-subprocess).")
+        print(f"{tag} Using in-memory fakeredis.")
+        return None, _install_fake_redis()
+    if mode == "docker":
+        print(f"{tag} Starting Redis container...")
+        res = c.run("docker run -d -p 6379:6379 redis:7-alpine", hide=True, warn=True)
+        if res.exited == 0:
+            docker_cid = res.stdout.strip()
+            print(f"{tag} Redis CID: {docker_cid}")
+            return docker_cid, None
+        print(f"{tag} Failed to start Redis container; assuming local Redis is available.")
+    return None, None
+
+
+def _prepare_redis_in_background(c, mode: str, *, use_subprocess: bool, tag: str):
+    """
+    _prepare_redis with the docker container start moved to a thread, so it overlaps launching
+    the API. Returns a callable that waits for it and gives _prepare_redis's result; the other
+    modes are quick (and fake must be patched in before the API is imported), so they run inline.
+    """
+    if mode != "docker":
+        result = _prepare_redis(c, mode, use_subprocess=use_subprocess, tag=tag)
+        return lambda: result
+    box: dict = {}
+
+    def _start():
+        box["result"] = _prepare_redis(c, mode, use_subprocess=use_subprocess, tag=tag)
+
+    thread = threading.Thread(target=_start, name="redis-start", daemon=True)
+    thread.start()
+
+    def _wait():
+        thread.join()
+        return box.get("result", (None, None))
+
+    return _wait
+
+
+class _ThreadedAPI:
+    """dsx-connect's API served by uvicorn on a daemon thread of this process (see _start_api_in_thread)."""
+
+    def __init__(self, server, thread, saved_env: dict):
+        self.server = server
+        self.thread = thread
+        self._saved_env = saved_env
+
+    def wait_started(self, deadline: float) -> bool:
+        """True once uvicorn is serving; False at `deadline`. Raises Exit if the server thread dies first."""
+        delay = 0.005
+        while time.time() < deadline:
+            if self.server.started:
+                return True
+            # join() doubles as the sleep, so a server that dies during startup is seen at once
+            self.thread.join(delay)
+            if not self.thread.is_alive():
+                raise Exit("uvicorn exited early (see its output above)")
+            delay = min(delay * 2, 0.1)
+        return False
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+        for k, v in self._saved_env.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def _start_api_in_thread(port: int, env: dict, before_serve=None) -> _ThreadedAPI:
+    """
+    Serve dsx_connect.app.dsx_connect_api:app in-process on a background thread: no interpreter
+    start or re-import of dsx_connect per run. `env` is applied to os.environ (and restored by stop()),
+    since the API reads its settings from the environment when it is imported. `before_serve` is
+    called between importing the app and starting it (the app's startup needs Redis to be up).
+    """
+    import sys
+    import uvicorn
+
+    saved_env = {k: os.environ.get(k) for k in env}
+    os.environ.update(env)
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    from dsx_connect.app.dsx_connect_api import app
+
+    if before_serve:
+        before_serve()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="dsx-connect-api", daemon=True)
+    thread.start()
+    return _ThreadedAPI(server, thread, saved_env)
 
 
 @task
@@ -27,12 +264,16 @@ def test_auth(
     redis_url: str = "redis://localhost:6379/3",
     enroll_token: str = "",
     start_redis: bool = True,
+    use_subprocess: bool = False,
+    redis_mode: str = "docker",
 ):
     """
     Local smoke test for Enrollment + HMAC auth against a uvicorn dsx-connect API.
 
-    - Starts Redis in Docker (optional, default True)
-    - Launches uvicorn with auth enabled + enrollment token
+    - Starts Redis in Docker (default), or --redis-mode=fake for in-memory fakeredis,
+      or --redis-mode=external (same as --start-redis=false) to use --redis-url as-is
+    - Launches uvicorn with auth enabled + enrollment token (in-process on a thread;
+      --use-subprocess runs `python -m uvicorn` instead, for full isolation)
     - Registers a dummy connector via X-Enrollment-Token and captures/reads HMAC creds
     - Calls a protected lightweight endpoint without HMAC (expects 401)
     - Calls the same endpoint with DSX-HMAC (expects 200)
@@ -47,9 +288,23 @@ def test_auth(
     enroll_token = enroll_token or f"dev-{_rand_token(8)}"
 
     docker_cid = None
+    undo_redis = None
+    redis_ready = None
     uvicorn_proc: subprocess.Popen | None = None
+    api_thread: _ThreadedAPI | None = None
+
+    def _await_redis():
+        # Idempotent: cleanup calls it too, so a container started in the background is never leaked
+        nonlocal docker_cid, undo_redis
+        if redis_ready is not None:
+            docker_cid, undo_redis = redis_ready()
 
     def _cleanup():
+        _await_redis()
+        if api_thread:
+            api_thread.stop()
+        if undo_redis:
+            undo_redis()
         try:
             if uvicorn_proc and uvicorn_proc.poll() is None:
                 uvicorn_proc.send_signal(signal.SIGINT)
@@ -66,61 +321,47 @@ def test_auth(
                 pass
 
     try:
-        # 1) Start Redis (if requested)
-        if start_redis:
-            print("[auth-test] Starting Redis container...")
-            res = c.run("docker run -d -p 6379:6379 redis:7-alpine", hide=True, warn=True)
-            if res.exited == 0:
-                docker_cid = res.stdout.strip()
-                print(f"[auth-test] Redis CID: {docker_cid}")
-            else:
-                print("[auth-test] Failed to start Redis container; assuming local Redis is available.")
+        # 1) Start Redis (if requested); a docker start overlaps the API import below
+        redis_ready = _prepare_redis_in_background(
+            c, redis_mode if start_redis else "external", use_subprocess=use_subprocess, tag="[auth-test]"
+        )
 
         # 2) Launch uvicorn API
         print("[auth-test] Launching dsx-connect API (uvicorn)...")
-        env = {
-            **os.environ,
-            "PYTHONPATH": str(PROJECT_ROOT),
+        api_overrides = {
             "DSXCONNECT_REDIS_URL": redis_url,
             "DSXCONNECT_RESULTS_DB": redis_url,
             "DSXCONNECT_AUTH__ENABLED": "true",
             "DSXCONNECT_AUTH__ENROLLMENT_TOKEN": enroll_token,
             "LOG_LEVEL": "debug",
         }
-        uvicorn_proc = subprocess.Popen(
-            [
-                "python",
-                "-m",
-                "uvicorn",
-                "dsx_connect.app.dsx_connect_api:app",
-                "--host",
-                "0.0.0.0",
-                "--port",
-                str(port),
-            ],
-            cwd=str(PROJECT_ROOT),
-            env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-        )
+        if use_subprocess:
+            # The child imports and starts the app in one go, so Redis has to be up first
+            _await_redis()
+            env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT), **api_overrides}
+            uvicorn_proc = _spawn(
+                [
+                    "python",
+                    "-m",
+                    "uvicorn",
+                    "dsx_connect.app.dsx_connect_api:app",
+                    "--host",
+                    "0.0.0.0",
+                    "--port",
+                    str(port),
+                ],
+                env,
+            )
+        else:
+            api_thread = _start_api_in_thread(port, api_overrides, before_serve=_await_redis)
 
         # 3) Wait for health
         print("[auth-test] Waiting for API readiness...")
         deadline = time.time() + 30
-        health = f"{base}/dsx-connect/api/v1/healthz"
-        ready = False
-        while time.time() < deadline:
-            if uvicorn_proc.poll() is not None:
-                _out = uvicorn_proc.stdout.read().decode() if uvicorn_proc.stdout else ""
-                raise Exit(f"uvicorn exited early. Output:\n{_out}")
-            try:
-                r = requests.get(health, timeout=1.0)
-                if r.status_code == 200:
-                    ready = True
-                    break
-            except Exception:
-                pass
-            time.sleep(0.5)
+        if uvicorn_proc:
+            ready = _wait_http_ready(uvicorn_proc, f"{base}/dsx-connect/api/v1/healthz", deadline) is not None
+        else:
+            ready = api_thread.wait_started(deadline)
         if not ready:
             raise Exit("Timed out waiting for API readiness")
         print("[auth-test] API is up.")
@@ -135,7 +376,7 @@ def test_auth(
             "asset": "asset",
             "filter": "",
         }
-        r = requests.post(reg_url, headers={"X-Enrollment-Token": enroll_token}, json=payload, timeout=5)
+        r = _session().post(reg_url, headers={"X-Enrollment-Token": enroll_token}, json=payload, timeout=5)
         if r.status_code not in (200, 201):
             raise Exit(f"Register failed: HTTP {r.status_code} => {r.text}")
         data = r.json()
@@ -146,10 +387,11 @@ def test_auth(
             try:
                 import redis as _redis
                 from dsx_connect.messaging.connector_keys import ConnectorKeys
-                rcli = _redis.Redis.from_url(redis_url, decode_responses=True)
-                hm = rcli.hgetall(ConnectorKeys.config(connector_uuid))
-                hkid = hkid or hm.get("hmac_key_id")
-                hsec = hsec or hm.get("hmac_secret")
+                # Fetch just the two fields, as raw bytes, and decode only those
+                rcli = _redis.Redis.from_url(redis_url)
+                kid_b, sec_b = rcli.hmget(ConnectorKeys.config(connector_uuid), "hmac_key_id", "hmac_secret")
+                hkid = hkid or (kid_b.decode() if kid_b else None)
+                hsec = hsec or (sec_b.decode() if sec_b else None)
             except Exception:
                 pass
         if not (connector_uuid and hkid and hsec):
@@ -158,17 +400,17 @@ def test_auth(
 
         # 5) Protected endpoint without HMAC (expect 401). Use lightweight auth_check endpoint.
         protected = f"{base}/dsx-connect/api/v1/scan/auth_check"
-        r = requests.post(protected, json={}, timeout=5)
+        r = _session().post(protected, json={}, timeout=5)
         if r.status_code != 401:
             raise Exit(f"Expected 401 without HMAC, got {r.status_code}: {r.text}")
         print("[auth-test] Protected endpoint rejects unsigned requests (401) — OK.")
 
         # 6) Protected endpoint with HMAC (expect non-401, ideally 200)
         from shared.auth.hmac import make_hmac_header
-        body = json.dumps({}).encode()
+        body = _EMPTY_JSON_BODY
         path_q = "/dsx-connect/api/v1/scan/auth_check"
         hdr = make_hmac_header(hkid, hsec, "POST", path_q, body)
-        r = requests.post(protected, data=body, headers={"Authorization": hdr, "Content-Type": "application/json"}, timeout=5)
+        r = _session().post(protected, data=body, headers={"Authorization": hdr, "Content-Type": "application/json"}, timeout=5)
         if r.status_code == 401:
             raise Exit(f"Expected non-401 with HMAC, got 401: {r.text}")
         print(f"[auth-test] Protected endpoint accepted signed request (HTTP {r.status_code}).")
@@ -185,9 +427,13 @@ def test_auth_connector(
     redis_url: str = "redis://localhost:6379/3",
     enroll_token: str = "",
     start_redis: bool = True,
+    use_subprocess: bool = False,
+    redis_mode: str = "docker",
 ):
     """
     Local end-to-end auth smoke (API + filesystem connector).
+    The API runs in-process on a thread (--use-subprocess: `python -m uvicorn`); the connector
+    always runs as its own process. Redis as in test-auth (--redis-mode=docker|fake|external).
     Usage:
       invoke -c test-tasks test-auth-connector
     """
@@ -200,8 +446,18 @@ def test_auth_connector(
     docker_cid = None
     api_proc: subprocess.Popen | None = None
     conn_proc: subprocess.Popen | None = None
+    api_thread: _ThreadedAPI | None = None
+    undo_redis = None
+    redis_ready = None
+
+    def _await_redis():
+        # Idempotent: cleanup calls it too, so a container started in the background is never leaked
+        nonlocal docker_cid, undo_redis
+        if redis_ready is not None:
+            docker_cid, undo_redis = redis_ready()
 
     def _cleanup():
+        _await_redis()
         for p in [conn_proc, api_proc]:
             try:
                 if p and p.poll() is None:
@@ -212,6 +468,10 @@ def test_auth_connector(
                         p.kill()
             except Exception:
                 pass
+        if api_thread:
+            api_thread.stop()
+        if undo_redis:
+            undo_redis()
         if docker_cid:
             try:
                 c.run(f"docker rm -f {docker_cid}", warn=True, hide=True)
@@ -219,47 +479,39 @@ def test_auth_connector(
                 pass
 
     try:
-        # 1) Redis
-        if start_redis:
-            print("[auth-conn] Starting Redis container...")
-            res = c.run("docker run -d -p 6379:6379 redis:7-alpine", hide=True, warn=True)
-            if res.exited == 0:
-                docker_cid = res.stdout.strip()
-                print(f"[auth-conn] Redis CID: {docker_cid}")
-            else:
-                print("[auth-conn] Failed to start Redis container; assuming local Redis available.")
+        # 1) Redis; a docker start overlaps the API import below
+        redis_ready = _prepare_redis_in_background(
+            c, redis_mode if start_redis else "external", use_subprocess=use_subprocess, tag="[auth-conn]"
+        )
 
         # 2) API (APP_ENV=prod so outbound HMAC is added)
         print("[auth-conn] Launching dsx-connect API (uvicorn)...")
-        api_env = {
-            **os.environ,
-            "PYTHONPATH": str(PROJECT_ROOT),
+        api_overrides = {
             "DSXCONNECT_REDIS_URL": redis_url,
             "DSXCONNECT_RESULTS_DB": redis_url,
             "DSXCONNECT_AUTH__ENABLED": "true",
             "DSXCONNECT_AUTH__ENROLLMENT_TOKEN": enroll_token,
             "LOG_LEVEL": "debug",
         }
-        api_proc = subprocess.Popen([
-            "python", "-m", "uvicorn", "dsx_connect.app.dsx_connect_api:app",
-            "--host", "0.0.0.0", "--port", str(api_port)
-        ], cwd=str(PROJECT_ROOT), env=api_env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        if use_subprocess:
+            # The child imports and starts the app in one go, so Redis has to be up first
+            _await_redis()
+            api_env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT), **api_overrides}
+            api_proc = _spawn([
+                "python", "-m", "uvicorn", "dsx_connect.app.dsx_connect_api:app",
+                "--host", "0.0.0.0", "--port", str(api_port)
+            ], api_env)
+        else:
+            api_thread = _start_api_in_thread(api_port, api_overrides, before_serve=_await_redis)
 
         # Wait API
-        health = f"{api_base}/dsx-connect/api/v1/healthz"
         deadline = time.time() + 30
-        while time.time() < deadline:
-            if api_proc.poll() is not None:
-                out = api_proc.stdout.read().decode() if api_proc.stdout else ""
-                raise Exit(f"API exited early. Output:\n{out}")
-            try:
-                r = requests.get(health, timeout=1.0)
-                if r.status_code == 200:
-                    break
-            except Exception:
-                pass
-            time.sleep(0.5)
+        if api_proc:
+            health = f"{api_base}/dsx-connect/api/v1/healthz"
+            ready = _wait_http_ready(api_proc, health, deadline, name="API") is not None
         else:
+            ready = api_thread.wait_started(deadline)
+        if not ready:
             raise Exit("Timed out waiting for API readiness")
         print("[auth-conn] API ready.")
 
@@ -275,40 +527,34 @@ def test_auth_connector(
             "DSXCONNECTOR_USE_TLS": "false",
             "LOG_LEVEL": "debug",
         }
-        conn_proc = subprocess.Popen([
+        conn_proc = _spawn([
             "python", "-m", "connectors.filesystem.start",
             "--host", "0.0.0.0", "--port", str(conn_port), "--workers", "1"
-        ], cwd=str(PROJECT_ROOT), env=conn_env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        ], conn_env)
 
         # 4) Wait for connector to register (poll list)
         print("[auth-conn] Waiting for connector registration...")
         list_url = f"{api_base}/dsx-connect/api/v1/connectors/list"
-        connector = None
-        deadline = time.time() + 60
-        while time.time() < deadline:
-            try:
-                r = requests.get(list_url, timeout=1.5)
-                if r.status_code == 200:
-                    arr = r.json() or []
-                    for item in arr:
-                        if item.get("name") == "filesystem-connector":
-                            connector = item
-                            break
-                    if connector:
-                        break
-            except Exception:
-                pass
-            time.sleep(1.0)
+
+        def _registered(r):
+            return next((item for item in (r.json() or []) if item.get("name") == "filesystem-connector"), None)
+
+        # Registration follows the connector's own startup, so start at 100ms and back off to 2s. Each
+        # probe completes (or hits its 1.5s timeout) before the next, so polls never overlap.
+        connector = _wait_http_ready(
+            conn_proc, list_url, time.time() + 60, name="Connector",
+            initial=0.1, cap=2.0, timeout=1.5, accept=_registered,
+        )
         if not connector:
-            out = conn_proc.stdout.read().decode() if conn_proc and conn_proc.stdout else ""
-            raise Exit(f"Connector did not register in time. Logs:\n{out}")
+            # The connector is still running here: take the tail, a read() would block until it exits
+            raise Exit(f"Connector did not register in time. Logs:\n{_output(conn_proc)}")
         uuid = connector.get("uuid")
         print(f"[auth-conn] Connector registered: uuid={uuid}")
 
         # 5) Direct call to connector CONFIG without HMAC should 401
         try:
             direct = f"http://127.0.0.1:{conn_port}/filesystem-connector/config"
-            r = requests.get(direct, timeout=2)
+            r = _session().get(direct, timeout=2)
             if r.status_code != 401:
                 raise Exit(f"Expected 401 from connector without HMAC, got {r.status_code}")
             print("[auth-conn] Connector rejects unsigned requests (401) — OK.")
@@ -317,7 +563,7 @@ def test_auth_connector(
 
         # 6) dsx-connect outbound HMAC check via new auth_check route
         authcheck_url = f"{api_base}/dsx-connect/api/v1/connectors/auth_check/{uuid}"
-        r = requests.get(authcheck_url, timeout=5)
+        r = _session().get(authcheck_url, timeout=5)
         if r.status_code == 401:
             raise Exit(f"Outbound HMAC rejected by connector: {r.text}")
         if r.status_code >= 500:
@@ -331,12 +577,37 @@ def test_auth_connector(
 # ---------------------- Pytest convenience tasks ---------------------- #
 
 
-def _run_pytest(c, target: str):
-    """Helper to run pytest against a specific target path."""
-    cmd = f"cd {PROJECT_ROOT} && pytest {target}"
+# Every file covered by the test_unit_* tasks below
+_UNIT_TARGETS = (
+    "tests/test_auth_jwt.py",
+    "tests/test_client_hmac_and_params.py",
+    "tests/test_connectors_full_scan_limit.py",
+    "tests/test_connectors_repo_check_preview.py",
+    "tests/test_devenv.py",
+    "tests/test_hmac_shared.py",
+)
+
+
+def _run_pytest(c, target: str | list[str] | tuple[str, ...], *, extra: str = ""):
+    """Helper to run pytest against one target path, or several in a single pytest process."""
+    targets = target if isinstance(target, str) else " ".join(target)
+    # python -m puts the repo root on sys.path, so tests can import dsx_connect/shared
+    cmd = f"cd {PROJECT_ROOT} && python -m pytest {extra + ' ' if extra else ''}{targets}"
     c.run(cmd)
 
 
+@task
+def test_unit_all(c):
+    """
+    Run every test_unit_* target in one pytest process (one interpreter + plugin start-up instead
+    of six). Spreads across CPUs with pytest-xdist when it is installed.
+    """
+    extra = "-q --no-header -p no:cacheprovider"
+    if importlib.util.find_spec("xdist") is not None:
+        extra += " -n auto"
+    _run_pytest(c, _UNIT_TARGETS, extra=extra)
+
+
 @task
 def test_unit_auth_jwt(c):
     """Run unit tests covering JWT auth helpers."""
@@ -0,0 +1,30 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from shared.models.connector_models import ConnectorInstanceModel, ConnectorStatusEnum
+from dsx_connect.app.routers import connectors as connectors_router
+
+
+@pytest.fixture(scope="module")
+def connectors_client():
+    """
+    (TestClient, connector uuid) for a minimal app with the connectors router and one READY
+    connector in app state (so _lookup falls back to this list). Started once per module; tests
+    stub the outbound client with monkeypatch, which is undone after each test.
+    """
+    app = FastAPI()
+    app.include_router(connectors_router.router)
+    cid = uuid4()
+    app.state.connectors = [
+        ConnectorInstanceModel(
+            name="fs",
+            uuid=cid,
+            url="http://connector:9999",
+            status=ConnectorStatusEnum.READY,
+        )
+    ]
+    with TestClient(app) as client:
+        yield client, cid
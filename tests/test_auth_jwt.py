@@ -1,22 +1,22 @@
-import importlib
 import os
 
 import pytest
 
 
-def reload_auth():
-    import dsx_connect.config as cfg
-    importlib.reload(cfg)
+@pytest.fixture
+def auth():
+    # auth_jwt reads settings via the lru-cached get_auth_config() at call time, so dropping that
+    # cache picks up the monkeypatched env without re-executing dsx_connect.config or auth_jwt
     import dsx_connect.app.auth_jwt as auth
-    importlib.reload(auth)
-    return auth
+    auth.get_auth_config.cache_clear()
+    yield auth
+    auth.get_auth_config.cache_clear()
 
 
-def test_issue_and_verify_jwt_roundtrip(monkeypatch):
+def test_issue_and_verify_jwt_roundtrip(monkeypatch, auth):
     monkeypatch.setenv("DSXCONNECT_AUTH__ENABLED", "true")
     monkeypatch.setenv("DSXCONNECT_AUTH__JWT_SECRET", "unit-test-secret")
     monkeypatch.setenv("DSXCONNECT_AUTH__JWT_TTL", "120")
-    auth = reload_auth()
 
     payload = auth.issue_access_token(connector_uuid="abc-123")
     assert payload["token_type"] == "Bearer"
@@ -29,10 +29,9 @@ def test_issue_and_verify_jwt_roundtrip(monkeypatch):
     assert claims.get("iss") == "dsx-connect"
 
 
-def test_verify_enrollment_token(monkeypatch):
+def test_verify_enrollment_token(monkeypatch, auth):
     monkeypatch.setenv("DSXCONNECT_AUTH__ENABLED", "true")
     monkeypatch.setenv("DSXCONNECT_AUTH__ENROLLMENT_TOKEN", "enroll-xyz")
-    auth = reload_auth()
     assert auth.verify_enrollment_token("enroll-xyz") is True
     assert auth.verify_enrollment_token("nope") is False
 
@@ -1,6 +1,5 @@
 import os
 import types
-import importlib
 from types import SimpleNamespace
 from urllib.parse import urlsplit, parse_qs
 
@@ -8,11 +7,9 @@ import pytest
 
 
 class _DummyResponse:
-    def __init__(self, method: str, url: str, headers: dict):
-        self.status_code = 200
-        self.method = method
-        self.url = url
-        self.headers = headers
+    status_code = 200
+    method = url = None
+    headers: dict = {}
 
     def raise_for_status(self):
         return None
@@ -22,29 +19,34 @@ class _DummyResponse:
 
 
 class _StubAsyncClient:
+    # Each test awaits one request and asserts on it before the next, so one response object is
+    # enough: request() just swaps its method/url/headers in
+    _response = _DummyResponse()
+
     def __init__(self, *_, **__):
-        self.last = None
+        pass
 
     async def aclose(self):
         return None
 
     async def request(self, method, url, content=None, headers=None):
-        self.last = {"method": method, "url": url, "headers": headers or {}}
-        return _DummyResponse(method, url, headers or {})
-
+        resp = self._response
+        resp.method, resp.url, resp.headers = method, url, headers or {}
+        return resp
 
-@pytest.mark.asyncio
-async def test_async_client_params_in_url_without_hmac(monkeypatch):
-    # Reload config and client modules to pick up env
-    import dsx_connect.config as cfg
-    importlib.reload(cfg)
 
+@pytest.fixture
+def client_mod(monkeypatch):
+    # The client looks httpx up at call time, so patching the module global is enough; a fresh
+    # pool makes sure no real AsyncClient cached by an earlier test is handed back instead
     import dsx_connect.connectors.client as client_mod
-    # Patch httpx.AsyncClient used in the client module
-    stub_httpx = types.SimpleNamespace(AsyncClient=_StubAsyncClient)
-    monkeypatch.setattr(client_mod, "httpx", stub_httpx, raising=True)
-    importlib.reload(client_mod)  # ensure DEV computed from reloaded config
+    monkeypatch.setattr(client_mod, "httpx", types.SimpleNamespace(AsyncClient=_StubAsyncClient), raising=True)
+    monkeypatch.setattr(client_mod, "_async_pool", {}, raising=True)
+    return client_mod
+
 
+@pytest.mark.asyncio
+async def test_async_client_params_in_url_without_hmac(client_mod):
     # Build a simple URL base (no HMAC creds provided; allowed in dev)
     base = "http://svc:9000"
 
@@ -61,15 +63,7 @@ async def test_async_client_params_in_url_without_hmac(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_async_client_params_and_hmac(monkeypatch):
-    import dsx_connect.config as cfg
-    importlib.reload(cfg)
-
-    import dsx_connect.connectors.client as client_mod
-    stub_httpx = types.SimpleNamespace(AsyncClient=_StubAsyncClient)
-    monkeypatch.setattr(client_mod, "httpx", stub_httpx, raising=True)
-    importlib.reload(client_mod)
-
+async def test_async_client_params_and_hmac(client_mod):
     # Provide connector with HMAC creds
     conn = SimpleNamespace(url="http://svc:9000", hmac_key_id="kid", hmac_secret="secret")
 
@@ -1,4 +1,7 @@
 import time
+
+import pytest
+
 from shared.auth.hmac import make_hmac_header, verify_hmac
 
 
@@ -17,3 +20,10 @@ def test_hmac_roundtrip_basic():
 
     kid = verify_hmac(method, path_q, body, hdr, lookup, skew_seconds=300)
     assert kid == key_id
+
+
+def test_hmac_rejects_tampered_signature():
+    hdr = make_hmac_header("kid", "s3cr3t", "GET", "/x", None)
+    for bad in (hdr[:-4] + "AAA=", hdr.replace("sig=", "sig=é")):
+        with pytest.raises(ValueError, match="bad_signature"):
+            verify_hmac("GET", "/x", None, bad, lambda k: "s3cr3t")